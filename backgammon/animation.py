@@ -0,0 +1,215 @@
+# animation.py
+# Contains Animation and Timeline classes
+
+from collections import deque
+from typing import List, Tuple
+
+import pygame
+
+from cell import Cell
+from checker import Checker
+from printable import Printable
+
+
+def ease_in_out(t: float) -> float:
+    """Smooth step easing, slow at start and at end
+
+    Args:
+        t (float): part of animation time from 0 to 1
+
+    Returns:
+        float: part of path from 0 to 1
+    """
+
+    return t * t * (3 - 2 * t)  # return part of path
+
+
+class Animation(Printable):
+    """Animation(Printable) class
+    Describes checker moving from one position to other
+
+    Methods:
+        1) advance(dt: float): moves checker, returns time left after end of animation
+        2) print(): prints checker
+
+    Properties:
+        1) done: True if checker reached end position
+    """
+
+    def __init__(self, checker: Checker, start: Tuple[int, int],
+                 end: Tuple[int, int], duration: float) -> None:
+        """Animation constructor
+
+        Args:
+            checker (Checker): moving checker
+            start (Tuple[int, int]): start position
+            end (Tuple[int, int]): end position
+            duration (float): time of animation, seconds
+        """
+
+        self._checker = checker  # set checker
+        self._start = start  # set start position
+        self._end = end  # set end position
+        self._duration = duration  # set duration
+        self._time = 0.0  # time from start
+
+        self._checker._position = start  # set position
+
+    def advance(self, dt: float) -> float:
+        """Moves checker by time
+
+        Args:
+            dt (float): passed time, seconds
+
+        Returns:
+            float: time left after end of animation, 0 if animation isn't done
+        """
+
+        self._time += dt  # increase time
+        left = max(self._time - self._duration, 0.0)  # time after end
+
+        k = ease_in_out(min(self._time / self._duration, 1.0)) if self._duration > 0 else 1.0
+        self._checker._position = (self._start[0] + (self._end[0] - self._start[0]) * k,
+                                   self._start[1] + (self._end[1] - self._start[1]) * k)  # set position
+
+        return left  # return time left
+
+    @property
+    def done(self) -> bool:
+        """True if checker reached end position
+
+        Returns:
+            bool: True if animation is done
+        """
+
+        return self._time >= self._duration  # return flag
+
+    def print(self) -> None:
+        self._checker.print()  # print checker
+
+
+class Timeline(Printable):
+    """Timeline(Printable) class
+    Describes queue of checkers' moves animated one by one
+
+    Moves are pushed by game thread right after board is changed, timeline is
+    advanced by render loop, so game logic doesn't wait for animations.
+    Cells' pictures are changed only in render loop, moving checker is printed by
+    one sprite of its color reused by all moves
+
+    Methods:
+        1) push(from_index: int, to_index: int): adds move to queue
+        2) advance(dt: float): animates moves by passed time
+        3) finish(): finishes all moves immediately
+        4) print(): prints moving checker
+
+    Properties:
+        1) busy: True if there are not finished moves
+        2) duration: time of one move, seconds (0 is instant mode)
+        3) checker: sprite of moving checker
+    """
+
+    def __init__(self, screen: pygame.Surface, cells: List[Cell], duration: float = Cell.TIME) -> None:
+        """Timeline constructor
+
+        Args:
+            screen (pygame.Surface): surface to print on
+            cells (List[Cell]): cells of field
+            duration (float, optional): time of one move, seconds, 0 for instant mode.
+                Defaults to Cell.TIME
+        """
+
+        self._cells = cells  # set cells
+        self._duration = duration  # set duration
+        self._moves = deque()  # queue of moves
+        self._animation = None  # current animation
+        self._target = None  # cell of current animation's checker
+        self._sprites = {color: Checker(screen, color, (0, 0), Checker.SIZE)
+                         for color in Checker.TYPES}  # sprites of moving checkers
+
+    def push(self, from_index: int, to_index: int) -> None:
+        """Adds move to queue, may be called from any thread
+
+        Args:
+            from_index (int): index of cell checker is moved from
+            to_index (int): index of cell checker is moved to
+        """
+
+        self._moves.append((from_index, to_index))  # add move
+
+    def advance(self, dt: float) -> None:
+        """Animates moves by passed time, must be called from render loop
+
+        Args:
+            dt (float): passed time, seconds
+        """
+
+        while True:
+            if self._animation is None:  # start next move
+                if not self._moves:
+                    return
+                from_index, to_index = self._moves.popleft()
+                source, self._target = self._cells[from_index], self._cells[to_index]
+                checker = self._sprites[source.take_checker()]  # sprite of checker's color
+                self._animation = Animation(checker, source.checker_position(source.printed),
+                                            self._target.checker_position(self._target.printed),
+                                            self._duration)
+
+            dt = self._animation.advance(dt)  # move checker
+
+            if not self._animation.done:  # time is over
+                return
+
+            self._target.put_checker(self._animation._checker.color)  # put checker to cell
+            self._animation = None
+
+    def finish(self) -> None:
+        """Finishes all moves immediately, must be called from render loop"""
+
+        while self._animation is not None or self._moves:
+            self.advance(float("inf"))
+
+    @property
+    def busy(self) -> bool:
+        """True if there are not finished moves
+
+        Returns:
+            bool: True if timeline is busy
+        """
+
+        return self._animation is not None or len(self._moves) > 0  # return flag
+
+    @property
+    def checker(self) -> Checker:
+        """Sprite of moving checker
+
+        Returns:
+            Checker: sprite or None if no checker is moving
+        """
+
+        return self._animation._checker if self._animation is not None else None  # return checker
+
+    @property
+    def duration(self) -> float:
+        """Time of one move, seconds (0 is instant mode)
+
+        Returns:
+            float: duration
+        """
+
+        return self._duration  # return duration
+
+    @duration.setter
+    def duration(self, value: float) -> None:
+        """Sets time of next moves, 0 is instant mode
+
+        Args:
+            value (float): duration, seconds
+        """
+
+        self._duration = value  # set duration
+
+    def print(self) -> None:
+        # print moving checker
+        if self._animation is not None:
+            self._animation.print()
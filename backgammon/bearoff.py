@@ -0,0 +1,279 @@
+# bearoff.py
+# Contains BearoffDatabase class and functions generating one-sided bear-off database
+# Run file to generate database once (takes about a minute), for example:
+#     python bearoff.py --path bearoff.db
+#
+# Home position is a tuple of numbers of checkers at distances 1-6 from exit. Database
+# stores expected number of rolls to bear off all checkers and distribution of this number
+# for every position of up to 15 checkers. Opponent's checkers are ignored (one-sided database)
+
+import argparse
+import mmap
+import os
+import struct
+from math import comb
+from typing import Dict, List, Tuple
+
+from board import Board
+from movegen import HOME, PATHS, ROLLS
+
+DATABASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bearoff.db")  # default path
+MAGIC = b"BGBO"  # signature of file
+POINTS = 6  # number of home cells
+ROLLS_MAX = 32  # length of distributions, last value includes all longer bear-offs
+
+_HEADER = struct.Struct("<4sBBBI")  # magic, checkers, points, length of distributions, number of positions
+
+Home = Tuple[int, ...]  # numbers of checkers at distances 1-6
+
+
+def index(home: Home, checkers: int = Board.CHECKERS) -> int:
+    """Returns index of home position, positions of up to checkers are numbered from 0
+
+    Position with slack (checkers - sum) is a composition of checkers into 7 parts, it is
+    ranked as combination of 6 bars among checkers + 6 places
+
+    Args:
+        home (Home): numbers of checkers at distances 1-6
+        checkers (int, optional): maximal number of checkers. Defaults to Board.CHECKERS
+
+    Returns:
+        int: index
+    """
+
+    rank = 0  # index
+    bar = -1  # place of previous bar
+    for k, n in enumerate(home, 1):
+        bar += n + 1
+        rank += comb(bar, k)
+
+    return rank  # return index
+
+
+def positions(checkers: int = Board.CHECKERS) -> List[Home]:
+    """Returns all home positions of up to checkers ordered by index
+
+    Args:
+        checkers (int, optional): maximal number of checkers. Defaults to Board.CHECKERS
+
+    Returns:
+        List[Home]: positions
+    """
+
+    homes = [()]
+    for _ in range(POINTS):  # add one cell at a time
+        homes = [h + (n,) for h in homes for n in range(checkers + 1 - sum(h))]
+
+    return sorted(homes, key=lambda h: index(h, checkers))
+
+
+def home(board: Board, color: str) -> Home:
+    """Returns home position of color
+
+    Args:
+        board (Board): board
+        color (str): color of checkers
+
+    Returns:
+        Home: numbers of checkers at distances 1-6 or None if not all checkers are in home
+    """
+
+    sign = Board.SIGNS[color]  # sign of color
+    cells = [board[i] * sign for i in PATHS[color]]  # checkers on path
+
+    if any(n > 0 for n in cells[:HOME]):  # checkers out of home
+        return None
+
+    return tuple(max(cells[24 - d], 0) for d in range(1, POINTS + 1))
+
+
+def _step(home: Home, die: int) -> List[Home]:
+    """Returns positions after playing one die"""
+
+    if not any(home):  # all checkers are off
+        return [home]
+
+    far = max(d for d in range(1, POINTS + 1) if home[d - 1])  # distance of farthest checker
+    result = set()
+    for d in range(1, POINTS + 1):
+        if not home[d - 1]:
+            continue
+        h = list(home)
+        h[d - 1] -= 1
+        if d > die:  # move inside home
+            h[d - die - 1] += 1
+        elif d < die and d != far:  # higher die bears off only farthest checker
+            continue
+        result.add(tuple(h))
+
+    return list(result)
+
+
+def generate(path: str = DATABASE, checkers: int = Board.CHECKERS,
+             rolls: int = ROLLS_MAX, progress: bool = False) -> None:
+    """Generates database by dynamic programming from smaller positions to bigger ones
+
+    Every roll is played by the turn minimizing expected number of rolls, distribution
+    is the distribution of this play
+
+    Args:
+        path (str, optional): path to database. Defaults to DATABASE
+        checkers (int, optional): maximal number of checkers. Defaults to Board.CHECKERS
+        rolls (int, optional): length of distributions. Defaults to ROLLS_MAX
+        progress (bool, optional): print progress. Defaults to False
+    """
+
+    homes = positions(checkers)  # all positions
+    order = sorted(range(len(homes)), key=lambda i: sum(d * n for d, n in
+                                                       enumerate(homes[i], 1)))  # by pips
+
+    expected = [0.0] * len(homes)  # expected numbers of rolls
+    distributions = [None] * len(homes)  # distributions of numbers of rolls
+    distributions[0] = [1.0] + [0.0] * (rolls - 1)  # position without checkers
+    steps = {}  # memo of one die's positions
+
+    def step(h: Home, die: int) -> List[Home]:
+        key = (h, die)
+        if key not in steps:
+            steps[key] = _step(h, die)
+        return steps[key]
+
+    for done, i in enumerate(order):
+        h = homes[i]
+        if not any(h):
+            continue
+
+        e = 1.0  # expected number of rolls
+        distribution = [0.0] * rolls  # distribution of numbers of rolls
+        for (a, b), p in ROLLS:
+            if a == b:  # double is played four times
+                children = {h}
+                for _ in range(4):
+                    children = {c for x in children for c in step(x, a)}
+            else:  # dices are played in any order
+                children = {c for x in step(h, a) for c in step(x, b)} | \
+                           {c for x in step(h, b) for c in step(x, a)}
+
+            best = min((index(c, checkers) for c in children), key=lambda j: expected[j])
+            e += p * expected[best]
+            child = distributions[best]
+            for n in range(1, rolls):
+                distribution[n] += p * child[n - 1]
+            distribution[-1] += p * child[-1]  # longer bear-offs stay in last value
+
+        expected[i] = e
+        distributions[i] = distribution
+
+        if progress and done % 5000 == 0:
+            print(f"{done}/{len(homes)} positions", flush=True)
+
+    record = struct.Struct(f"<f{rolls}H")  # expected number and quantized distribution
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, checkers, POINTS, rolls, len(homes)))
+        for e, distribution in zip(expected, distributions):
+            file.write(record.pack(e, *(round(p * 65535) for p in distribution)))
+
+
+class BearoffDatabase:
+    """BearoffDatabase class
+    Describes one-sided bear-off database mapped to memory
+
+    File is mapped read-only, so all processes share one copy of it in page cache.
+    Position is found by its index in O(1)
+
+    Methods:
+        1) expected(home: Home): returns expected number of rolls to bear off
+        2) distribution(home: Home): returns probabilities to bear off in 0, 1, ... rolls
+
+    Properties:
+        1) checkers: maximal number of checkers
+    """
+
+    def __init__(self, path: str = DATABASE) -> None:
+        """BearoffDatabase constructor
+
+        Args:
+            path (str, optional): path to database. Defaults to DATABASE
+
+        Raises:
+            ValueError: in case of incorrect file
+        """
+
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # mapped file
+
+        magic, checkers, points, rolls, size = _HEADER.unpack_from(self._data)
+        self._record = struct.Struct(f"<f{rolls}H")  # record of position
+
+        if magic != MAGIC or points != POINTS or \
+                len(self._data) != _HEADER.size + size * self._record.size:  # if file is incorrect
+            raise ValueError("Database is incorrect")  # throw exception
+
+        self._checkers = checkers  # set maximal number of checkers
+
+    @property
+    def checkers(self) -> int:
+        """Maximal number of checkers
+
+        Returns:
+            int: number of checkers
+        """
+
+        return self._checkers  # return number
+
+    def _offset(self, home: Home) -> int:
+        """Returns offset of position's record"""
+
+        return _HEADER.size + index(home, self._checkers) * self._record.size
+
+    def expected(self, home: Home) -> float:
+        """Returns expected number of rolls to bear off
+
+        Args:
+            home (Home): numbers of checkers at distances 1-6
+
+        Returns:
+            float: expected number of rolls
+        """
+
+        return struct.unpack_from("<f", self._data, self._offset(home))[0]  # return number
+
+    def distribution(self, home: Home) -> List[float]:
+        """Returns probabilities to bear off in 0, 1, ... rolls
+
+        Args:
+            home (Home): numbers of checkers at distances 1-6
+
+        Returns:
+            List[float]: probabilities, last one includes all longer bear-offs
+        """
+
+        return [n / 65535 for n in self._record.unpack_from(self._data, self._offset(home))[1:]]
+
+
+_databases: Dict[str, BearoffDatabase] = {}  # opened databases by paths
+
+
+def database(path: str = DATABASE) -> BearoffDatabase:
+    """Returns database opened once in process
+
+    Args:
+        path (str, optional): path to database. Defaults to DATABASE
+
+    Returns:
+        BearoffDatabase: database or None if file doesn't exist
+    """
+
+    if path not in _databases:
+        _databases[path] = BearoffDatabase(path) if os.path.exists(path) else None
+
+    return _databases[path]  # return database
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates one-sided bear-off database")
+    parser.add_argument("--path", default=DATABASE, help="path to database")
+    parser.add_argument("--checkers", type=int, default=Board.CHECKERS, help="maximal number of checkers")
+    args = parser.parse_args()
+
+    generate(args.path, args.checkers, progress=True)
@@ -0,0 +1,299 @@
+# benchmark.py
+# Contains functions measuring speed of hot paths of the game
+# Run file to measure all benchmarks and compare them with baselines, for example:
+#     python benchmark.py              (exits with code 1 if some benchmark regressed)
+#     python benchmark.py --save       (saves results as new baselines)
+#
+# Timings depend on machine, so baselines must be saved with --save on the machine they
+# are compared on, committed benchmarks.json is only an example of the format. Bots don't
+# use bear-off database and opening book, so results don't depend on generated files
+
+import argparse
+import json
+import os
+import random
+import sys
+from functools import partial
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # print to memory without window
+
+import pygame
+
+from board import Board
+from bot import Bot
+from dicesource import RandomDices
+from game import Game
+from movegen import can_move, head_moves, legal_moves, legal_turns, turn_dices
+
+BASELINES = "benchmarks.json"  # default file of baselines
+TOLERANCE = 0.25  # relative slowdown flagged as regression
+HIGHER = ("games_per_second",)  # metrics which are better when higher
+
+# measured bot, it doesn't depend on not committed bear-off database and opening book
+_Bot = partial(Bot, use_book=False, use_bearoff=False)
+
+Position = Tuple[Board, str, Tuple[int, int]]  # board, color to move and dices
+
+
+def corpus(size: int = 256, seed: int = 2023) -> List[Position]:
+    """Returns fixed corpus of positions sampled from seeded games of random legal turns
+
+    Turns are chosen by seeded random generator, not by bots, so corpus doesn't change
+    with bots' policies, bear-off database or opening book
+
+    Args:
+        size (int, optional): number of positions. Defaults to 256
+        seed (int, optional): seed of dices and turns. Defaults to 2023
+
+    Returns:
+        List[Position]: positions with color to move and dices
+    """
+
+    positions = []  # positions
+    dices = RandomDices(seed)  # dices of games
+    rng = random.Random(seed)  # choice of turns
+
+    for index in range(size):
+        board = Board()  # board of game
+        stream = dices.stream(index)  # dices of game
+
+        # play game to turn depending on index, so corpus has openings, middle games and bear-offs
+        for turn in range(index * 7 % 90):
+            if board.winner is not None:
+                break
+            turns = legal_turns(board, Board.COLORS[turn % 2], turn_dices(stream.roll()))
+            if turns:
+                board = rng.choice(turns).board.copy()
+
+        if board.winner is None:
+            positions.append((board.copy(), Board.COLORS[(index * 7 % 90) % 2], stream.roll()))
+
+    return positions  # return positions
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Returns percentile q (from 0 to 1) of values"""
+
+    values = sorted(values)
+
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def bench_movegen(positions: List[Position], repeat: int = 20) -> Dict[str, float]:
+    """Measures scan of legal moves and pass check
+
+    Args:
+        positions (List[Position]): corpus
+        repeat (int, optional): number of passes over corpus. Defaults to 20
+
+    Returns:
+        Dict[str, float]: mean times of legal_moves and can_move, microseconds
+    """
+
+    results = {}
+    for name, function in (("legal_moves_us", legal_moves), ("can_move_us", can_move)):
+        best = float("inf")  # best pass, least disturbed by other processes
+        for _ in range(repeat):
+            start = perf_counter()
+            for board, color, dices in positions:
+                steps = turn_dices(dices)
+                function(board, color, steps, head_moves(board, color, steps))
+            best = min(best, perf_counter() - start)
+        results[name] = best / len(positions) * 1e6
+
+    return results
+
+
+def bench_bot(positions: List[Position], repeat: int = 5) -> Dict[str, float]:
+    """Measures latency of Bot.play decisions without bear-off database and opening book,
+    latency of position is the best of repeats
+
+    Args:
+        positions (List[Position]): corpus
+        repeat (int, optional): number of decisions in each position. Defaults to 5
+
+    Returns:
+        Dict[str, float]: 50th and 99th percentiles of latency, microseconds
+    """
+
+    times = []  # latencies
+    for board, color, dices in positions:
+        best = float("inf")
+        for _ in range(repeat):
+            bot = _Bot(board.copy(), color)
+            start = perf_counter()
+            bot.play(dices)
+            best = min(best, perf_counter() - start)
+        times.append(best)
+
+    return {"bot_play_p50_us": _percentile(times, 0.5) * 1e6,
+            "bot_play_p99_us": _percentile(times, 0.99) * 1e6}
+
+
+def bench_print(frames: int = 300) -> Dict[str, float]:
+    """Measures Field.print frame time with dummy video driver
+
+    Args:
+        frames (int, optional): number of frames of each kind. Defaults to 300
+
+    Returns:
+        Dict[str, float]: mean times of full, animated and idle frames, milliseconds
+    """
+
+    from field import Field  # pygame display must be set before loading images
+
+    screen = pygame.display.set_mode((1000, 935))  # screen
+    field = Field(screen, (1000, 935), None, animation_time=0.25)  # field
+
+    def frame(prepare: Callable[[], None]) -> float:
+        total = 0.0
+        for _ in range(frames):
+            prepare()
+            start = perf_counter()
+            field.print()
+            total += perf_counter() - start
+        return total / frames * 1e3
+
+    full = frame(field.invalidate)  # whole screen is reprinted
+
+    cells = [field._cells[0], field._cells[1]]  # cells checker is moved between
+
+    def animate() -> None:
+        if not field.timeline.busy:  # move checker back and forth
+            cells[0].move_checker(cells[1])
+            cells.reverse()
+        field.update(1 / 30)
+
+    animated = frame(animate)  # one checker is moving
+    field.timeline.finish()
+    field.print()
+    idle = frame(lambda: None)  # nothing is changed
+
+    return {"print_full_ms": full, "print_animated_ms": animated, "print_idle_ms": idle}
+
+
+def bench_move_checker(moves: int = 5000, repeat: int = 5) -> Dict[str, float]:
+    """Measures Cell.move_checker with animation disabled
+
+    Args:
+        moves (int, optional): number of moves in pass. Defaults to 5000
+        repeat (int, optional): number of passes. Defaults to 5
+
+    Returns:
+        Dict[str, float]: mean time of move with its instant animation, microseconds
+    """
+
+    from field import Field
+
+    screen = pygame.display.set_mode((1000, 935))  # screen
+    field = Field(screen, (1000, 935), None, animation_time=0)  # field
+    cells = [field._cells[0], field._cells[1]]  # cells checker is moved between
+
+    best = float("inf")  # best pass
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(moves):
+            cells[0].move_checker(cells[1])
+            field.update(0)  # apply instant animation
+            cells.reverse()
+        best = min(best, perf_counter() - start)
+
+    return {"move_checker_us": best / moves * 1e6}
+
+
+def bench_games(games: int = 100, seed: int = 0) -> Dict[str, float]:
+    """Measures headless games of bots without bear-off database and opening book played in one process
+
+    Args:
+        games (int, optional): number of games. Defaults to 100
+        seed (int, optional): seed of dices. Defaults to 0
+
+    Returns:
+        Dict[str, float]: number of games per second
+    """
+
+    dices = RandomDices(seed)  # dices of games
+
+    start = perf_counter()
+    for index in range(games):
+        board = Board()
+        Game(board, (_Bot(board, "red"), _Bot(board, "black")), dices.stream(index)).start()
+
+    return {"games_per_second": games / (perf_counter() - start)}
+
+
+def run() -> Dict[str, float]:
+    """Measures all benchmarks
+
+    Returns:
+        Dict[str, float]: results by names of metrics
+    """
+
+    positions = corpus()  # corpus of positions
+
+    results = {}
+    results.update(bench_movegen(positions))
+    results.update(bench_bot(positions))
+    results.update(bench_print())
+    results.update(bench_move_checker())
+    results.update(bench_games())
+
+    return results  # return results
+
+
+def regressions(results: Dict[str, float], baselines: Dict[str, float],
+                tolerance: float = TOLERANCE) -> List[str]:
+    """Returns names of metrics which are worse than baselines by more than tolerance
+
+    Args:
+        results (Dict[str, float]): results
+        baselines (Dict[str, float]): baselines
+        tolerance (float, optional): relative tolerance. Defaults to TOLERANCE
+
+    Returns:
+        List[str]: names of regressed metrics
+    """
+
+    regressed = []
+    for name, value in results.items():
+        if name not in baselines:  # new metric
+            continue
+        if name in HIGHER:
+            worse = value < baselines[name] * (1 - tolerance)
+        else:
+            worse = value > baselines[name] * (1 + tolerance)
+        if worse:
+            regressed.append(name)
+
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures hot paths and compares them with baselines")
+    parser.add_argument("--baselines", default=BASELINES, help="JSON file of baselines")
+    parser.add_argument("--save", action="store_true", help="save results as baselines")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="relative tolerance")
+    args = parser.parse_args()
+
+    results = run()  # measure
+
+    baselines = {}  # baselines
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as file:
+            baselines = json.load(file)
+
+    regressed = regressions(results, baselines, args.tolerance)  # regressed metrics
+
+    for name, value in results.items():
+        base = baselines.get(name)
+        change = f" ({value / base - 1:+.1%} vs {base:.2f})" if base else ""
+        print(f"{name:20} {value:12.2f}{change}{'  REGRESSION' if name in regressed else ''}")
+
+    if args.save:  # save baselines
+        with open(args.baselines, "w") as file:
+            json.dump({k: round(v, 3) for k, v in results.items()}, file, indent=4, sort_keys=True)
+            file.write("\n")
+    elif regressed:
+        sys.exit(1)
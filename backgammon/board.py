@@ -0,0 +1,294 @@
+# board.py
+# Contains Board class
+
+from array import array
+from typing import Callable, List, Tuple
+
+from zobrist import SIDES, move_hash, position_hash
+
+
+class Board:
+    """Board class
+    Describes backgammon position without any graphics
+
+    Position is stored in fixed-size array of 26 signed numbers:
+    cells 0-23 are points of field, cell 24 is a cell of exited red
+    checkers and cell 25 is a cell of exited black checkers. Positive
+    number is a number of red checkers, negative is a number of black checkers
+
+    Board is indexable (returns signed number of checkers), iterable and has length
+
+    Methods:
+        1) copy(): returns copy of board without listeners
+        2) count(index: int): returns number of checkers in cell
+        3) color(index: int): returns color of checkers in cell
+        4) move(from_index: int, to_index: int): moves checker between cells
+        5) add_listener(listener: Callable): adds listener of moves
+        6) remove_listener(listener: Callable): removes listener of moves
+        7) key(): returns bytes key of position
+        8) side_hash(color: str): returns hash of position and side to move
+        9) to_relative(index: int, color: str): converts cell index to color's path index
+        10) to_absolute(index: int, color: str): converts color's path index to cell index
+
+    Properties:
+        1) winner: color of winner or None
+        2) zobrist: Zobrist hash of position, updated on each move
+
+    Constants:
+        1) COLORS: tuple of checkers' colors
+        2) SIGNS: dictionary of signs of checkers' colors
+        3) HEADS: dictionary of head cells' indexes
+        4) OFFS: dictionary of exited checkers' cells' indexes
+        5) CHECKERS: number of checkers of one color
+        6) SIZE: number of cells
+    """
+
+    COLORS = ("red", "black")  # checkers' colors
+    SIGNS = {"red": 1, "black": -1}  # signs of checkers' colors
+    HEADS = {"red": 0, "black": 12}  # head cells
+    OFFS = {"red": 24, "black": 25}  # cells of exited checkers
+    CHECKERS = 15  # checkers of one color
+    SIZE = 26  # number of cells
+
+    def __init__(self, cells: Tuple[int] = None) -> None:
+        """Board constructor
+
+        Args:
+            cells (Tuple[int], optional): signed numbers of checkers in 26 cells.
+                Defaults to None (start position)
+
+        Raises:
+            ValueError: in case of wrong number of cells
+        """
+
+        if cells is None:  # start position
+            cells = [0] * Board.SIZE
+            cells[Board.HEADS["red"]] = Board.CHECKERS
+            cells[Board.HEADS["black"]] = -Board.CHECKERS
+
+        if len(cells) != Board.SIZE:  # if size is incorrect
+            raise ValueError("Number of cells is incorrect")  # throw exception
+
+        self._cells = array("b", cells)  # set cells
+        self._hash = position_hash(self._cells)  # Zobrist hash
+        self._listeners = []  # listeners of moves
+
+    def __len__(self) -> int:
+        """Returns number of cells
+
+        Returns:
+            int: number of cells
+        """
+
+        return Board.SIZE  # return size
+
+    def __getitem__(self, index: int) -> int:
+        """Returns signed number of checkers in cell
+
+        Args:
+            index (int): index of cell
+
+        Returns:
+            int: number of checkers (positive for red, negative for black)
+        """
+
+        return self._cells[index]  # return cell
+
+    def __iter__(self):
+        """Returns iterator of signed numbers of checkers
+
+        Returns:
+            iterator: iterator
+        """
+
+        return iter(self._cells)  # return iterator
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Board) and self._cells == other._cells
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Board({self._cells.tolist()})"
+
+    def copy(self):
+        """Returns copy of board without listeners
+
+        Returns:
+            Board: copy of board
+        """
+
+        board = Board.__new__(Board)  # create board without checks
+        board._cells = array("b", self._cells)  # copy cells
+        board._hash = self._hash  # copy hash
+        board._listeners = []  # no listeners
+
+        return board  # return copy
+
+    def count(self, index: int) -> int:
+        """Returns number of checkers in cell
+
+        Args:
+            index (int): index of cell
+
+        Returns:
+            int: number of checkers
+        """
+
+        return abs(self._cells[index])  # return number
+
+    def color(self, index: int) -> str:
+        """Returns color of checkers in cell
+
+        Args:
+            index (int): index of cell
+
+        Returns:
+            str: color of checkers or None if cell is empty
+        """
+
+        value = self._cells[index]  # signed number of checkers
+
+        return "red" if value > 0 else "black" if value < 0 else None
+
+    def move(self, from_index: int, to_index: int) -> None:
+        """Moves checker from one cell to other and notifies listeners
+
+        Only checks that move is possible physically, rules are checked by movegen
+
+        Args:
+            from_index (int): cell to move from
+            to_index (int): cell to move to
+
+        Raises:
+            ValueError: in case of empty from cell or cell to with checkers of other color
+        """
+
+        sign = (self._cells[from_index] > 0) - (self._cells[from_index] < 0)  # color of checker
+
+        if sign == 0:  # if from cell is empty
+            raise ValueError("Cell to move from is empty")  # throw exception
+        if self._cells[to_index] * sign < 0:  # if to cell is occupied by other color
+            raise ValueError("Cell to move to is occupied")  # throw exception
+
+        self._hash = move_hash(self._hash, from_index, self._cells[from_index],
+                               to_index, self._cells[to_index], sign)  # update hash
+
+        self._cells[from_index] -= sign  # take checker
+        self._cells[to_index] += sign  # put checker
+
+        # notify listeners
+        for listener in self._listeners:
+            listener(from_index, to_index)
+
+    def add_listener(self, listener: Callable[[int, int], None]) -> None:
+        """Adds listener of moves, it's called after each move with from and to cells' indexes
+
+        Args:
+            listener (Callable[[int, int], None]): listener
+        """
+
+        self._listeners.append(listener)  # append listener
+
+    def remove_listener(self, listener: Callable[[int, int], None]) -> None:
+        """Removes listener of moves
+
+        Args:
+            listener (Callable[[int, int], None]): listener
+        """
+
+        self._listeners.remove(listener)  # remove listener
+
+    def key(self) -> bytes:
+        """Returns bytes key of position
+
+        Returns:
+            bytes: key of position
+        """
+
+        return self._cells.tobytes()  # return bytes
+
+    def side_hash(self, color: str) -> int:
+        """Returns hash of position and side to move
+
+        Args:
+            color (str): color of player to move
+
+        Returns:
+            int: 64-bit hash
+        """
+
+        return self._hash ^ SIDES[color]  # return hash
+
+    def tolist(self) -> List[int]:
+        """Returns list of signed numbers of checkers
+
+        Returns:
+            List[int]: list of 26 numbers
+        """
+
+        return self._cells.tolist()  # return list
+
+    @property
+    def winner(self) -> str:
+        """Color of winner
+
+        Returns:
+            str: color of player who exited all checkers or None
+        """
+
+        if self._cells[Board.OFFS["red"]] == Board.CHECKERS:  # red exited all checkers
+            return "red"
+        if self._cells[Board.OFFS["black"]] == -Board.CHECKERS:  # black exited all checkers
+            return "black"
+
+        return None  # game isn't finished
+
+    @property
+    def zobrist(self) -> int:
+        """Zobrist hash of position
+
+        Returns:
+            int: 64-bit hash
+        """
+
+        return self._hash  # return hash
+
+    @staticmethod
+    def to_relative(index: int, color: str) -> int:
+        """Converts cell index to index on path of color (0 is head, 24 is exit)
+
+        Args:
+            index (int): cell index
+            color (str): color of checkers
+
+        Returns:
+            int: index on path
+        """
+
+        if index > 23:  # exit cells
+            return 24
+        if color == "red":  # red path matches cells
+            return index
+
+        return (index + 12) % 24  # black path is shifted
+
+    @staticmethod
+    def to_absolute(index: int, color: str) -> int:
+        """Converts index on path of color (0 is head, 24 is exit) to cell index
+
+        Args:
+            index (int): index on path
+            color (str): color of checkers
+
+        Returns:
+            int: cell index
+        """
+
+        if index > 23:  # exit cell
+            return Board.OFFS[color]
+        if color == "red":  # red path matches cells
+            return index
+
+        return (index + 12) % 24  # black path is shifted
@@ -1,136 +1,86 @@
-from typing import Tuple
+from typing import Dict, Tuple
 
 from abstractplayer import AbstractPlayer
-from field import Field
+from bearoff import database, home
+from board import Board
+from movegen import head_moves, legal_moves, legal_turns, turn_dices
+from openingbook import book
 
 
 class Bot(AbstractPlayer):
-    def __init__(self, field: Field) -> None:
+    def __init__(self, board: Board, color: str = "black", use_book: bool = True,
+                 use_bearoff: bool = True) -> None:
         """Smartbot constructor
                 Args:
-                    field (Field): backgammon field
+                    board (Board): backgammon board
+                    color (str, optional): color of bot's checkers. Defaults to "black"
+                    use_book (bool, optional): play turns from opening book. Defaults to True
+                    use_bearoff (bool, optional): bear off by bear-off database. Defaults to True
                 """
-        # set cells
-        self._cells = field._cells
-        # list of possible steps
+        # set board
+        self._board = board
+        # set color
+        self._color = color
+        # list of dices' values left to play
         self._steps = None
-        # list of dices' values combinations
-        self._steps_ = None
+        # number of checkers allowed to move from head
+        self._heads = None
+        # bear-off database, None if it isn't generated or isn't used
+        self._bearoff = database() if use_bearoff else None
+        # opening book, None if it isn't generated or isn't used
+        self._book = book() if use_book else None
 
     def play(self, dices: Tuple[int]) -> None:
-        def load_steps() -> None:
-            """Loads combinations of dices"""
-            # one dice
-            self._steps = [dices[0], dices[1]]
-            # two dices
-            self._steps.append(sum(self._steps))
-            # save source
-            self._steps_ = self._steps.copy()
-            # sort
-            self._steps_.sort()
-            self._steps.sort()
+        # play book turn in opening
+        moves = self._book.lookup(self._board, self._color, dices) if self._book is not None else None
+        if moves is not None:
+            for from_index, to_index in moves:
+                self._board.move(from_index, to_index)
+            return
+        # load dices' values
+        self._steps = list(turn_dices(dices))
+        self._heads = head_moves(self._board, self._color, self._steps)
+        # bear off perfectly if all checkers are in home
+        if self._bearoff is not None and home(self._board, self._color) is not None:
+            self.bear_off()
+            return
+        while True:
+            moves = legal_moves(self._board, self._color, self._steps, self._heads)
+            # pass if can't move
+            if not moves:
+                break
+            self.move_checker(moves)
 
-        def should_pass() -> bool:
-            """Returns True if should pass, else False
-            Returns:
-                bool: True if should pass, else False
-            """
-            f = False
-            # for every cell check if can move from it
-            for _from in self._cells:
-                steps = self._steps.copy()
-                if _from.index < 24 and len(_from) > 0 and _from[0].color == "black":
-                    for i in range(len(steps)):
-                        if self._steps[i] is not None:
-                            if steps[i] > 24 - Bot._conv_index(_from.index):
-                                steps[i] = 24 - Bot._conv_index(_from.index)
-                    for _to in self._cells:
-                        if Bot._conv_index(_to.index) < 25 and _to != _from and (len(_to) == 0 or _to[0].color == "black") and \
-                                Bot._conv_index(_to.index) - Bot._conv_index(_from.index) in steps:
-                            f = True
-                            break
-                if f:
-                    return False
-            else:
-                return True
+    def bear_off(self) -> None:
+        # play turn minimizing expected number of rolls to bear off
+        turns = legal_turns(self._board, self._color, self._steps, self._heads)
+        if not turns:
+            return
+        best = min(turns, key=lambda t: self._bearoff.expected(home(t.board, self._color)))
+        for from_index, to_index in best.moves:
+            self._board.move(from_index, to_index)
 
-        load_steps()
-        while self._steps.count(0) != 3 and not should_pass():
-            self.move_checkers()
+    def move_checker(self, moves: Dict[Tuple[int, int], int]) -> None:
+        from_index, to_index = self._choose_move(moves)
+        self._steps.remove(moves[(from_index, to_index)])
+        if from_index == Board.HEADS[self._color]:
+            self._heads -= 1
+        self._board.move(from_index, to_index)
 
-    def move_checkers(self):
+    def _choose_move(self, moves: Dict[Tuple[int, int], int]) -> Tuple[int, int]:
+        # exit checkers first
         for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif Bot._conv_index(i) + self._steps[2] >= 24:
-                self._cells[i].move_checker(self._cells[25])
-                self._steps[2] = 0
-                if 24 - Bot._conv_index(i) > self._steps[1]:
-                    self._steps[0] = 0
-                    self._steps[1] = 0
-                elif 24 - Bot._conv_index(i) > self._steps[0]:
-                    self._steps[1] = 0
-                else:
-                    self._steps[0] = 0
-        for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif len(self._cells[i]._checkers) >= 2 and \
-                    self._is_possible_move(Bot._conv_index(Bot._conv_index(i) + self._steps[0])) is False:
-                self._cells[i].move_checker(self._cells[Bot._conv_index(Bot._conv_index(i) + self._steps[0])])
-                self._steps[0] = 0
-                self._steps[2] = 0
-        for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif len(self._cells[i]._checkers) >= 2 and \
-                    self._is_possible_move(Bot._conv_index(Bot._conv_index(i) + self._steps[1])) is False:
-                self._cells[i].move_checker(self._cells[Bot._conv_index(Bot._conv_index(i) + self._steps[1])])
-                self._steps[1] = 0
-                self._steps[2] = 0
-        for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif len(self._cells[i]._checkers) >= 2 and \
-                    self._is_possible_move(Bot._conv_index(Bot._conv_index(i) + self._steps[2])) is False:
-                self._cells[i].move_checker(self._cells[Bot._conv_index(Bot._conv_index(i) + self._steps[2])])
-                self._steps[0] = 0
-                self._steps[1] = 0
-                self._steps[2] = 0
-        for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif len(self._cells[i]._checkers) == 1 and \
-                    self._is_possible_move(Bot._conv_index(Bot._conv_index(i) + self._steps[0])) is False:
-                self._cells[i].move_checker(self._cells[Bot._conv_index(Bot._conv_index(i) + self._steps[0])])
-                self._steps[0] = 0
-                self._steps[2] = 0
-        for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif len(self._cells[i]._checkers) == 1 and \
-                    self._is_possible_move(Bot._conv_index(Bot._conv_index(i) + self._steps[1])) is False:
-                self._cells[i].move_checker(self._cells[Bot._conv_index(Bot._conv_index(i) + self._steps[1])])
-                self._steps[1] = 0
-                self._steps[2] = 0
-        for i in range(24):
-            if self._is_possible(i):
-                continue
-            elif len(self._cells[i]._checkers) == 1 and \
-                    self._is_possible_move(Bot._conv_index(Bot._conv_index(i) + self._steps[2])) is False:
-                self._cells[i].move_checker(self._cells[Bot._conv_index(Bot._conv_index(i) + self._steps[2])])
-                self._steps[0] = 0
-                self._steps[1] = 0
-                self._steps[2] = 0
-
-    def _is_possible(self, cell_number):
-        return True if (len(self._cells[cell_number]._checkers) != 0
-                        and self._cells[cell_number]._checkers[0]._color == "red") \
-                       or len(self._cells[cell_number]._checkers) == 0 else False
-
-    def _is_possible_move(self, cell_number):
-        return True if len(self._cells[cell_number]._checkers) != 0 \
-                       and self._cells[cell_number]._checkers[0]._color == "red" else False
-
-    def _conv_index(index: int) -> int:
-        return 24 if index == 25 else 25 if index == 24 else 12 + index if index < 12 else index - 12
\ No newline at end of file
+            if (i, Board.OFFS[self._color]) in moves:
+                return i, Board.OFFS[self._color]
+        # then move from cells with many checkers by smaller dice, then by bigger,
+        # then the same for cells with one checker
+        for single in (False, True):
+            for step in sorted(set(self._steps)):
+                for i in range(24):
+                    if (self._board.count(i) == 1) != single:
+                        continue
+                    to_index = Board.to_absolute(Board.to_relative(i, self._color) + step, self._color)
+                    if (i, to_index) in moves:
+                        return i, to_index
+        # any other legal move
+        return next(iter(moves))
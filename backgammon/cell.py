@@ -1,12 +1,11 @@
 # cell.py
-# Contains Cell and CellIter classes
+# Contains Cell class
 
 from typing import Tuple
-from time import sleep
-from threading import Lock
 
 import pygame
 
+from board import Board
 from checker import Checker
 from printable import Printable
 
@@ -15,20 +14,33 @@ class Cell(Printable):
     """Cell(Visible) class
     Describes a backgammon field's cell
     
-    Cell is indexable, iterable and has lenght
+    Cell is a view of board's cell, it stores only number and color of printed checkers.
+    Checkers are printed by one image shared by all checkers of color at positions
+    computed once, all checkers of cell are printed by one Surface.blits call
+    
+    Cell is indexable (returns position of printed checker), iterable and has lenght
     
     Methods:
         1) print(): prints object
         2) highlight(color: str): sets highlight color
         3) move_checker(cell: Cell) moves checker to other cell
         4) isinside(position: Tuple[int]): returns True if position is inside cell
+        5) checker_position(number: int): returns position of checker in cell
+        6) take_checker(): takes top checker from picture to animate it
+        7) put_checker(color: str): puts checker on top of picture
     
     Properties:
         1) color: color of highlight
         2) index: index on field
+        3) checkers_color: color of checkers in cell
+        4) area: rectangle covered by cell and its checkers
+        5) state: state of cell's picture, changes when cell must be reprinted
+        6) rect: rectangle of cell, position is inside if it's strictly inside rectangle
+        7) printed: number of printed checkers
         
     Constants:
         1) COLORS: dictionary of possible highlighting colors
+        2) TIME: default time of checker's move animation, seconds
     """
 
     COLORS = {"hover": "#f0f0f0", "selected": "#ffff00",
@@ -47,20 +59,19 @@ class Cell(Printable):
     _YS.extend(list(range(85, 366, 20)))
     _YS = tuple(_YS)
     
-    N = 100  # steps to move checker
     TIME = 0.5 # time to move checker, seconds
 
-    def __init__(self, screen: pygame.Surface, index: int, checkers: int, color: str) -> None:
+    def __init__(self, screen: pygame.Surface, index: int, board: Board) -> None:
         """Cell constructor
 
         Args:
             screen (pygame.Surface): surface to print on
             index (int): index on field of this cell
-            checkers (int): number of checkers in cell
-            color (str): color of checkers
+            board (Board): board which cell views
         """
         
         self._screen = screen  # set screen
+        self._board = board  # set board
         self._size = Cell._SIZE if index < 24 else (Cell._SIZE[0], Cell._SIZE[1]*2)  # set size
         self._index = index  # set index
         
@@ -69,22 +80,25 @@ class Cell(Printable):
         
         self._color = None  # set highlight color
         
-        # insert checkers
-        self._checkers = []
-        for _ in range(checkers):
-            self._push_checker(color)
+        self._positions = tuple(self.checker_position(n)
+                                for n in range(Board.CHECKERS))  # positions of checkers
+        
+        top, bottom = sorted((self._positions[0][1], self._positions[-1][1]))  # checkers' rows
+        self._area = pygame.Rect(self._position, self._size).union(
+            pygame.Rect(self._position[0], top, Checker.SIZE[0],
+                        bottom - top + Checker.SIZE[1]))  # rectangle of cell and checkers
         
-        self._moving_checker = None # moving checker
-        self._moving_checker_locker = Lock() # moving checker locker
+        self._printed = board.count(index)  # number of printed checkers
+        self._checkers_color = board.color(index)  # color of printed checkers
 
     def __iter__(self):
-        """Returns iterator of this cell (iterates throw checkers)
+        """Returns iterator of positions of printed checkers
 
         Returns:
-            CellIterator: iterator
+            Iterator[Tuple[int, int]]: iterator
         """
         
-        return CellIter(self)  # return iterator
+        return iter(self._positions[:self._printed])  # return iterator
 
     def __len__(self) -> int:
         """Returns number of checkers
@@ -93,19 +107,19 @@ class Cell(Printable):
             int: number of checkers
         """
         
-        return len(self._checkers)  # return length
+        return self._board.count(self._index)  # return length
 
-    def __getitem__(self, key: int) -> Checker:
-        """Returns checker by index (like in list)
+    def __getitem__(self, key: int) -> Tuple[int, int]:
+        """Returns position of printed checker by index (like in list)
 
         Args:
             key (int): index
 
         Returns:
-            Checker: checker by index
+            Tuple[int, int]: position of checker
         """
         
-        return self._checkers[key]  # return checker
+        return self._positions[:self._printed][key]  # return position
 
     @property
     def color(self) -> str:
@@ -117,6 +131,57 @@ class Cell(Printable):
         
         return self._color  # return color
 
+    @property
+    def checkers_color(self) -> str:
+        """Color of checkers in cell
+
+        Returns:
+            str: color of checkers or None if cell is empty
+        """
+        
+        return self._board.color(self._index)  # return color
+
+    @property
+    def area(self) -> pygame.Rect:
+        """Rectangle covered by cell and its checkers
+
+        Returns:
+            pygame.Rect: rectangle
+        """
+        
+        return self._area  # return rectangle
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Rectangle of cell, position is inside cell if it's strictly inside rectangle
+
+        Returns:
+            pygame.Rect: rectangle
+        """
+        
+        return pygame.Rect(self._position, self._size)  # return rectangle
+
+    @property
+    def state(self) -> Tuple[int, str, str]:
+        """State of cell's picture, changes when cell must be reprinted
+
+        Returns:
+            Tuple[int, str, str]: number and color of printed checkers and highlight color
+        """
+        
+        return (self._printed, self._checkers_color if self._printed else None,
+                self._color)  # return state
+
+    @property
+    def printed(self) -> int:
+        """Number of printed checkers, it differs from board while checkers are animated
+
+        Returns:
+            int: number of checkers
+        """
+        
+        return self._printed  # return number
+
     @property
     def index(self) -> int:
         """Index of cell on field
@@ -152,72 +217,56 @@ class Cell(Printable):
         if cell.index == self.index:  # if cell isequal to self, do nothing
             return
         
-        with self._moving_checker_locker:  # lock moving checker
-            self._moving_checker = self._pop_checker()  # set moving checker
-        
-        # start position
-        x0, y0 = (self._position[0], Cell._YS[len(self._checkers) + 15 * (self._index - 24)] \
-                        if self._index > 23 else \
-                            Cell._YS[len(self._checkers) + 15 * (self._index // 12)])
-        # end position
-        x, y = (cell._position[0],
-                        Cell._YS[len(cell._checkers) + 15 * (cell._index - 24)] \
-                        if cell._index > 23 else \
-                            Cell._YS[len(cell._checkers) + 15 * (cell._index // 12)])
-        
-        # move checker
-        for i in range(Cell.N):
-            with self._moving_checker_locker:  # lock mocing checker
-                self._moving_checker._position = ((x0 + (x - x0) * i / Cell.N,
-                                                y0 + (y - y0) * i / Cell.N))  # set position
-            sleep(Cell.TIME / Cell.N)  # wait
-            
-        cell._push_checker(self._moving_checker.color)  # push checker
-        
-        with self._moving_checker_locker:  # lock moving checker
-            self._moving_checker = None  # reset moving checker
-
-    def _push_checker(self, color: str) -> None:
-        """Adds checker to this cell
+        self._board.move(self._index, cell.index)  # move checker on board
+
+    def checker_position(self, number: int) -> Tuple[int, int]:
+        """Returns position of checker in cell
 
         Args:
-            color (str): color of adding checker
+            number (int): number of checker from bottom of cell
+
+        Returns:
+            Tuple[int, int]: position of checker
         """
         
-        # checker to append
-        c = Checker(self._screen, color,
-                    (self._position[0],
-                    Cell._YS[len(self._checkers) + 15 * (self._index - 24)] \
-                        if self._index > 23 else \
-                            Cell._YS[len(self._checkers) + 15 * (self._index // 12)]),
-                    (50, 50))
-        
-        self._checkers.append(c)  # append checker
+        return (self._position[0],
+                Cell._YS[number + 15 * (self._index - 24)] \
+                    if self._index > 23 else \
+                        Cell._YS[number + 15 * (self._index // 12)])  # return position
 
-    def _pop_checker(self) -> Checker:
-        """Pops checker from this cell
+    def take_checker(self) -> str:
+        """Takes top checker from picture to animate it
 
         Returns:
-            Checker: poped checker
+            str: color of checker
         """
         
-        return self._checkers.pop()  # pop checker
+        self._printed -= 1  # remove checker
+        
+        return self._checkers_color  # return color
+
+    def put_checker(self, color: str) -> None:
+        """Puts checker on top of picture
+
+        Args:
+            color (str): color of checker
+        """
+        
+        self._printed += 1  # add checker
+        self._checkers_color = color  # set color
 
     def print(self) -> None:
-        # print all checkers
-        for ch in self._checkers:
-            ch.print()
+        # print all checkers by one call
+        if self._printed:
+            image = Checker.image(self._checkers_color)  # shared image of color
+            self._screen.blits([(image, p) for p in self._positions[:self._printed]], doreturn=False)
         
-        # highligth cell if necessary
+        # highligth cell if necessary, borders are filled because thick rectangles are drawn wrong when clipped
         if self._color is not None:
-            pygame.draw.rect(self._screen, self._color,
-                             (self._position[0], self._position[1],
-                              self._size[0], self._size[1]), 5)
-            
-        # print moving checker
-        if self._moving_checker is not None:
-            with self._moving_checker_locker:
-                self._moving_checker.print()
+            x, y = self._position
+            w, h = self._size
+            for border in ((x, y, w, 5), (x, y + h - 5, w, 5), (x, y, 5, h), (x + w - 5, y, 5, h)):
+                self._screen.fill(self._color, border)
 
     def isinside(self, position: Tuple[int]) -> bool:
         """Returns True if position is inside cell, else False
@@ -232,21 +281,3 @@ class Cell(Printable):
         return self._position[0] < position[0] < self._position[0] + self._size[0] and \
                self._position[1] < position[1] < self._position[1] + self._size[1]
 
-
-class CellIter:
-    """Cell iterator object"""
-
-    def __init__(self, cell: Cell) -> None:
-        self._data = cell._checkers  # set data
-        self._index = 0  # set index
-
-    def __next__(self):
-        if self._index >= len(self._data):  # if index is too big
-            raise StopIteration  # stop iteration
-        
-        self._index += 1  # increase index
-        
-        return self._data[self._index]  # return value by index
-
-    def __iter__(self):
-        return self
@@ -5,6 +5,7 @@ from typing import Tuple
 
 import pygame
 
+from surfacecache import surfaces
 from visible import Visible
 
 
@@ -14,16 +15,18 @@ class Checker(Visible):
     
     Methods:
         1) print(): prints object
-        2) throw(): throws checker
+        2) image(color: str): returns image shared by checkers of color (static)
     
     Properties:
         1) color: color of checker
         
     Constants:
         1) TYPES: possible types for checker ("red" or "black")
+        2) SIZE: size of checker
     """
     
     TYPES = ("red", "black")
+    SIZE = (50, 50)
 
     def __init__(self, screen: pygame.Surface, checker_color: str,
                  position: Tuple[int, int], size: Tuple[int, int]) -> None:
@@ -57,3 +60,16 @@ class Checker(Visible):
         """
         
         return self._color
+
+    @staticmethod
+    def image(color: str) -> pygame.Surface:
+        """Returns image shared by all checkers of color
+
+        Args:
+            color (str): color of checker
+
+        Returns:
+            pygame.Surface: image, it must not be modified
+        """
+        
+        return surfaces.get(f"images/{color}.png", Checker.SIZE)  # return cached image
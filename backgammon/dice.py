@@ -6,6 +6,7 @@ from typing import Tuple
 
 import pygame
 
+from surfacecache import surfaces
 from visible import Visible
 
 
@@ -15,7 +16,7 @@ class Dice(Visible):
     
     Methods:
         1) print(): prints object
-        2) throw(): throws dice
+        2) throw(value: int): throws dice
     Properties:
         1) value: value of dice
     """
@@ -40,16 +41,25 @@ class Dice(Visible):
 
     def _load_image(self, path=None) -> None:
         # load images of each of 6 planes
-        self._images = []
-        for i in range(1, 7):
-            self._images.append(None)
-            self._images[-1] = pygame.image.load(f"images/dice{i}.png")
-            self._images[-1] = pygame.transform.scale(self._images[-1], self._size)
+        self._images = [surfaces.get(f"images/dice{i}.png", self._size) for i in range(1, 7)]
 
-    def throw(self) -> None:
-        """Throws a dice"""
+    def throw(self, value: int = None) -> None:
+        """Throws a dice
+
+        Args:
+            value (int, optional): value drawn from source of rolls. Defaults to None (random value)
+
+        Raises:
+            ValueError: in case of value not from 1 to 6
+        """
+        
+        if value is None:  # throw randomly
+            value = randint(1, 6)
+        
+        if not 1 <= value <= 6:  # if value is incorrect
+            raise ValueError("Value is incorrect")  # throw exception
         
-        self._value = randint(1, 6) # set random value from 1 to 6
+        self._value = value # set value from 1 to 6
 
     def print(self) -> None:
         self._screen.blit(self._images[self._value - 1],
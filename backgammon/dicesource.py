@@ -0,0 +1,241 @@
+# dicesource.py
+# Contains DiceSource, RandomDices, BlockDices and ScriptedDices classes
+
+from abc import ABCMeta, abstractmethod
+from random import Random
+from typing import Hashable, Iterable, List, Tuple
+
+try:  # numpy is needed only for bulk generation
+    import numpy as np
+except ImportError:
+    np = None
+
+Roll = Tuple[int, int]  # values of two dices
+
+
+class DiceSource(metaclass=ABCMeta):
+    """DiceSource class
+    Describes source of rolls of two dices
+
+    Methods:
+        1) roll(): returns next roll
+        2) rolls(n: int): returns n next rolls
+    """
+
+    @abstractmethod
+    def roll(self) -> Roll:
+        """Returns next roll
+
+        Returns:
+            Roll: values of two dices
+        """
+        pass
+
+    def rolls(self, n: int) -> List[Roll]:
+        """Returns n next rolls
+
+        Args:
+            n (int): number of rolls
+
+        Returns:
+            List[Roll]: rolls
+        """
+
+        return [self.roll() for _ in range(n)]  # return rolls
+
+
+class RandomDices(DiceSource):
+    """RandomDices(DiceSource) class
+    Describes seeded stream of rolls
+
+    Stream of game number index is seeded by f"{seed}:{index}", so rolls of game
+    depend only on base seed and index, and not on order of games or number of processes
+
+    Methods:
+        1) roll(): returns next roll
+        2) rolls(n: int): returns n next rolls
+        3) stream(index: int): returns independent stream of game
+
+    Properties:
+        1) seed: seed of stream
+    """
+
+    def __init__(self, seed: Hashable = None) -> None:
+        """RandomDices constructor
+
+        Args:
+            seed (Hashable, optional): seed of stream. Defaults to None (not reproducible stream)
+        """
+
+        self._seed = seed  # set seed
+        self._rng = Random(seed)  # random generator
+
+    @property
+    def seed(self) -> Hashable:
+        """Seed of stream
+
+        Returns:
+            Hashable: seed
+        """
+
+        return self._seed  # return seed
+
+    def roll(self) -> Roll:
+        return self._rng.randint(1, 6), self._rng.randint(1, 6)  # throw dices
+
+    def stream(self, index: int) -> "RandomDices":
+        """Returns independent stream of game
+
+        Args:
+            index (int): index of game
+
+        Returns:
+            RandomDices: stream
+        """
+
+        return RandomDices(None if self._seed is None else f"{self._seed}:{index}")  # return stream
+
+
+class BlockDices(DiceSource):
+    """BlockDices(DiceSource) class
+    Describes seeded stream of rolls pregenerated by numpy in blocks
+
+    Rolls are generated by blocks of many rolls at once, so simulators don't
+    pay for call of random generator on every roll. Requires numpy
+
+    Methods:
+        1) roll(): returns next roll
+        2) rolls(n: int): returns n next rolls as (n, 2) array
+        3) stream(index: int): returns independent stream of game
+
+    Properties:
+        1) seed: seed of stream
+    """
+
+    def __init__(self, seed: int = None, block: int = 4096) -> None:
+        """BlockDices constructor
+
+        Args:
+            seed (int, optional): seed of stream. Defaults to None (not reproducible stream)
+            block (int, optional): number of rolls generated at once. Defaults to 4096
+
+        Raises:
+            ImportError: in case of numpy isn't installed
+        """
+
+        if np is None:  # if numpy isn't installed
+            raise ImportError("BlockDices requires numpy")  # throw exception
+
+        self._seed = seed  # set seed
+        self._block = block  # set size of block
+        self._rng = np.random.default_rng(seed)  # random generator
+
+        self._rolls = np.empty((0, 2), dtype=np.int8)  # generated rolls
+        self._next = 0  # index of next roll
+
+    @property
+    def seed(self) -> int:
+        """Seed of stream
+
+        Returns:
+            int: seed
+        """
+
+        return self._seed  # return seed
+
+    def roll(self) -> Roll:
+        if self._next >= len(self._rolls):  # generate next block
+            self._rolls = self._rng.integers(1, 7, size=(self._block, 2), dtype=np.int8)
+            self._next = 0
+
+        a, b = self._rolls[self._next].tolist()  # values of dices
+        self._next += 1
+
+        return a, b  # return roll
+
+    def rolls(self, n: int) -> "np.ndarray":
+        """Returns n next rolls
+
+        Args:
+            n (int): number of rolls
+
+        Returns:
+            np.ndarray: (n, 2) array of values of dices
+        """
+
+        left = self._rolls[self._next:]  # generated rolls
+        if len(left) >= n:
+            self._next += n
+            return left[:n]
+
+        # generate missing rolls by whole blocks, keep rest for next calls
+        blocks = -(-(n - len(left)) // self._block)
+        self._rolls = self._rng.integers(1, 7, size=(blocks * self._block, 2), dtype=np.int8)
+        self._next = n - len(left)
+
+        return np.concatenate((left, self._rolls[:self._next]))
+
+    def stream(self, index: int) -> "BlockDices":
+        """Returns independent stream of game
+
+        Args:
+            index (int): index of game
+
+        Returns:
+            BlockDices: stream
+        """
+
+        return BlockDices(None if self._seed is None else [self._seed, index], self._block)  # return stream
+
+
+class ScriptedDices(DiceSource):
+    """ScriptedDices(DiceSource) class
+    Describes scripted sequence of rolls, for example rolls of recorded game
+
+    Methods:
+        1) roll(): returns next roll
+
+    Properties:
+        1) left: number of not played scripted rolls
+    """
+
+    def __init__(self, rolls: Iterable[Roll], then: DiceSource = None) -> None:
+        """ScriptedDices constructor
+
+        Args:
+            rolls (Iterable[Roll]): scripted rolls
+            then (DiceSource, optional): source of rolls after end of script.
+                Defaults to None (script can't end)
+
+        Raises:
+            ValueError: in case of incorrect roll in script
+        """
+
+        self._rolls = [tuple(r) for r in rolls]  # set rolls
+        self._then = then  # set source after script
+        self._next = 0  # index of next roll
+
+        for roll in self._rolls:
+            if len(roll) != 2 or not all(1 <= v <= 6 for v in roll):  # if roll is incorrect
+                raise ValueError(f"Roll {roll} is incorrect")  # throw exception
+
+    @property
+    def left(self) -> int:
+        """Number of not played scripted rolls
+
+        Returns:
+            int: number of rolls
+        """
+
+        return len(self._rolls) - self._next  # return number
+
+    def roll(self) -> Roll:
+        if self._next >= len(self._rolls):  # script is over
+            if self._then is None:
+                raise ValueError("Script of rolls is over")  # throw exception
+            return self._then.roll()
+
+        roll = self._rolls[self._next]  # next roll
+        self._next += 1
+
+        return roll  # return roll
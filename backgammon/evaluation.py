@@ -0,0 +1,231 @@
+# evaluation.py
+# Contains Features tuple, FeatureTracker class and functions of static evaluation of positions
+
+from array import array
+from collections import namedtuple
+from math import tanh
+
+from board import Board
+from movegen import HOME, PATHS
+
+Features = namedtuple("Features", ("pips",  # sum of distances of checkers to exit
+                                   "off",  # number of exited checkers
+                                   "head",  # number of checkers in head
+                                   "points",  # number of cells with own checkers
+                                   "block",  # longest row of own cells on opponent's path
+                                   "home"))  # number of checkers in home
+Features.__doc__ = """Features of one color's position"""
+
+WEIGHTS = Features(pips=-0.05, off=0.1, head=-0.2, points=0.2, block=0.05, home=0.0)  # weights
+SCALE = 3.0  # scale of difference of scores
+
+_STEPS = {color: {i: k for k, i in enumerate(PATHS[color])} for color in Board.COLORS}  # indexes on paths
+_OPPONENTS = {"red": "black", "black": "red"}  # opponents of colors
+
+
+def features(board: Board, color: str) -> Features:
+    """Returns features of position of one color
+
+    Args:
+        board (Board): board
+        color (str): color of checkers
+
+    Returns:
+        Features: features
+    """
+
+    sign = Board.SIGNS[color]  # sign of color
+    cells = [board[i] * sign for i in PATHS[color]]  # cells on path
+
+    pips = 0  # sum of distances to exit
+    points = 0  # number of own cells
+    home = 0  # number of checkers in home
+    for i, n in enumerate(cells):
+        if n > 0:
+            pips += n * (24 - i)
+            points += 1
+            if i >= HOME:
+                home += n
+
+    # longest row of own cells on opponent's path
+    block = run = 0
+    for i in PATHS["black" if color == "red" else "red"]:
+        run = run + 1 if board[i] * sign > 0 else 0
+        block = max(block, run)
+
+    return Features(pips, board[Board.OFFS[color]] * sign, max(cells[0], 0),
+                    points, block, home)
+
+
+class FeatureTracker:
+    """FeatureTracker class
+    Describes features of both colors updated on each move instead of recomputing
+
+    Tracker keeps its own copy of cells. Attached tracker listens to board's moves,
+    detached one is moved by hand, for example by candidate turns which are undone
+    after evaluation. Move changes two cells, so update takes O(1), only longest
+    block scans its neighbour cells
+
+    Methods:
+        1) move(from_index: int, to_index: int): updates features after move
+        2) undo(from_index: int, to_index: int): updates features after undoing move
+        3) snapshot(color: str): returns features of color
+        4) detach(): stops listening to board
+    """
+
+    def __init__(self, board: Board, attach: bool = True) -> None:
+        """FeatureTracker constructor
+
+        Args:
+            board (Board): board to take position from
+            attach (bool, optional): listen to board's moves. Defaults to True
+        """
+
+        self._board = board if attach else None  # set listened board
+        self._cells = array("b", board)  # signed numbers of checkers
+
+        self._pips = {color: 0 for color in Board.COLORS}  # sums of distances to exit
+        self._points = {color: 0 for color in Board.COLORS}  # numbers of own cells
+        self._home = {color: 0 for color in Board.COLORS}  # numbers of checkers in home
+        self._made = {color: [False] * 24 for color in Board.COLORS}  # own cells on opponent's path
+        self._runs = {color: [0] * 25 for color in Board.COLORS}  # numbers of rows of own cells by lengths
+        self._block = {color: 0 for color in Board.COLORS}  # longest rows
+
+        cells, self._cells = self._cells, array("b", [0] * Board.SIZE)
+        for i, n in enumerate(cells):  # put checkers one by one
+            for _ in range(abs(n)):
+                self._change(i, "red" if n > 0 else "black", 1)
+
+        if self._board is not None:
+            self._board.add_listener(self.move)
+
+    def detach(self) -> None:
+        """Stops listening to board"""
+
+        if self._board is not None:
+            self._board.remove_listener(self.move)
+            self._board = None
+
+    def move(self, from_index: int, to_index: int) -> None:
+        """Updates features after move
+
+        Args:
+            from_index (int): cell checker is moved from
+            to_index (int): cell checker is moved to
+        """
+
+        color = "red" if self._cells[from_index] > 0 else "black"  # color of checker
+        self._change(from_index, color, -1)
+        self._change(to_index, color, 1)
+
+    def undo(self, from_index: int, to_index: int) -> None:
+        """Updates features after undoing move
+
+        Args:
+            from_index (int): cell checker was moved from
+            to_index (int): cell checker was moved to
+        """
+
+        self.move(to_index, from_index)
+
+    def snapshot(self, color: str) -> Features:
+        """Returns features of color, they are equal to features(board, color)
+
+        Args:
+            color (str): color of checkers
+
+        Returns:
+            Features: features
+        """
+
+        sign = Board.SIGNS[color]  # sign of color
+
+        return Features(self._pips[color], self._cells[Board.OFFS[color]] * sign,
+                        max(self._cells[Board.HEADS[color]] * sign, 0), self._points[color],
+                        self._block[color], self._home[color])
+
+    def _change(self, i: int, color: str, delta: int) -> None:
+        """Adds delta checkers of color to cell i"""
+
+        sign = Board.SIGNS[color]  # sign of color
+        before = self._cells[i] * sign  # own checkers before
+        self._cells[i] += delta * sign
+
+        if i >= 24:  # cell of exited checkers
+            return
+
+        k = _STEPS[color][i]  # index on path
+        self._pips[color] += delta * (24 - k)
+        if k >= HOME:
+            self._home[color] += delta
+
+        if before == 0 and delta > 0:  # cell is made
+            self._points[color] += 1
+            self._mark(color, _STEPS[_OPPONENTS[color]][i], True)
+        elif before == 1 and delta < 0:  # cell is left
+            self._points[color] -= 1
+            self._mark(color, _STEPS[_OPPONENTS[color]][i], False)
+
+    def _mark(self, color: str, k: int, made: bool) -> None:
+        """Updates rows of own cells after cell k of opponent's path is made or left"""
+
+        cells, runs = self._made[color], self._runs[color]
+
+        left = 0  # length of row ending before k
+        while k - left - 1 >= 0 and cells[k - left - 1]:
+            left += 1
+        right = 0  # length of row starting after k
+        while k + right + 1 < 24 and cells[k + right + 1]:
+            right += 1
+
+        step = 1 if made else -1  # rows are joined or split
+        if left:
+            runs[left] -= step
+        if right:
+            runs[right] -= step
+        runs[left + right + 1] += step
+        cells[k] = made
+
+        if made:
+            self._block[color] = max(self._block[color], left + right + 1)
+        else:
+            while self._block[color] and runs[self._block[color]] <= 0:
+                self._block[color] -= 1
+
+
+def score(f: Features) -> float:
+    """Returns score of one color's features
+
+    Args:
+        f (Features): features
+
+    Returns:
+        float: score
+    """
+
+    return sum(w * x for w, x in zip(WEIGHTS, f))  # return weighted sum
+
+
+def evaluate(board: Board, color: str, tracker: FeatureTracker = None) -> float:
+    """Returns value of position for color, value is antisymmetric
+
+    Args:
+        board (Board): board
+        color (str): color of player
+        tracker (FeatureTracker, optional): tracker of the same position, features are
+            taken from it. Defaults to None (features are computed from cells)
+
+    Returns:
+        float: 1 if color won, -1 if color lost, else value in (-1, 1)
+    """
+
+    winner = board.winner  # winner of game
+    if winner is not None:
+        return 1.0 if winner == color else -1.0
+
+    opponent = "black" if color == "red" else "red"  # color of opponent
+
+    if tracker is not None:
+        return tanh((score(tracker.snapshot(color)) - score(tracker.snapshot(opponent))) / SCALE)
+
+    return tanh((score(features(board, color)) - score(features(board, opponent))) / SCALE)
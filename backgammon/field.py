@@ -1,14 +1,20 @@
 # field.py
 # Contains Field class
 
-from threading import Lock
-from typing import Tuple
+from typing import BinaryIO, List, Tuple
 
 import pygame
 
 from abstractplayer import AbstractPlayer
+from animation import Timeline
+from board import Board
 from cell import Cell
 from dice import Dice
+from dicesource import DiceSource, RandomDices
+from hittest import HitTest
+from instrumentation import lock, span
+from record import GameWriter
+from renderer import Renderer
 from visible import Visible
 
 
@@ -16,19 +22,39 @@ class Field(Visible):
     """Field(Visible) class
     Describes backgammon field
     
+    Field is a view of board, cells print board's checkers
+    
+    Field is printed by layers: static background is prerendered once, cells,
+    dices and moving checker are reprinted only if they are changed
+    
     Methods:
         1) start(): starts game
-        2) print(): prints field
+        2) stop(): stops game after current turn
+        3) update(dt: float): animates moves by passed time
+        4) print(): prints changed parts of field, returns dirty rectangles
+        5) invalidate(): reprints whole field on next frame
+        6) cell_at(position: Tuple[int, int]): returns cell at pixel position
+    
+    Properties:
+        1) board: board of game
+        2) winner: winner of game
+        3) timeline: timeline of checkers' moves animations
     """
 
     def __init__(self, screen: pygame.Surface, size: Tuple[int, int],
-                 players: Tuple[AbstractPlayer]) -> None:
+                 players: Tuple[AbstractPlayer], animation_time: float = Cell.TIME,
+                 dices: DiceSource = None, record: BinaryIO = None) -> None:
         """Field constructor
 
         Args:
             screen (pygame.Surface): surface to print on
             size (Tuple[int]): size of field image
             players (Tuple[AbstractPlayer]): 2-element tuple of players
+            animation_time (float, optional): time of checker's move animation, seconds,
+                0 for instant mode. Defaults to Cell.TIME
+            dices (DiceSource, optional): source of rolls, seeded or scripted source
+                replays game. Defaults to None (not seeded stream)
+            record (BinaryIO, optional): binary log to append game to. Defaults to None
         """
         
         self._screen = screen  # set screen
@@ -37,39 +63,79 @@ class Field(Visible):
         
         self._load_image("images/field.png")  # load image
         
+        background = pygame.Surface(screen.get_size())  # static layer
+        background.blit(self._image, self._position)
+        if pygame.display.get_surface() is not None:  # use format of display for fast blits
+            background = background.convert()
+        self._renderer = Renderer(screen, background)  # renderer of changed parts of field
+        
         self._dices = [Dice(screen, (200 + 100 * i, 450), (40, 40)) \
             for i in range(2)]  # list of two dices
+        self._source = dices if dices is not None else RandomDices()  # source of rolls
+        
+        self._board = Board()  # board
         
-        self._cells = [Cell(self._screen,
-                            i,
-                            15 if i == 0 or i == 12 else 0,
-                            "red" if i == 0 else "black"
-                            if i == 12 else "") \
+        self._cells = [Cell(self._screen, i, self._board) \
                                 for i in range(0, 26)] # list of 26 cells (24 main and 2 of exited checkers)
+        self._hittest = HitTest(self._cells, screen.get_size())  # lookup of cells by positions
+        
+        self._timeline = Timeline(screen, self._cells, animation_time)  # timeline of animations
+        self._board.add_listener(self._timeline.push)  # animate every move on board
         
         self._players = players  # players tuple
         
-        self._cell_locker = Lock()  # cells locker
+        self._writer = GameWriter(record, self._board) if record is not None else None  # writer of game
+        
+        self._cell_locker = lock("cell_locker")  # cells locker
         
         self._winner = None  # winner
+        self._stopped = False  # is game stopped
 
     def start(self) -> None:
         """Starts game"""
         
-        while len(self._cells[24]) < 15 and len(self._cells[25]) < 15:  # while there are checkers of both colors, play game
-            self._throw_dices()  # throw dices
-            
-            self._players[0].play([self._dices[0].value, self._dices[1].value])  # next players plays
-            
-            # if double, throw one more time
-            if self._dices[0].value == self._dices[1].value:
-                continue
+        while self._board.winner is None and not self._stopped:  # while there are checkers of both colors, play game
+            with span("turn", "game"):  # measure turn
+                self._throw_dices()  # throw dices
+                
+                with span(f"{type(self._players[0]).__name__}.play", "decision"):  # measure decision
+                    self._players[0].play([self._dices[0].value, self._dices[1].value])  # next players plays
+                
+                if self._writer is not None:  # record turn
+                    self._writer.turn((self._dices[0].value, self._dices[1].value))
             
             self._players = self._players[1:] + self._players[:1]  # shift players
             
+        if self._writer is not None:  # record end of game
+            self._writer.close(self._board.winner)
+        
         # set winner
-        self._winner = self._players[-1]
+        if self._board.winner is not None:
+            self._winner = self._players[-1]
+
+    def stop(self) -> None:
+        """Stops game after current turn"""
+        
+        self._stopped = True  # set flag
         
+    @property
+    def board(self) -> Board:
+        """Returns board of game
+
+        Returns:
+            Board: board
+        """
+        return self._board
+
+    @property
+    def timeline(self) -> Timeline:
+        """Returns timeline of checkers' moves animations
+
+        Returns:
+            Timeline: timeline
+        """
+        return self._timeline
+
     @property
     def winner(self) -> AbstractPlayer:
         """Returns winner of game
@@ -82,19 +148,50 @@ class Field(Visible):
     def _throw_dices(self) -> None:
         """Throws each dice"""
         
-        # throw each dice
-        for dice in self._dices:
-            dice.throw()
+        # throw each dice with value of next roll
+        for dice, value in zip(self._dices, self._source.roll()):
+            dice.throw(value)
+
+    def update(self, dt: float) -> None:
+        """Animates moves by passed time, must be called from render loop
+
+        Args:
+            dt (float): passed time, seconds
+        """
+        
+        self._timeline.advance(dt)  # advance animations
+
+    def cell_at(self, position: Tuple[int, int]) -> Cell:
+        """Returns cell at pixel position
+
+        Args:
+            position (Tuple[int, int]): pixel position
+
+        Returns:
+            Cell: cell or None if there is no cell at position
+        """
+        
+        index = self._hittest.find(position)  # index of cell
+        
+        return self._cells[index] if index is not None else None
 
-    def print(self) -> None:
-        """Prints field"""
+    def invalidate(self) -> None:
+        """Reprints whole field on next frame"""
+        
+        self._renderer.invalidate()  # mark screen as dirty
+
+    def print(self) -> List[pygame.Rect]:
+        """Prints changed parts of field
+
+        Returns:
+            List[pygame.Rect]: dirty rectangles to update on display
+        """
         
-        super().print()  # print background
+        sprites = [(dice, dice.area, dice.value, dice) for dice in self._dices]  # dices
+        sprites.extend((cell, cell.area, cell.state, cell) for cell in self._cells)  # cells
         
-        # print dices
-        for dice in self._dices:
-            dice.print()
+        checker = self._timeline.checker  # moving checker
+        if checker is not None:
+            sprites.append((self._timeline, checker.area, checker.color, checker))
         
-        # print cells
-        for cell in self._cells:
-            cell.print()
+        return self._renderer.render(sprites)  # print sprites
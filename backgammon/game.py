@@ -0,0 +1,105 @@
+# game.py
+# Contains Game class
+
+from typing import Tuple
+
+from abstractplayer import AbstractPlayer
+from board import Board
+from dicesource import DiceSource, RandomDices
+from instrumentation import span
+from record import GameWriter
+
+
+class Game:
+    """Game class
+    Describes backgammon game without any graphics
+
+    Methods:
+        1) start(max_turns: int): plays game until one of players wins
+
+    Properties:
+        1) board: board of game
+        2) winner: winner of game
+        3) turns: number of played turns
+    """
+
+    def __init__(self, board: Board, players: Tuple[AbstractPlayer, AbstractPlayer],
+                 dices: DiceSource = None, writer: GameWriter = None) -> None:
+        """Game constructor
+
+        Args:
+            board (Board): board players play on
+            players (Tuple[AbstractPlayer, AbstractPlayer]): 2-element tuple of players,
+                first player starts
+            dices (DiceSource, optional): source of rolls. Defaults to None (not seeded stream)
+            writer (GameWriter, optional): writer of game to log. Defaults to None (not recorded)
+        """
+
+        self._board = board  # set board
+        self._players = tuple(players)  # set players
+        self._dices = dices if dices is not None else RandomDices()  # set source of rolls
+        self._writer = writer  # set writer
+
+        self._winner = None  # winner
+        self._turns = 0  # number of played turns
+
+    def start(self, max_turns: int = None) -> None:
+        """Plays game until one of players exits all checkers
+
+        Args:
+            max_turns (int, optional): number of turns to stop after, winner is None
+                if game isn't finished. Defaults to None (play to the end)
+        """
+
+        while self._board.winner is None:  # while there are checkers of both colors, play game
+            if max_turns is not None and self._turns >= max_turns:  # stop game
+                break
+
+            with span("turn", "game"):  # measure turn
+                dices = self._dices.roll()  # throw dices
+
+                player = self._players[self._turns % 2]  # player to move
+                with span(f"{type(player).__name__}.play", "decision"):  # measure decision
+                    player.play(dices)  # next player plays
+
+                if self._writer is not None:  # record turn
+                    self._writer.turn(dices)
+
+            self._turns += 1  # count turn
+
+        if self._writer is not None:  # record end of game
+            self._writer.close(self._board.winner)
+
+        # set winner
+        if self._board.winner is not None:
+            self._winner = self._players[(self._turns - 1) % 2]
+
+    @property
+    def board(self) -> Board:
+        """Board of game
+
+        Returns:
+            Board: board
+        """
+
+        return self._board  # return board
+
+    @property
+    def winner(self) -> AbstractPlayer:
+        """Winner of game
+
+        Returns:
+            AbstractPlayer: winner or None if game isn't finished
+        """
+
+        return self._winner  # return winner
+
+    @property
+    def turns(self) -> int:
+        """Number of played turns
+
+        Returns:
+            int: number of turns
+        """
+
+        return self._turns  # return turns
@@ -0,0 +1,65 @@
+# hittest.py
+# Contains HitTest class
+
+from array import array
+from bisect import bisect_right
+from typing import List, Tuple
+
+
+class HitTest:
+    """HitTest class
+    Describes lookup of cell by pixel position
+
+    Screen is split by borders of cells into columns and rows, so every pixel of one
+    column and row is inside of the same cells. Column and row of pixel are taken from
+    precomputed arrays and cell from table, so position is found in O(1)
+
+    Methods:
+        1) find(position: Tuple[int, int]): returns index of cell at position
+    """
+
+    def __init__(self, cells: List, size: Tuple[int, int]) -> None:
+        """HitTest constructor
+
+        Args:
+            cells (List[Cell]): cells, borders are taken from their rectangles
+            size (Tuple[int, int]): size of screen
+        """
+
+        xs, ys = {0}, {0}  # first pixels of columns and rows
+        for cell in cells:  # isinside excludes borders
+            x, y, w, h = cell.rect
+            xs.update((x + 1, x + w))
+            ys.update((y + 1, y + h))
+        xs, ys = sorted(xs), sorted(ys)
+
+        self._columns = array("H", (bisect_right(xs, x) - 1 for x in range(size[0])))  # columns of pixels
+        self._rows = array("H", (bisect_right(ys, y) - 1 for y in range(size[1])))  # rows of pixels
+        self._height = len(ys)  # number of rows
+
+        # index of cell inside every column and row, -1 if there is no cell
+        self._table = array("b", [-1] * (len(xs) * len(ys)))
+        for c, x in enumerate(xs):
+            for r, y in enumerate(ys):
+                for cell in cells:
+                    if cell.isinside((x, y)):
+                        self._table[c * self._height + r] = cell.index
+                        break
+
+    def find(self, position: Tuple[int, int]) -> int:
+        """Returns index of cell at position
+
+        Args:
+            position (Tuple[int, int]): pixel position
+
+        Returns:
+            int: index of cell or None if there is no cell at position
+        """
+
+        x, y = position
+        if not (0 <= x < len(self._columns) and 0 <= y < len(self._rows)):  # out of screen
+            return None
+
+        index = self._table[self._columns[x] * self._height + self._rows[y]]  # index of cell
+
+        return index if index >= 0 else None
@@ -0,0 +1,131 @@
+# inputstage.py
+# Contains InputStage class
+
+from typing import List, Tuple
+
+import pygame
+
+from instrumentation import count
+from player import Player
+
+
+class InputStage:
+    """InputStage class
+    Describes input of one frame: mouse events are collected and dispatched to player at once
+
+    Motion events are collapsed to the latest position, button events are kept in order.
+    Before every button event pointer is moved to its position, so button is handled with
+    highlight of the cell under it. Other events are dropped. Every added event is
+    either merged, dropped or dispatched
+
+    Methods:
+        1) add(event: pygame.event.Event): adds event of frame
+        2) dispatch(player: Player): handles collected events by player
+
+    Properties:
+        1) received: number of added events
+        2) merged: number of motion events replaced by later ones
+        3) dropped: number of not handled events
+        4) dispatched: number of events handled by player
+    """
+
+    def __init__(self) -> None:
+        """InputStage constructor"""
+
+        self._actions: List[Tuple[int, Tuple[int, int]]] = []  # types and positions of events in order
+        self._motion = None  # latest position of not dispatched motion
+
+        self._received = 0  # number of added events
+        self._merged = 0  # number of replaced motion events
+        self._dropped = 0  # number of not handled events
+        self._dispatched = 0  # number of handled events
+        self._counted = (0, 0)  # merged and dropped events passed to instrumentation
+
+    @property
+    def received(self) -> int:
+        """Number of added events
+
+        Returns:
+            int: number of events
+        """
+
+        return self._received  # return number
+
+    @property
+    def merged(self) -> int:
+        """Number of motion events replaced by later ones
+
+        Returns:
+            int: number of events
+        """
+
+        return self._merged  # return number
+
+    @property
+    def dropped(self) -> int:
+        """Number of not handled events
+
+        Returns:
+            int: number of events
+        """
+
+        return self._dropped  # return number
+
+    @property
+    def dispatched(self) -> int:
+        """Number of events handled by player
+
+        Returns:
+            int: number of events
+        """
+
+        return self._dispatched  # return number
+
+    def add(self, event: pygame.event.Event) -> None:
+        """Adds event of frame
+
+        Args:
+            event (pygame.event.Event): event
+        """
+
+        self._received += 1  # count event
+
+        match event.type:  # match event type
+            case pygame.MOUSEMOTION:  # keep only latest position
+                if self._motion is not None:
+                    self._merged += 1
+                self._motion = event.pos
+
+            case pygame.MOUSEBUTTONDOWN:  # pointer is moved to button, then button is pressed
+                if self._motion is not None:
+                    self._merged += 1
+                self._motion = None
+                self._actions.append((pygame.MOUSEBUTTONDOWN, event.pos))
+
+            case _:  # event isn't handled
+                self._dropped += 1
+
+    def dispatch(self, player: Player) -> None:
+        """Handles collected events by player and clears them
+
+        Args:
+            player (Player): player handling events
+        """
+
+        if self._motion is not None:  # move pointer to latest position
+            self._actions.append((pygame.MOUSEMOTION, self._motion))
+            self._motion = None
+
+        for kind, position in self._actions:
+            player.move_mouse(position)  # move mouse
+            player.mousemotion_event_handler(position)  # handle motion
+            if kind == pygame.MOUSEBUTTONDOWN:
+                player.mousebuttondown_event_handler(position)  # handle button
+
+        self._dispatched += len(self._actions)  # count handled events
+        count("input dispatched", len(self._actions))
+        count("input merged", self._merged - self._counted[0])
+        count("input dropped", self._dropped - self._counted[1])
+        self._counted = (self._merged, self._dropped)
+
+        self._actions.clear()
@@ -0,0 +1,325 @@
+# instrumentation.py
+# Contains Tracer and TracedLock classes and functions of opt-in instrumentation
+#
+# Instrumentation is disabled by default and costs one check per call. It is enabled by
+# environment variable BACKGAMMON_TRACE with path of trace file, for example:
+#     BACKGAMMON_TRACE=trace.json python main.py
+# At exit trace is saved in Chrome trace format (open it in ui.perfetto.dev or
+# chrome://tracing) and summary of timers, locks, counters and frames is printed
+
+import atexit
+import json
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Iterator, List
+
+FRAMES = (5, 10, 20, 34, 50, 100, 250)  # upper bounds of frame time histogram bins, milliseconds
+EVENTS = 1000000  # maximal number of saved trace events
+
+tracer = None  # global tracer, None if instrumentation is disabled
+
+_NULL = nullcontext()  # context of disabled timer
+
+
+class _Stat:
+    """Statistics of one timer"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0  # number of measures
+        self.total = 0.0  # sum of times, seconds
+        self.max = 0.0  # maximal time, seconds
+
+    def add(self, time: float) -> None:
+        self.count += 1
+        self.total += time
+        self.max = max(self.max, time)
+
+
+class Tracer:
+    """Tracer class
+    Describes collector of timers, lock statistics, frame times and trace events
+
+    Methods:
+        1) span(name: str, category: str): context manager measuring time of block
+        2) add(name: str, category: str, start: float, end: float): adds measured block
+        3) frame(time: float): adds frame time to histogram
+        4) count(name: str, n: int): adds n to counter
+        5) export(path: str): saves trace in Chrome trace format
+        6) summary(): returns text summary
+
+    Properties:
+        1) frames: numbers of frames in histogram bins
+    """
+
+    def __init__(self) -> None:
+        """Tracer constructor"""
+
+        self._start = perf_counter()  # time of start
+        self._pid = os.getpid()  # id of process
+        self._events = []  # trace events
+        self._dropped = 0  # number of not saved events
+        self._stats = {}  # statistics by categories and names
+        self._frames = [0] * (len(FRAMES) + 1)  # histogram of frame times
+        self._counters = {}  # counters by names
+        self._locker = threading.Lock()  # locker of collected data
+
+    @property
+    def frames(self) -> List[int]:
+        """Numbers of frames in histogram bins, last bin is longer than last bound
+
+        Returns:
+            List[int]: numbers of frames
+        """
+
+        return list(self._frames)  # return histogram
+
+    @contextmanager
+    def span(self, name: str, category: str = "timer") -> Iterator[None]:
+        """Context manager measuring time of block
+
+        Args:
+            name (str): name of timer
+            category (str, optional): category of timer. Defaults to "timer"
+        """
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, perf_counter())
+
+    def add(self, name: str, category: str, start: float, end: float) -> None:
+        """Adds measured block
+
+        Args:
+            name (str): name of timer
+            category (str): category of timer
+            start (float): perf_counter() at start
+            end (float): perf_counter() at end
+        """
+
+        event = {"name": name, "cat": category, "ph": "X", "pid": self._pid,
+                 "tid": threading.get_ident(), "ts": (start - self._start) * 1e6,
+                 "dur": (end - start) * 1e6}  # complete event
+
+        with self._locker:
+            self._stats.setdefault((category, name), _Stat()).add(end - start)
+            if len(self._events) < EVENTS:
+                self._events.append(event)
+            else:
+                self._dropped += 1
+
+    def frame(self, time: float) -> None:
+        """Adds frame time to histogram
+
+        Args:
+            time (float): time of frame, seconds
+        """
+
+        with self._locker:
+            self._frames[bisect_left(FRAMES, time * 1e3)] += 1
+            if len(self._events) < EVENTS:
+                self._events.append({"name": "frame time", "ph": "C", "pid": self._pid,
+                                     "ts": (perf_counter() - self._start) * 1e6,
+                                     "args": {"ms": time * 1e3}})  # counter event
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Adds n to counter
+
+        Args:
+            name (str): name of counter
+            n (int, optional): added number. Defaults to 1
+        """
+
+        with self._locker:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def export(self, path: str) -> None:
+        """Saves trace in Chrome trace format
+
+        Args:
+            path (str): path to file
+        """
+
+        with self._locker:
+            events = list(self._events)
+
+        names = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": t.ident,
+                  "args": {"name": t.name}} for t in threading.enumerate()]  # names of threads
+
+        with open(path, "w") as file:
+            json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, file)
+
+    def summary(self) -> str:
+        """Returns text summary of timers, locks, counters and frames
+
+        Returns:
+            str: summary
+        """
+
+        with self._locker:
+            stats = dict(self._stats)
+            frames = list(self._frames)
+            counters = dict(self._counters)
+
+        lines = [f"{'category':8} {'name':28} {'count':>8} {'total, ms':>11} "
+                 f"{'mean, ms':>10} {'max, ms':>10}"]
+        for (category, name), s in sorted(stats.items()):
+            lines.append(f"{category:8} {name:28} {s.count:8} {s.total * 1e3:11.2f} "
+                         f"{s.total / s.count * 1e3:10.3f} {s.max * 1e3:10.3f}")
+
+        for name, n in sorted(counters.items()):
+            lines.append(f"{'counter':8} {name:28} {n:8}")
+
+        total = max(sum(frames), 1)  # number of frames
+        lines.append("frame time, ms:")
+        for i, n in enumerate(frames):
+            bound = f"<= {FRAMES[i]}" if i < len(FRAMES) else f"> {FRAMES[-1]}"
+            lines.append(f"    {bound:>6} {n:8} {n / total:7.1%} {'#' * round(40 * n / total)}")
+
+        if self._dropped:
+            lines.append(f"{self._dropped} trace events were dropped")
+
+        return "\n".join(lines)
+
+
+class TracedLock:
+    """TracedLock class
+    Describes lock which counts time of waiting for it and time of holding it
+
+    Lock has the same interface as threading.Lock and may be used by threading.Condition
+
+    Methods:
+        1) acquire(blocking: bool, timeout: float): acquires lock
+        2) release(): releases lock
+        3) locked(): returns True if lock is acquired
+    """
+
+    def __init__(self, name: str, tracer: Tracer) -> None:
+        """TracedLock constructor
+
+        Args:
+            name (str): name of lock
+            tracer (Tracer): tracer collecting statistics
+        """
+
+        self._name = name  # set name
+        self._tracer = tracer  # set tracer
+        self._lock = threading.Lock()  # lock
+        self._acquired = 0.0  # time of last acquisition
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self._acquired = perf_counter()
+            self._tracer.add(f"wait {self._name}", "lock", start, self._acquired)
+
+        return acquired
+
+    def release(self) -> None:
+        end = perf_counter()
+        start = self._acquired
+        self._lock.release()
+        self._tracer.add(f"hold {self._name}", "lock", start, end)
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+def enable(path: str = None) -> Tracer:
+    """Enables instrumentation, must be called before objects with locks are created
+
+    Args:
+        path (str, optional): path to trace file saved at exit. Defaults to None (not saved)
+
+    Returns:
+        Tracer: global tracer
+    """
+
+    global tracer
+
+    if tracer is None:
+        tracer = Tracer()
+        atexit.register(finish, path)  # save trace at exit
+
+    return tracer  # return tracer
+
+
+def finish(path: str = None) -> None:
+    """Saves trace and prints summary if instrumentation is enabled
+
+    Args:
+        path (str, optional): path to trace file. Defaults to None (not saved)
+    """
+
+    if tracer is None:
+        return
+
+    if path:
+        tracer.export(path)
+    print(tracer.summary(), flush=True)
+
+
+def span(name: str, category: str = "timer"):
+    """Returns context manager measuring time of block, it does nothing if instrumentation is disabled
+
+    Args:
+        name (str): name of timer
+        category (str, optional): category of timer. Defaults to "timer"
+
+    Returns:
+        ContextManager: context manager
+    """
+
+    return tracer.span(name, category) if tracer is not None else _NULL
+
+
+def lock(name: str):
+    """Returns named lock, traced if instrumentation is enabled
+
+    Args:
+        name (str): name of lock
+
+    Returns:
+        Lock: threading.Lock or TracedLock
+    """
+
+    return TracedLock(name, tracer) if tracer is not None else threading.Lock()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Adds n to counter if instrumentation is enabled
+
+    Args:
+        name (str): name of counter
+        n (int, optional): added number. Defaults to 1
+    """
+
+    if tracer is not None:
+        tracer.count(name, n)
+
+
+def frame(time: float) -> None:
+    """Adds frame time to histogram if instrumentation is enabled
+
+    Args:
+        time (float): time of frame, seconds
+    """
+
+    if tracer is not None:
+        tracer.frame(time)
+
+
+if os.environ.get("BACKGAMMON_TRACE"):  # enable by environment
+    enable(os.environ["BACKGAMMON_TRACE"])
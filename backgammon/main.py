@@ -1,6 +1,7 @@
 # main.py
-# Run file to start game
+# Run file to start game, optional argument is seed of dices
 
+import sys
 from threading import Thread
 from tkinter import *
 from tkinter import messagebox
@@ -8,11 +9,15 @@ from tkinter import messagebox
 import pygame
 
 from bot import Bot
+from dicesource import RandomDices
 from field import Field
+from inputstage import InputStage
+from instrumentation import frame, span
 from player import Player
 
 SIZE = (1000, 935)  # size of screen
 FPS = 30  # max fps
+SEED = sys.argv[1] if len(sys.argv) > 1 else None  # seed of dices
 
 pygame.display.set_icon(pygame.image.load("images/black.png"))  # set icon
 pygame.display.set_caption("Backgammon")  # set title
@@ -21,10 +26,13 @@ clock = pygame.time.Clock()  # clock
 
 screen = pygame.display.set_mode(SIZE)  # screen
 
-field = Field(screen, SIZE, None)  # field
+dices = RandomDices(SEED)  # source of rolls
+games = 0  # number of started games
+
+field = Field(screen, SIZE, None, dices=dices.stream(games))  # field
 
 player = Player(field)  # player
-bot = Bot(field)  # bot
+bot = Bot(field.board)  # bot
 
 field._players = (player, bot)  # set players
 
@@ -32,32 +40,40 @@ game = Thread(target=field.start, args=(), daemon=True)
 game.start()  # start game
 
 is_running = True  # is running flag
+events = InputStage()  # input of frame
 
 while is_running:
-    field.print()  # print all
-    pygame.display.update()  # update display
-    clock.tick(FPS)  # wait
+    with span("print", "frame"):  # measure printing
+        pygame.display.update(field.print())  # print changed parts of field and update them on display
+    dt = clock.tick(FPS) / 1000  # wait, time of frame in seconds
+    frame(dt)  # count frame time
+    field.update(dt)  # animate moves
     
     for event in pygame.event.get():  # handle events
         match event.type:  # match event type
             case pygame.QUIT:  # quit event
                 if messagebox.askyesno(message="Do you want to exit?"):
+                    field.stop()  # stop game
+                    player.cancel()  # wake game thread
                     is_running = False
                 break
             
-            case pygame.MOUSEMOTION:  # mousemotion event
-                player.move_mouse(event.pos)  # move mouse
-                player.mousemotion_event_handler(event.pos)  # handle event
+            case pygame.WINDOWEXPOSED:  # window exposed event
+                field.invalidate()  # reprint whole field
             
-            case pygame.MOUSEBUTTONDOWN:  # mousebuttondown event
-                player.mousebuttondown_event_handler(event.pos)  # handle event
-                
-    if not game.is_alive():  # if game ended
+            case _:  # input event
+                events.add(event)  # collect event
+    
+    with span("input", "frame"):  # measure input
+        events.dispatch(player)  # handle input of frame once
+    
+    if is_running and not game.is_alive() and not field.timeline.busy:  # if game ended
         if messagebox.askyesno(title="You won" if field.winner is player else "Game over",
                                message="Play again?"):  # if user wants to play again
-            field = Field(screen, SIZE, None)
+            games += 1  # count game
+            field = Field(screen, SIZE, None, dices=dices.stream(games))
             player = Player(field)  # player
-            bot = Bot(field)  # bot
+            bot = Bot(field.board)  # bot
             field._players = (player, bot)  # set players
             game = Thread(target=field.start, args=(), daemon=True)
             game.start()  # start game
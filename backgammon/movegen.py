@@ -0,0 +1,356 @@
+# movegen.py
+# Contains Turn class and functions generating legal moves of long backgammon
+
+from typing import Dict, List, Tuple
+
+from board import Board
+
+PATHS = {color: tuple(Board.to_absolute(i, color) for i in range(24))
+         for color in Board.COLORS}  # cells' indexes of each color's path
+HOME = 18  # index on path of first home cell
+PRIME = 6  # length of forbidden block
+HEAD_DOUBLES = (3, 4, 6)  # doubles allowing to move two checkers from head on first turn
+ROLLS = tuple(((a, b), (1 if a == b else 2) / 36)
+              for a in range(1, 7) for b in range(a, 7))  # 21 distinct rolls and their probabilities
+
+
+class Turn:
+    """Turn class
+    Describes one legal turn (all moves made with one roll)
+
+    Properties:
+        1) moves: tuple of (from, to) cells' indexes
+        2) board: board after turn
+    """
+
+    __slots__ = ("_moves", "_board")
+
+    def __init__(self, moves: Tuple[Tuple[int, int]], board: Board) -> None:
+        """Turn constructor
+
+        Args:
+            moves (Tuple[Tuple[int, int]]): tuple of (from, to) cells' indexes
+            board (Board): board after turn
+        """
+
+        self._moves = moves  # set moves
+        self._board = board  # set board
+
+    def __repr__(self) -> str:
+        return f"Turn({self._moves})"
+
+    @property
+    def moves(self) -> Tuple[Tuple[int, int]]:
+        """Moves of turn
+
+        Returns:
+            Tuple[Tuple[int, int]]: tuple of (from, to) cells' indexes
+        """
+
+        return self._moves  # return moves
+
+    @property
+    def board(self) -> Board:
+        """Board after turn
+
+        Returns:
+            Board: board
+        """
+
+        return self._board  # return board
+
+
+def turn_dices(dices: Tuple[int, int]) -> Tuple[int]:
+    """Returns dices' values to play in turn (double is played four times)
+
+    Args:
+        dices (Tuple[int, int]): values of two dices
+
+    Returns:
+        Tuple[int]: values to play
+    """
+
+    return (dices[0],) * 4 if dices[0] == dices[1] else (dices[0], dices[1])
+
+
+def head_moves(board: Board, color: str, dices: Tuple[int]) -> int:
+    """Returns number of checkers allowed to move from head in turn
+
+    Args:
+        board (Board): board
+        color (str): color of moving player
+        dices (Tuple[int]): values to play (see turn_dices)
+
+    Returns:
+        int: 2 on first turn with 6-6, 4-4 or 3-3, else 1
+    """
+
+    first = board[Board.HEADS[color]] * Board.SIGNS[color] == Board.CHECKERS  # is first turn
+    double = len(dices) == 4 and dices[0] in HEAD_DOUBLES  # is special double
+
+    return 2 if first and double else 1
+
+
+def legal_turns(board: Board, color: str, dices: Tuple[int], heads: int = None) -> List[Turn]:
+    """Returns all legal turns, turns leading to the same position are collapsed into one
+
+    Args:
+        board (Board): board
+        color (str): color of moving player
+        dices (Tuple[int]): values to play (see turn_dices)
+        heads (int, optional): checkers allowed to move from head. Defaults to None (see head_moves)
+
+    Returns:
+        List[Turn]: legal turns, empty if player can't move
+    """
+
+    if heads is None:  # compute allowed moves from head
+        heads = head_moves(board, color, dices)
+
+    return _Search(board, color).turns(tuple(sorted(dices)), heads)
+
+
+def legal_moves(board: Board, color: str, dices: Tuple[int],
+                heads: int = None) -> Dict[Tuple[int, int], int]:
+    """Returns moves of one checker which start some legal turn
+
+    Args:
+        board (Board): board
+        color (str): color of moving player
+        dices (Tuple[int]): values left to play (see turn_dices)
+        heads (int, optional): checkers allowed to move from head. Defaults to None (see head_moves)
+
+    Returns:
+        Dict[Tuple[int, int], int]: dictionary of (from, to) cells' indexes and value of used dice
+    """
+
+    if heads is None:  # compute allowed moves from head
+        heads = head_moves(board, color, dices)
+
+    return _Search(board, color).moves(tuple(sorted(dices)), heads)
+
+
+def can_move(board: Board, color: str, dices: Tuple[int], heads: int = None) -> bool:
+    """Returns True if player can move at least one checker, else False
+
+    Args:
+        board (Board): board
+        color (str): color of moving player
+        dices (Tuple[int]): values left to play (see turn_dices)
+        heads (int, optional): checkers allowed to move from head. Defaults to None (see head_moves)
+
+    Returns:
+        bool: True if player can move
+    """
+
+    if heads is None:  # compute allowed moves from head
+        heads = head_moves(board, color, dices)
+
+    search = _Search(board, color)  # search
+
+    return any(search.steps(dice, heads) for dice in set(dices))
+
+
+class _Search:
+    """Search of legal moves in coordinates of moving player's path
+
+    Path cells contain positive numbers of own checkers and negative numbers of opponent's
+    """
+
+    def __init__(self, board: Board, color: str) -> None:
+        self._board = board  # source board
+        self._color = color  # moving color
+        self._sign = Board.SIGNS[color]  # sign of moving color
+        self._path = PATHS[color]  # cells' indexes of path
+        self._off = Board.OFFS[color]  # cell of exited checkers
+
+        cells = board._cells  # cells of board
+        self._points = [cells[i] * self._sign for i in self._path]  # path cells
+
+        # number of own checkers out of home
+        self._outside = sum(n for n in self._points[:HOME] if n > 0)
+
+        # farthest opponent's checker on opponent's path, opponent's index i is own (i + 12) % 24
+        self._front = -1
+        for i in range(23, -1, -1):
+            if self._points[(i + 12) % 24] < 0:
+                self._front = i
+                break
+
+        self._moves = []  # current sequence of moves
+        self._visited = set()  # visited states
+        self._depths = {}  # maximal numbers of moves from states
+        self._results = {}  # final positions and their moves
+        self._best = 0  # maximal number of moves
+
+    def steps(self, dice: int, heads: int) -> List[Tuple[int, int]]:
+        """Returns possible moves of one checker on path by dice"""
+
+        points = self._points  # path cells
+        result = []  # possible moves
+
+        back = -1  # farthest from exit own checker in home
+        if self._outside == 0:  # can exit checkers
+            for i in range(HOME, 24):
+                if points[i] > 0:
+                    back = i
+                    break
+
+        for i in range(24):
+            if points[i] <= 0 or (i == 0 and heads == 0):  # no own checkers or head is used
+                continue
+
+            j = i + dice  # destination
+
+            if j < 24:  # move on field
+                if points[j] < 0:  # cell is occupied by opponent
+                    continue
+                if points[j] == 0 and self._makes_prime(i, j):  # forbidden block
+                    continue
+                result.append((i, j))
+            elif back >= 0 and (j == 24 or i == back):  # exit by exact or higher dice
+                result.append((i, 24))
+
+        return result
+
+    def _makes_prime(self, i: int, j: int) -> bool:
+        """Returns True if moving to empty cell j builds block of six with no opponent ahead"""
+
+        points = self._points  # path cells
+        points[i] -= 1  # take checker
+
+        # find block on opponent's path containing j
+        k = (j + 12) % 24  # index of j on opponent's path
+        low, high = k, k
+        while low > 0 and points[(low + 11) % 24] > 0:
+            low -= 1
+        while high < 23 and points[(high + 13) % 24] > 0:
+            high += 1
+
+        points[i] += 1  # return checker
+
+        return high - low + 1 >= PRIME and self._front <= min(high, k + PRIME - 1)
+
+    def _do(self, i: int, j: int) -> None:
+        """Moves checker on path"""
+
+        self._points[i] -= 1
+        if j < 24:
+            self._points[j] += 1
+            if i < HOME <= j:
+                self._outside -= 1
+
+    def _undo(self, i: int, j: int) -> None:
+        """Cancels move of checker on path"""
+
+        self._points[i] += 1
+        if j < 24:
+            self._points[j] -= 1
+            if i < HOME <= j:
+                self._outside += 1
+
+    def _next(self, dices: Tuple[int], heads: int):
+        """Yields possible moves and states after them"""
+
+        for n, dice in enumerate(dices):
+            if n > 0 and dices[n - 1] == dice:  # same dice is already tried
+                continue
+            rest = dices[:n] + dices[n + 1:]  # dices left
+            for i, j in self.steps(dice, heads):
+                yield i, j, dice, rest, heads - 1 if i == 0 else heads
+
+    def _search(self, dices: Tuple[int], heads: int) -> None:
+        """Searches all sequences of moves from current state"""
+
+        key = (tuple(self._points), dices, heads)  # state
+        if key in self._visited:  # subtree is already searched
+            return
+        self._visited.add(key)
+
+        terminal = True  # is there no moves
+        for i, j, dice, rest, left in self._next(dices, heads):
+            terminal = False
+            self._do(i, j)
+            self._moves.append((i, j, dice))
+            self._search(rest, left)
+            self._moves.pop()
+            self._undo(i, j)
+
+        if terminal and len(self._moves) >= self._best:
+            if len(self._moves) > self._best:  # longer sequence is found
+                self._best = len(self._moves)
+                self._results.clear()
+            moves = self._results.get(key[0])  # moves leading to the same position
+            # keep the first sequence, but prefer higher dice for one move
+            if moves is None or len(moves) == 1 and moves[0][2] < self._moves[0][2]:
+                self._results[key[0]] = tuple(self._moves)
+
+    def _depth(self, dices: Tuple[int], heads: int) -> int:
+        """Returns maximal number of moves from current state"""
+
+        key = (tuple(self._points), dices, heads)  # state
+        depth = self._depths.get(key)
+        if depth is not None:
+            return depth
+
+        depth = 0
+        for i, j, dice, rest, left in self._next(dices, heads):
+            self._do(i, j)
+            depth = max(depth, 1 + self._depth(rest, left))
+            self._undo(i, j)
+            if depth == len(dices):  # all dices are used
+                break
+
+        self._depths[key] = depth
+        return depth
+
+    def _cell(self, i: int) -> int:
+        """Converts index on path to cell index"""
+
+        return self._path[i] if i < 24 else self._off
+
+    def turns(self, dices: Tuple[int], heads: int) -> List[Turn]:
+        """Returns legal turns"""
+
+        self._search(dices, heads)
+
+        if self._best == 0:  # can't move
+            return []
+
+        results = list(self._results.items())  # final positions and moves
+        if self._best == 1 and len(dices) == 2 and dices[0] != dices[1]:  # only one dice is used
+            higher = [r for r in results if r[1][0][2] == dices[1]]  # turns using higher dice
+            results = higher or results
+
+        turns = []
+        for points, moves in results:
+            cells = self._board.tolist()  # cells after turn
+            for i in range(24):
+                cells[self._path[i]] = points[i] * self._sign
+            cells[self._off] += sum(1 for m in moves if m[1] == 24) * self._sign
+            turns.append(Turn(tuple((self._cell(i), self._cell(j)) for i, j, _ in moves),
+                              Board(cells)))
+
+        return turns
+
+    def moves(self, dices: Tuple[int], heads: int) -> Dict[Tuple[int, int], int]:
+        """Returns first moves of legal turns"""
+
+        best = self._depth(dices, heads)  # maximal number of moves
+        if best == 0:  # can't move
+            return {}
+
+        options = {}  # dices' values making each move
+        for i, j, dice, rest, left in self._next(dices, heads):
+            self._do(i, j)
+            if 1 + self._depth(rest, left) == best:
+                options.setdefault((self._cell(i), self._cell(j)), []).append(dice)
+            self._undo(i, j)
+
+        if best == 1 and len(dices) == 2 and dices[0] != dices[1]:  # only one dice is used
+            # moves using higher dice
+            higher = {m: dices[1] for m, values in options.items() if dices[1] in values}
+            if higher:
+                return higher
+
+        return {m: min(values) for m, values in options.items()}
@@ -0,0 +1,258 @@
+# network.py
+# Contains Network class and functions encoding positions for batched evaluation
+#
+# Position is encoded from one color's side: every side's 24 cells are taken along
+# its own path, so encoding doesn't depend on color. Network returns probability that
+# color wins when opponent is to move, all candidates are scored by one matrix product
+
+import os
+import struct
+from typing import List, Tuple
+
+import numpy as np
+
+from board import Board
+from movegen import PATHS
+
+NETWORK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "network.bin")  # default path
+MAGIC = b"BGNN"  # signature of file
+VERSION = 2  # version of format
+HIDDEN = 40  # default number of hidden units
+UNITS = 4  # units of one cell: 1, 2, 3 or more checkers and half of checkers over 3
+FEATURES = 2 * (24 * UNITS + 2)  # for both sides: cells, exited checkers and pips
+
+_HEADER = struct.Struct("<4sBHHQ")  # magic, version, number of features, hidden units, trained games
+_HEADER_1 = struct.Struct("<4sBHH")  # header of version 1 without trained games
+
+_PATHS = {color: np.array(PATHS[color], dtype=np.intp) for color in Board.COLORS}  # cells of paths
+_DISTANCES = np.arange(24, 0, -1, dtype=np.float32)  # distances from path cells to exit
+
+
+def _side(cells: np.ndarray, color: str) -> np.ndarray:
+    """Encodes checkers of one color, cells is (n, 26) array of signed checkers"""
+
+    sign = Board.SIGNS[color]  # sign of color
+    points = np.maximum(cells[:, _PATHS[color]] * sign, 0).astype(np.float32)  # checkers on path
+    n = len(cells)
+
+    units = np.empty((n, 24, UNITS), dtype=np.float32)
+    units[:, :, 0] = points >= 1
+    units[:, :, 1] = points >= 2
+    units[:, :, 2] = points >= 3
+    units[:, :, 3] = np.maximum(points - 3, 0) / 2
+
+    off = cells[:, Board.OFFS[color]] * sign / Board.CHECKERS  # part of exited checkers
+    pips = points @ _DISTANCES / (Board.CHECKERS * 24)  # part of pips of start position
+
+    return np.concatenate((units.reshape(n, -1), off[:, None], pips[:, None]), axis=1)
+
+
+def encode(boards: List[Board], color: str) -> np.ndarray:
+    """Encodes positions from color's side
+
+    Args:
+        boards (List[Board]): positions
+        color (str): color of player
+
+    Returns:
+        np.ndarray: (len(boards), FEATURES) array of features
+    """
+
+    cells = np.frombuffer(b"".join(b.key() for b in boards),
+                          dtype=np.int8).reshape(-1, Board.SIZE).astype(np.int16)  # signed checkers
+    opponent = "black" if color == "red" else "red"  # color of opponent
+
+    return np.concatenate((_side(cells, color), _side(cells, opponent)), axis=1)
+
+
+def size(hidden: int, features: int = FEATURES) -> int:
+    """Returns number of parameters of network
+
+    Args:
+        hidden (int): number of hidden units, 0 for linear network
+        features (int, optional): number of features. Defaults to FEATURES
+
+    Returns:
+        int: number of parameters
+    """
+
+    return features + 1 if hidden == 0 else features * hidden + 2 * hidden + 1
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+class Network:
+    """Network class
+    Describes evaluation network with one sigmoid hidden layer or linear one
+
+    All parameters are stored in one flat float32 array, weights are views of it, so
+    parameters may be placed in shared memory and updated in place
+
+    Methods:
+        1) evaluate(features: np.ndarray): returns values of batch of positions
+        2) gradient(features: np.ndarray): returns value and gradient of value by parameters
+        3) save(path: str): saves network
+        4) load(path: str): loads network (static)
+
+    Properties:
+        1) hidden: number of hidden units, 0 for linear network
+        2) params: flat array of parameters
+        3) games: number of games network is trained on
+    """
+
+    def __init__(self, hidden: int = HIDDEN, params: np.ndarray = None, seed: int = None,
+                 games: int = 0) -> None:
+        """Network constructor
+
+        Args:
+            hidden (int, optional): number of hidden units, 0 for linear network. Defaults to HIDDEN
+            params (np.ndarray, optional): flat float32 array of parameters, used without copying.
+                Defaults to None (small random parameters)
+            seed (int, optional): seed of random parameters. Defaults to None
+            games (int, optional): number of games network is trained on. Defaults to 0
+
+        Raises:
+            ValueError: in case of wrong number of parameters
+        """
+
+        if params is None:  # random parameters
+            params = (np.random.default_rng(seed).standard_normal(size(hidden)) * 0.1).astype(np.float32)
+
+        if len(params) != size(hidden):  # if size is incorrect
+            raise ValueError("Number of parameters is incorrect")  # throw exception
+
+        self._hidden = hidden  # set number of hidden units
+        self._params = params  # set parameters
+        self._games = games  # set number of trained games
+
+        if hidden == 0:  # linear network
+            self._w = params[:FEATURES]
+        else:
+            self._w1 = params[:FEATURES * hidden].reshape(FEATURES, hidden)
+            self._b1 = params[FEATURES * hidden:FEATURES * hidden + hidden]
+            self._w = params[FEATURES * hidden + hidden:-1]
+        self._b = params[-1:]
+
+    @property
+    def hidden(self) -> int:
+        """Number of hidden units, 0 for linear network
+
+        Returns:
+            int: number of units
+        """
+
+        return self._hidden  # return number
+
+    @property
+    def params(self) -> np.ndarray:
+        """Flat array of parameters
+
+        Returns:
+            np.ndarray: parameters
+        """
+
+        return self._params  # return parameters
+
+    @property
+    def games(self) -> int:
+        """Number of games network is trained on, saved with network
+
+        Returns:
+            int: number of games
+        """
+
+        return self._games  # return number
+
+    @games.setter
+    def games(self, value: int) -> None:
+        """Sets number of games network is trained on
+
+        Args:
+            value (int): number of games
+        """
+
+        self._games = value  # set number
+
+    def evaluate(self, features: np.ndarray) -> np.ndarray:
+        """Returns values of batch of positions
+
+        Args:
+            features (np.ndarray): (n, FEATURES) array of encoded positions
+
+        Returns:
+            np.ndarray: (n,) probabilities to win
+        """
+
+        if self._hidden:
+            features = _sigmoid(features @ self._w1 + self._b1)  # hidden layer
+
+        return _sigmoid(features @ self._w + self._b)  # return values
+
+    def gradient(self, features: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Returns value of one position and gradient of value by parameters
+
+        Args:
+            features (np.ndarray): (FEATURES,) array of encoded position
+
+        Returns:
+            Tuple[float, np.ndarray]: value and flat gradient
+        """
+
+        grad = np.empty_like(self._params)  # gradient
+
+        if self._hidden == 0:
+            value = float(_sigmoid(features @ self._w + self._b[0]))
+            d = value * (1 - value)  # derivative of output
+            grad[:FEATURES] = d * features
+        else:
+            h = _sigmoid(features @ self._w1 + self._b1)  # hidden layer
+            value = float(_sigmoid(h @ self._w + self._b[0]))
+            d = value * (1 - value)  # derivative of output
+            dh = d * self._w * h * (1 - h)  # derivatives of hidden units
+            n = FEATURES * self._hidden
+            grad[:n] = np.outer(features, dh).ravel()
+            grad[n:n + self._hidden] = dh
+            grad[n + self._hidden:-1] = d * h
+        grad[-1] = d
+
+        return value, grad
+
+    def save(self, path: str = NETWORK) -> None:
+        """Saves network
+
+        Args:
+            path (str, optional): path to file. Defaults to NETWORK
+        """
+
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, FEATURES, self._hidden, self._games))
+            file.write(self._params.astype("<f4").tobytes())
+
+    @staticmethod
+    def load(path: str = NETWORK) -> "Network":
+        """Loads network
+
+        Args:
+            path (str, optional): path to file. Defaults to NETWORK
+
+        Raises:
+            ValueError: in case of incorrect file
+
+        Returns:
+            Network: network
+        """
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, version, features, hidden = _HEADER_1.unpack_from(data)
+        header = _HEADER if version == VERSION else _HEADER_1  # version 1 has no trained games
+        games = _HEADER.unpack_from(data)[4] if version == VERSION else 0
+        if magic != MAGIC or version not in (1, VERSION) or features != FEATURES or \
+                len(data) != header.size + 4 * size(hidden):  # if file is incorrect
+            raise ValueError("Network is incorrect")  # throw exception
+
+        return Network(hidden, np.frombuffer(data, dtype="<f4", offset=header.size).astype(np.float32),
+                       games=games)
@@ -0,0 +1,92 @@
+# networkbot.py
+# Contains NetworkBot class
+
+import os
+from typing import Tuple
+
+from abstractplayer import AbstractPlayer
+from board import Board
+from movegen import Turn, legal_turns, turn_dices
+from network import NETWORK, Network, encode
+
+_networks = {}  # loaded networks by paths
+
+
+class NetworkBot(AbstractPlayer):
+    """NetworkBot(AbstractPlayer) class
+    Describes bot choosing turns by evaluation network
+
+    Positions after all legal turns are encoded in one array and scored by network
+    at once, turn with the best position is played
+
+    Methods:
+        1) play(dices: Tuple[int, int]): plays one backgammon step
+        2) choose(dices: Tuple[int, int]): returns best turn without playing it
+
+    Properties:
+        1) network: evaluation network
+    """
+
+    def __init__(self, board: Board, color: str = "black", network: Network = None) -> None:
+        """NetworkBot constructor
+
+        Args:
+            board (Board): backgammon board
+            color (str, optional): color of bot's checkers. Defaults to "black"
+            network (Network, optional): evaluation network. Defaults to None (network
+                loaded from NETWORK once in process, random network if it isn't trained)
+        """
+
+        if network is None:  # load default network
+            if NETWORK not in _networks:
+                _networks[NETWORK] = Network.load(NETWORK) if os.path.exists(NETWORK) else Network(seed=0)
+            network = _networks[NETWORK]
+
+        self._board = board  # set board
+        self._color = color  # set color
+        self._network = network  # set network
+
+    @property
+    def network(self) -> Network:
+        """Evaluation network
+
+        Returns:
+            Network: network
+        """
+
+        return self._network  # return network
+
+    def play(self, dices: Tuple[int, int]) -> None:
+        """Plays one backgammon step
+
+        Args:
+            dices (Tuple[int, int]): values of dices
+        """
+
+        turn = self.choose(dices)  # best turn
+
+        if turn is not None:  # move checkers
+            for from_index, to_index in turn.moves:
+                self._board.move(from_index, to_index)
+
+    def choose(self, dices: Tuple[int, int]) -> Turn:
+        """Returns turn with the best position
+
+        Args:
+            dices (Tuple[int, int]): values of dices
+
+        Returns:
+            Turn: best turn or None if bot can't move
+        """
+
+        turns = legal_turns(self._board, self._color, turn_dices(dices))  # candidates
+        if len(turns) < 2:  # nothing to evaluate
+            return turns[0] if turns else None
+
+        for turn in turns:  # winning turn is the best
+            if turn.board.winner == self._color:
+                return turn
+
+        values = self._network.evaluate(encode([t.board for t in turns], self._color))  # values
+
+        return turns[int(values.argmax())]  # return best turn
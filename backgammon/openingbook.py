@@ -0,0 +1,188 @@
+# openingbook.py
+# Contains OpeningBook class and functions generating opening book by rollouts
+# Run file to generate book once, for example:
+#     python openingbook.py --plies 2 --games 1296
+#
+# Book stores best turns of the first plies: red's turns for all 21 opening rolls,
+# then black's replies for all 21 rolls after each of red's best turns, and so on
+
+import argparse
+import os
+import struct
+from functools import partial
+from typing import Dict, Tuple
+
+from board import Board
+from movegen import ROLLS, legal_turns, turn_dices
+
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openingbook.bin")  # default path
+MAGIC = b"BGOB"  # signature of file
+
+_HEADER = struct.Struct("<4sI")  # magic, number of entries
+_ENTRY = struct.Struct("<QBB8B")  # hash of position and side, roll, number of moves, (from, to) of 4 moves
+
+_ROLLS = {dices: i for i, (dices, _) in enumerate(ROLLS)}  # indexes of rolls
+
+Moves = Tuple[Tuple[int, int], ...]  # (from, to) indexes of cells
+
+
+def _roll(dices: Tuple[int, int]) -> int:
+    """Returns index of roll, order of dices doesn't matter"""
+
+    return _ROLLS[(min(dices), max(dices))]
+
+
+class OpeningBook:
+    """OpeningBook class
+    Describes book of best turns of the first plies
+
+    Turns are found by Zobrist hash of position with side to move and roll
+
+    Methods:
+        1) lookup(board: Board, color: str, dices: Tuple[int, int]): returns moves of best turn
+        2) add(board: Board, color: str, dices: Tuple[int, int], moves: Moves): adds turn
+        3) save(path: str): saves book
+
+    Book has length (number of turns)
+    """
+
+    def __init__(self, path: str = None) -> None:
+        """OpeningBook constructor
+
+        Args:
+            path (str, optional): path to book. Defaults to None (empty book)
+
+        Raises:
+            ValueError: in case of incorrect file
+        """
+
+        self._turns: Dict[Tuple[int, int], Moves] = {}  # moves by hashes and rolls
+
+        if path is None:
+            return
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, size = _HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != _HEADER.size + size * _ENTRY.size:  # if file is incorrect
+            raise ValueError("Book is incorrect")  # throw exception
+
+        for key, roll, n, *cells in _ENTRY.iter_unpack(data[_HEADER.size:]):
+            self._turns[(key, roll)] = tuple(zip(cells[:2 * n:2], cells[1:2 * n:2]))
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def lookup(self, board: Board, color: str, dices: Tuple[int, int]) -> Moves:
+        """Returns moves of best turn
+
+        Args:
+            board (Board): board
+            color (str): color of player to move
+            dices (Tuple[int, int]): values of dices
+
+        Returns:
+            Moves: moves or None if position isn't in book
+        """
+
+        return self._turns.get((board.side_hash(color), _roll(dices)))  # return moves
+
+    def add(self, board: Board, color: str, dices: Tuple[int, int], moves: Moves) -> None:
+        """Adds turn
+
+        Args:
+            board (Board): board before turn
+            color (str): color of player to move
+            dices (Tuple[int, int]): values of dices
+            moves (Moves): moves of turn
+        """
+
+        self._turns[(board.side_hash(color), _roll(dices))] = tuple(moves)  # add moves
+
+    def save(self, path: str = BOOK) -> None:
+        """Saves book
+
+        Args:
+            path (str, optional): path to book. Defaults to BOOK
+        """
+
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, len(self._turns)))
+            for (key, roll), moves in sorted(self._turns.items()):
+                cells = [i for move in moves for i in move]
+                file.write(_ENTRY.pack(key, roll, len(moves), *(cells + [0] * (8 - len(cells)))))
+
+
+def generate(plies: int = 2, progress: bool = False, **kwargs) -> OpeningBook:
+    """Generates book by rollouts of all turns of the first plies
+
+    Rollouts are played by bots not using existing book, so it doesn't confirm itself
+
+    Args:
+        plies (int, optional): number of plies. Defaults to 2
+        progress (bool, optional): print best turns. Defaults to False
+        **kwargs: arguments of rollout.evaluate_turns (games, processes, seed, truncate...)
+
+    Returns:
+        OpeningBook: book
+    """
+
+    from bot import Bot  # bots use book
+    from rollout import evaluate_turns
+
+    kwargs.setdefault("policy", partial(Bot, use_book=False))  # players of rollouts
+
+    book = OpeningBook()  # book
+    boards = [Board()]  # positions of current ply
+
+    for ply in range(plies):
+        color = Board.COLORS[ply % 2]  # red starts
+        following = {}  # positions of next ply by hashes, different rolls may lead to one position
+        for board in boards:
+            for dices, _ in ROLLS:
+                turns = legal_turns(board, color, turn_dices(dices))  # candidates
+                if not turns:  # pass
+                    continue
+                best = turns[0] if len(turns) == 1 else \
+                    evaluate_turns(board, color, turns, **kwargs)[0].turn  # best turn
+                book.add(board, color, dices, best.moves)
+                following[best.board.zobrist] = best.board
+                if progress:
+                    print(f"ply {ply + 1}, {color} {dices}: {best}", flush=True)
+        boards = list(following.values())
+
+    return book  # return book
+
+
+_books: Dict[str, OpeningBook] = {}  # opened books by paths
+
+
+def book(path: str = BOOK) -> OpeningBook:
+    """Returns book opened once in process
+
+    Args:
+        path (str, optional): path to book. Defaults to BOOK
+
+    Returns:
+        OpeningBook: book or None if file doesn't exist
+    """
+
+    if path not in _books:
+        _books[path] = OpeningBook(path) if os.path.exists(path) else None
+
+    return _books[path]  # return book
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates opening book by rollouts")
+    parser.add_argument("--path", default=BOOK, help="path to book")
+    parser.add_argument("--plies", type=int, default=2, help="number of plies")
+    parser.add_argument("--games", type=int, default=1296, help="rollouts of each candidate")
+    parser.add_argument("--processes", type=int, default=None, help="number of processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--truncate", type=int, default=None, help="turns of rollout")
+    args = parser.parse_args()
+
+    generate(args.plies, progress=True, games=args.games, processes=args.processes,
+             seed=args.seed, truncate=args.truncate).save(args.path)
@@ -5,8 +5,11 @@ import threading
 from typing import Tuple
 
 from abstractplayer import AbstractPlayer
+from board import Board
 from cell import Cell
 from field import Field
+from instrumentation import lock
+from movegen import head_moves, legal_moves, turn_dices
 
 
 class Player(AbstractPlayer):
@@ -18,6 +21,10 @@ class Player(AbstractPlayer):
         2) mousemotion_event_handler(position: Tuple[int, int]): handles pygame.MOUSEMOTION event
         3) mousebuttondown_event_handler(position: Tuple[int, int]): handles pygame.MOUSEBUTTONDOWN event
         4) move_mouse(position: Tuple[int, int]): moves mouse pointer
+        5) cancel(): cancels waiting of user's choice, player doesn't play anymore
+    
+    Properties:
+        1) cancelled: True if player is cancelled
         
     Constants:
         1) STATUS: tuple of possible statuses
@@ -25,28 +32,39 @@ class Player(AbstractPlayer):
     
     STATUS = ("CHOOSE_FROM", "CHOOSE_TO", "WAIT")  # tuple of possible statuses
 
-    def __init__(self, field: Field):
+    def __init__(self, field: Field, timeout: float = None):
         """Player constructor
 
         Args:
             field (Field): backgammon field
+            timeout (float, optional): time to choose cell, seconds, turn is finished
+                if cell isn't chosen in time. Defaults to None (wait forever)
         """
         
         self._cells = field._cells  # set cells
+        self._cell_at = field.cell_at  # set lookup of cells by positions
+        self._board = field.board  # set board
         self._status = "WAIT"  # set status
         
         self._from_cell = None  # set cell to move from
         self._to_cell = None  # set cell to move to
         
-        self._steps = None  # list of possible steps
-        self._steps_ = None  # list of dices' values combinations
+        self._steps = None  # list of dices' values left to play
+        self._heads = None  # number of checkers allowed to move from head
+        self._moves = None  # legal moves of one checker
+        self._targets = {}  # cells to move to and used dices by cells to move from
         
         self._mouse_pos = (0, 0)  # mouse position
+        self._highlighted = None  # hovered cell's index and status highlight was computed for
         
         self._cell_locker = field._cell_locker  # locker of cells
-        self._status_locker = threading.Lock()  # locker of status
-        self._steps_locker = threading.Lock()  # locker of steps
-        self._mouse_pos_locker = threading.Lock()  # locker of mouse position
+        self._status_locker = lock("status_locker")  # locker of status
+        self._steps_locker = lock("steps_locker")  # locker of steps
+        self._mouse_pos_locker = lock("mouse_pos_locker")  # locker of mouse position
+        
+        self._chosen = threading.Condition(self._cell_locker)  # notified when cell is chosen
+        self._timeout = timeout  # time to choose cell
+        self._cancelled = False  # is player cancelled
 
     def move_mouse(self, position: Tuple[int, int]) -> None:
         """Sets mouse position
@@ -58,96 +76,72 @@ class Player(AbstractPlayer):
         with self._mouse_pos_locker:  # lock mouse position
             self._mouse_pos = position  # set position
 
-    def play(self, dices: Tuple[int]):
+    @property
+    def cancelled(self) -> bool:
+        """True if player is cancelled
+
+        Returns:
+            bool: True if player is cancelled
+        """
         
-        def load_steps() -> None:
-            """Loads combinations of dices"""
-            
-            self._steps = [dices[0], dices[1]]  # one dice used step
-            self._steps.append(sum(self._steps))  # two dice used step
-            self._steps_ = self._steps.copy()  # save source
-            self._steps_.sort()  # sort _steps_
-            self._steps.sort()  # sort _steps
-
-        def should_pass() -> bool:
-            """Returns True if should pass, else False
-
-            Returns:
-                bool: True if should pass, else False
-            """
-            
-            f = False  # flag to return if should not pass
-            
-            for _from in self._cells:  # for every cell check if can move from it
-                steps = self._steps.copy()  # copy possible steps
-                
-                if _from.index < 24 and len(_from) > 0 \
-                    and _from[0].color == "red":  # if can move from this cell
-                    
-                    for i in range(len(steps)):  # if too close to final cell, change steps
-                        if self._steps[i] is not None:
-                            if steps[i] > 24 - _from.index:
-                                steps[i] = 24 - _from.index
-                                
-                    for _to in self._cells:  # check if can move to ofher cells
-                        if _to.index < 25 and _to != _from and \
-                            (len(_to) == 0 or _to[0].color == "red") and \
-                                _to.index - _from.index in steps: # can move to cell _to
-                            f = True
-                            break
-                        
-                if f:  # shouldn't pass
-                    return False
-            else:      # should pass
-                return True
+        return self._cancelled  # return flag
+
+    def cancel(self) -> None:
+        """Cancels waiting of user's choice, player doesn't play anymore"""
+        
+        with self._chosen:  # lock cells
+            self._cancelled = True  # set flag
+            self._chosen.notify_all()  # wake game thread
 
+    def play(self, dices: Tuple[int]):
+        
+        if self._cancelled:  # cancelled player doesn't play
+            return
+        
         with self._steps_locker:  # lock steps
-            load_steps()  # load steps
+            self._steps = list(turn_dices(dices))  # dices' values to play
+            self._heads = head_moves(self._board, "red", self._steps)  # moves from head
 
         while True:  # play while can move
             with self._steps_locker:  # lock steps
-                if should_pass():  # return if cannot move
+                self._moves = legal_moves(self._board, "red",
+                                          self._steps, self._heads)  # legal moves
+                self._targets = {}  # moves by cells to move from, highlight only looks them up
+                for (from_index, to_index), dice in self._moves.items():
+                    self._targets.setdefault(from_index, {})[to_index] = dice
+                if not self._moves:  # return if cannot move
                     return
 
             with self._mouse_pos_locker:  # lock mouse position
                 with self._status_locker:  # lock status
                     self._status = "CHOOSE_FROM"  # choose status
+                    self._highlighted = None  # legal moves are changed
                 self.mousemotion_event_handler(self._mouse_pos)  # highlight cells
 
             if self._choose_from_cell() is None:  # select cell to move from
-                continue  # if cell isn't chosen, choose again
-
-            with self._steps_locker:  # lock steps
-                for i in range(len(self._steps)):  # change steps if can remove cell
-                    if self._steps[i] is not None and \
-                            self._steps[i] > 24 - self._from_cell.index:
-                        self._steps[i] = 24 - self._from_cell.index
+                return  # if time is over or player is cancelled, finish turn
 
             with self._mouse_pos_locker:  # lock mouse position
                 with self._status_locker:  # lock status
                     self._status = "CHOOSE_TO"  # choose status
+                    self._highlighted = None  # from cell is changed
                 self.mousemotion_event_handler(self._mouse_pos)  # highlight cells
 
-            if self._choose_to_cell() == self._from_cell:  # to cell isn't chosen
-                with self._steps_locker:  # lock steps
-                    for i in range(len(self._steps)):  # recover steps
-                        if self._steps[i] is not None:
-                            self._steps[i] = self._steps_.copy()[i]
+            to_cell = self._choose_to_cell()  # select cell to move to
+
+            if to_cell is None:  # if time is over or player is cancelled, finish turn
+                return
+
+            if (self._from_cell.index, self._to_cell.index) not in self._moves:  # illegal move
                 continue  # choose cells again
 
             self._move()  # move checker
 
-            with self._steps_locker:  # lock steps
-                if self._steps.count(None) < 3:  # if has steps, move again
-                    continue
-            
-            break  # else return
-
     def _choose_from_cell(self) -> Cell:
         """Chooses cell to move from
 
         Returns:
-            Cell: cell to move from
+            Cell: cell to move from or None if time is over or player is cancelled
         """
         
         with self._cell_locker:  # lock cells
@@ -156,11 +150,17 @@ class Player(AbstractPlayer):
         with self._status_locker:  # lock status
             self._status = "CHOOSE_FROM"  # set status
 
-        # wait untill from cell is chosen
-        while True:
-            with self._cell_locker:
-                if self._from_cell is not None:
-                    break
+        # sleep untill from cell is chosen, time is over or player is cancelled
+        with self._chosen:
+            self._chosen.wait_for(lambda: self._from_cell is not None or self._cancelled,
+                                  self._timeout)
+            
+            if self._cancelled:  # ignore choice of cancelled player
+                self._from_cell = None
+            
+            if self._from_cell is None:  # reset highlight of cells if cell isn't chosen
+                for c in self._cells:
+                    c.highlight(None)
 
         with self._status_locker:  # lock status
             self._status = "WAIT"  # set status
@@ -171,7 +171,7 @@ class Player(AbstractPlayer):
         """Chooses cell to move to
 
         Returns:
-            Cell: cell to move to
+            Cell: cell to move to or None if time is over or player is cancelled
         """
         
         with self._cell_locker:  # lock cells
@@ -180,11 +180,17 @@ class Player(AbstractPlayer):
         with self._status_locker:  # lock status
             self._status = "CHOOSE_TO"  # set status
 
-        # wait untill to cell is chosen
-        while True:
-            with self._cell_locker:
-                if self._to_cell is not None:
-                    break
+        # sleep untill to cell is chosen, time is over or player is cancelled
+        with self._chosen:
+            self._chosen.wait_for(lambda: self._to_cell is not None or self._cancelled,
+                                  self._timeout)
+            
+            if self._cancelled:  # ignore choice of cancelled player
+                self._to_cell = None
+            
+            if self._to_cell is None:  # reset highlight of cells if cell isn't chosen
+                for c in self._cells:
+                    c.highlight(None)
 
         with self._status_locker:  # lock status
             self._status = "WAIT"  # set status
@@ -192,55 +198,39 @@ class Player(AbstractPlayer):
         return self._to_cell  # return to cell
 
     def _move(self) -> None:
-        """Moves checker from self._from_cell to self._to_cell and reloads steps"""
+        """Moves checker from self._from_cell to self._to_cell and removes used step"""
         
         with self._steps_locker:  # lock steps
             with self._cell_locker:  # lock cell
-                self._from_cell.move_checker(self._to_cell)  # move checker
-                    
-                delta = self._to_cell.index - self._from_cell.index if \
-                    self._to_cell.index < 24 else 24 - self._from_cell.index  # size of used step
-                index = self._steps.index(delta)  # index of this step in steps
+                # remove used step
+                self._steps.remove(self._moves[(self._from_cell.index, self._to_cell.index)])
+                
+                if self._from_cell.index == Board.HEADS["red"]:  # if moved from head
+                    self._heads -= 1  # decrease moves from head
                 
-                if self._steps.count(None) == 2:  # if there is one step in steps
-                    self._steps = [None for _ in range(3)]  # clear steps
-                else:  # if more than one step
-                    if index == 2:  # if used step of both dices
-                        self._steps = [None for _ in range(3)]  # clear steps
-                    else:  # if used step of one dice
-                        self._steps = [None for _ in range(3)]  # clear steps
-                        self._steps[1 - index] = self._steps_[1 - index]  # recover unused steps
-
-    def _highlight_mousemotion_from(self, position: Tuple[int, int]) -> None:
+                self._from_cell.move_checker(self._to_cell)  # move checker
+
+    def _highlight_mousemotion_from(self, hovered: Cell) -> None:
         """Highlights cells if status is "CHOOSE_FROM" and event is MOUSEMOTION
 
         Args:
-            position (Tuple[int, int]): mouse position
+            hovered (Cell): cell under mouse or None
         """
         
-        for cell in self._cells:
-            if len(cell) > 0 and cell[0].color == "red"\
-                    and cell.index != 24:  # if can move from this cell
-                cell.highlight("suggest")  # highlight cell as suggested
-                
-                if cell.isinside(position):  # if is inside cell
-                    cell.highlight("selected")  # highlight cell as selected
+        for index in self._targets:  # cells legal moves start from
+            cell = self._cells[index]
+            cell.highlight("selected" if cell is hovered else "suggest")  # highlight cell
 
-    def _highlight_mousemotion_to(self, position: Tuple[int, int]) -> None:
+    def _highlight_mousemotion_to(self, hovered: Cell) -> None:
         """Highlights cells if status is "CHOOSE_TO" and event is MOUSEMOTION
 
         Args:
-            position (Tuple[int, int]): mouse position
+            hovered (Cell): cell under mouse or None
         """
         
-        for cell in self._cells:
-            if cell.index != 25 and cell.index - self._from_cell.index in self._steps and \
-                    cell != self._from_cell and \
-                    (len(cell) == 0 or cell[0].color != "black"): # if can move to cell
-                cell.highlight("suggest")  # highlight cell as suggested
-                
-                if cell.isinside(position):  # if is inside cell
-                    cell.highlight("hover")  # highlight cell as hovered
+        for index in self._targets.get(self._from_cell.index, ()):  # cells legal moves lead to
+            cell = self._cells[index]
+            cell.highlight("hover" if cell is hovered else "suggest")  # highlight cell
 
     def _highlight_mousebuttondown_from(self, position: Tuple[int, int]) -> None:
         """Highlights cells if status is "CHOOSE_FROM" and event is MOUSENUTTONDOWN
@@ -249,20 +239,16 @@ class Player(AbstractPlayer):
             position (Tuple[int, int]): mouse position
         """
         
-        for cell in self._cells:
-            if len(cell) > 0 and cell[0].color == "red"\
-                    and cell.index < 24:  # if can move from cell
-                cell.highlight("suggest")  # highlight cell as suggested
+        cell = self._cell_at(position)  # clicked cell
+        
+        if cell is not None and cell.index in self._targets:  # if can move from cell
+            for c in self._cells:  # reset highlight of all cells
+                c.highlight(None)
                 
-                if cell.isinside(position):  # if is inside
-                    for c in self._cells:  # reset highlight of all cells
-                        c.highlight(None)
-                        
-                    cell.highlight("selected")  # highlight cell as selected
-                    self._status = "WAIT"  # change status
-                    self._from_cell = cell  # set from cell
-                    
-                    break
+            cell.highlight("selected")  # highlight cell as selected
+            self._status = "WAIT"  # change status
+            self._from_cell = cell  # set from cell
+            self._chosen.notify_all()  # wake game thread
 
     def _highlight_mousebuttondown_to(self, position: Tuple[int, int]) -> None:
         """Highlights cells if status is "CHOOSE_TO" and event is MOUSEBUTTONDOWN
@@ -271,33 +257,40 @@ class Player(AbstractPlayer):
             position (Tuple[int, int]): mouse position
         """
         
-        for cell in self._cells:
-            if cell.isinside(position) and \
-                    (cell.color == Cell.COLORS["hover"] or \
-                        cell.color == Cell.COLORS["selected"]):  # if can move to cell
-                self._to_cell = cell  # set to vell
-                self._status = "WAIT"  # set status
-                
-                for c in self._cells:  # reset cells highlight
-                    c.highlight(None)
-                    
-                break
+        cell = self._cell_at(position)  # clicked cell
+        
+        if cell is not None and (cell is self._from_cell or \
+                cell.index in self._targets.get(self._from_cell.index, ())):  # if can move to cell or cancel choice
+            self._to_cell = cell  # set to vell
+            self._status = "WAIT"  # set status
+            self._chosen.notify_all()  # wake game thread
+            
+            for c in self._cells:  # reset cells highlight
+                c.highlight(None)
 
     def mousemotion_event_handler(self, position: Tuple[int, int]) -> None:
-        """Handles mousemotion pygame event
+        """Handles mousemotion pygame event, cells are highlighted again only if
+        hovered cell or status is changed
 
         Args:
             position (Tuple[int, int]): mouseposition
         """
         
+        hovered = self._cell_at(position)  # cell under mouse
+        index = hovered.index if hovered is not None else None  # index of hovered cell
+        
+        if self._highlighted == (index, self._status):  # highlight is actual, don't take locks
+            return
+        
         with self._status_locker:  # lock status
             with self._cell_locker:  # lock cell
                 with self._steps_locker:  # lock steps
+                    self._highlighted = (index, self._status)  # remember state of highlight
                     match self._status:  # match status
                         case "CHOOSE_FROM":  # choosing from cell
-                            self._highlight_mousemotion_from(position)  # highlight
+                            self._highlight_mousemotion_from(hovered)  # highlight
                         case "CHOOSE_TO":  # choosing to cell
-                            self._highlight_mousemotion_to(position)  # highlight
+                            self._highlight_mousemotion_to(hovered)  # highlight
 
     def mousebuttondown_event_handler(self, position: Tuple[int, int]) -> None:
         """Handles mousebuttondown pygame event
@@ -0,0 +1,337 @@
+# record.py
+# Contains GameWriter and GameRecord classes and functions reading binary game logs
+#
+# Log is an append-only sequence of games, every game is a header followed by records:
+#     header:   b"BGR", version, first color, keyframe interval, 26 cells, length of meta, meta
+#     turn:     TURN, roll, number of moves, (from, to) of each move
+#     keyframe: KEY, number of turns, 26 cells of position after this turn
+#     end:      END, winner, number of turns
+# Turn takes 3 bytes plus 2 bytes per move, about 0.5 KB per game without keyframes
+
+import mmap
+import struct
+from typing import BinaryIO, Iterator, List, Tuple
+
+from board import Board
+
+MAGIC = b"BGR"  # signature of game
+VERSION = 1  # version of format
+KEYFRAME = 32  # default number of turns between keyframes
+
+TURN, KEY, END = 1, 2, 3  # tags of records
+
+_HEADER = struct.Struct("<3sBBB26bH")  # magic, version, first color, keyframe interval, cells, length of meta
+_TURN = struct.Struct("<BBB")  # tag, roll, number of moves
+_MOVE = struct.Struct("<BB")  # from, to
+_KEY = struct.Struct("<BI26b")  # tag, number of turns, cells
+_END = struct.Struct("<BBI")  # tag, winner, number of turns
+
+_COLORS = Board.COLORS + (None,)  # codes of colors
+
+
+class GameWriter:
+    """GameWriter class
+    Describes streaming writer of one game to binary log
+
+    Writer listens to moves on board, so game loop only calls turn() after each
+    turn and close() after the end of game. Every keyframe turns position is saved
+
+    Methods:
+        1) turn(dices: Tuple[int, int]): writes played turn
+        2) close(winner: str): writes end of game and stops listening to board
+
+    Properties:
+        1) turns: number of written turns
+    """
+
+    def __init__(self, file: BinaryIO, board: Board, first: str = "red",
+                 keyframe: int = KEYFRAME, meta: str = "") -> None:
+        """GameWriter constructor
+
+        Args:
+            file (BinaryIO): binary file opened for writing or appending
+            board (Board): board of game in start position
+            first (str, optional): color of player who starts. Defaults to "red"
+            keyframe (int, optional): number of turns between keyframes, 0 to disable.
+                Defaults to KEYFRAME
+            meta (str, optional): any text, for example seed of dices. Defaults to ""
+
+        Raises:
+            ValueError: in case of incorrect color or keyframe interval
+        """
+
+        if first not in Board.COLORS:  # if color is incorrect
+            raise ValueError("Color is incorrect")  # throw exception
+        if not 0 <= keyframe <= 255:  # if interval is incorrect
+            raise ValueError("Keyframe interval is incorrect")  # throw exception
+
+        self._file = file  # set file
+        self._board = board  # set board
+        self._keyframe = keyframe  # set keyframe interval
+
+        self._moves = []  # moves of current turn
+        self._turns = 0  # number of written turns
+        self._closed = False  # is game ended
+
+        meta = meta.encode()  # encoded meta
+        self._file.write(_HEADER.pack(MAGIC, VERSION, _COLORS.index(first), keyframe,
+                                      *board.tolist(), len(meta)) + meta)  # write header
+
+        board.add_listener(self._move)  # listen to moves
+
+    @property
+    def turns(self) -> int:
+        """Number of written turns
+
+        Returns:
+            int: number of turns
+        """
+
+        return self._turns  # return number
+
+    def _move(self, from_index: int, to_index: int) -> None:
+        """Saves move of current turn"""
+
+        self._moves.append((from_index, to_index))
+
+    def turn(self, dices: Tuple[int, int]) -> None:
+        """Writes played turn with moves made on board since previous turn
+
+        Args:
+            dices (Tuple[int, int]): values of dices
+        """
+
+        data = bytearray(_TURN.pack(TURN, (dices[0] - 1) * 6 + dices[1] - 1, len(self._moves)))
+        for move in self._moves:
+            data += _MOVE.pack(*move)
+        self._moves.clear()
+        self._turns += 1
+
+        if self._keyframe and self._turns % self._keyframe == 0:  # save position
+            data += _KEY.pack(KEY, self._turns, *self._board.tolist())
+
+        self._file.write(data)  # write records
+
+    def close(self, winner: str = None) -> None:
+        """Writes end of game and stops listening to board
+
+        Args:
+            winner (str, optional): color of winner. Defaults to None (game isn't finished)
+        """
+
+        if self._closed:  # end is already written
+            return
+
+        self._board.remove_listener(self._move)  # stop listening
+        self._file.write(_END.pack(END, _COLORS.index(winner), self._turns))  # write end
+        self._closed = True
+
+
+class GameRecord:
+    """GameRecord class
+    Describes one game read from binary log
+
+    Offsets of turns and keyframes are indexed once, so position after any turn
+    is restored from nearest keyframe by replaying at most keyframe interval turns
+
+    Methods:
+        1) roll(turn: int): returns dices of turn
+        2) moves(turn: int): returns moves of turn
+        3) board(turn: int): returns position after number of turns
+
+    Properties:
+        1) first: color of player who started
+        2) meta: text saved with game
+        3) turns: number of recorded turns
+        4) winner: color of winner or None
+        5) size: size of game in log, bytes
+    """
+
+    def __init__(self, data: bytes, offset: int = 0) -> None:
+        """GameRecord constructor, reads game starting from offset
+
+        Args:
+            data (bytes): bytes of log
+            offset (int, optional): offset of game's header. Defaults to 0
+
+        Raises:
+            ValueError: in case of incorrect or unsupported data
+        """
+
+        if len(data) - offset < _HEADER.size:  # if header is cut
+            raise ValueError("Header is incorrect")  # throw exception
+
+        magic, version, first, keyframe, *cells, length = _HEADER.unpack_from(data, offset)
+        if magic != MAGIC or version != VERSION:  # if format is unknown
+            raise ValueError("Format is unsupported")  # throw exception
+
+        self._data = data  # set data
+        self._first = _COLORS[first]  # set first color
+        self._start = cells  # set start position
+        self._meta = bytes(data[offset + _HEADER.size:offset + _HEADER.size + length]).decode()  # set meta
+
+        self._offsets = []  # offsets of turns' records
+        self._keys = {0: None}  # offsets of keyframes by numbers of turns
+        self._winner = None  # winner
+
+        # index records until end of game or end of data (game is being written)
+        position = offset + _HEADER.size + length
+        while position < len(data):
+            tag = data[position]
+            if tag == TURN:
+                size = _TURN.size + _MOVE.size * data[position + 2] \
+                    if position + _TURN.size <= len(data) else _TURN.size
+            elif tag == KEY:
+                size = _KEY.size
+            elif tag == END:
+                size = _END.size
+            else:  # if tag is unknown
+                raise ValueError("Record is incorrect")  # throw exception
+
+            if position + size > len(data):  # last record isn't written yet
+                break
+
+            if tag == TURN:
+                self._offsets.append(position)
+            elif tag == KEY:
+                self._keys[_KEY.unpack_from(data, position)[1]] = position
+            else:
+                self._winner = _COLORS[data[position + 1]]
+
+            position += size
+            if tag == END:
+                break
+
+        self._size = position - offset  # size of game
+
+    @property
+    def first(self) -> str:
+        """Color of player who started
+
+        Returns:
+            str: color
+        """
+
+        return self._first  # return color
+
+    @property
+    def meta(self) -> str:
+        """Text saved with game
+
+        Returns:
+            str: meta
+        """
+
+        return self._meta  # return meta
+
+    @property
+    def turns(self) -> int:
+        """Number of recorded turns
+
+        Returns:
+            int: number of turns
+        """
+
+        return len(self._offsets)  # return number
+
+    @property
+    def winner(self) -> str:
+        """Color of winner
+
+        Returns:
+            str: color or None if game isn't finished
+        """
+
+        return self._winner  # return winner
+
+    @property
+    def size(self) -> int:
+        """Size of game in log
+
+        Returns:
+            int: bytes
+        """
+
+        return self._size  # return size
+
+    def roll(self, turn: int) -> Tuple[int, int]:
+        """Returns dices of turn
+
+        Args:
+            turn (int): index of turn from 0
+
+        Returns:
+            Tuple[int, int]: values of dices
+        """
+
+        roll = self._data[self._offsets[turn] + 1]  # code of roll
+
+        return roll // 6 + 1, roll % 6 + 1  # return dices
+
+    def moves(self, turn: int) -> List[Tuple[int, int]]:
+        """Returns moves of turn
+
+        Args:
+            turn (int): index of turn from 0
+
+        Returns:
+            List[Tuple[int, int]]: (from, to) indexes of cells
+        """
+
+        position = self._offsets[turn]  # offset of record
+        data = self._data[position + _TURN.size:
+                          position + _TURN.size + _MOVE.size * self._data[position + 2]]
+
+        return list(zip(data[::2], data[1::2]))  # return moves
+
+    def board(self, turn: int = None) -> Board:
+        """Returns position after number of turns
+
+        Args:
+            turn (int, optional): number of played turns. Defaults to None (end of game)
+
+        Raises:
+            ValueError: in case of turn isn't recorded
+
+        Returns:
+            Board: position
+        """
+
+        if turn is None:
+            turn = self.turns
+
+        if not 0 <= turn <= self.turns:  # if turn isn't recorded
+            raise ValueError("Turn isn't recorded")  # throw exception
+
+        start = max(k for k in self._keys if k <= turn)  # nearest keyframe
+        board = Board(self._start if start == 0 else
+                      _KEY.unpack_from(self._data, self._keys[start])[2:])  # position of keyframe
+
+        for t in range(start, turn):  # replay turns after keyframe
+            for from_index, to_index in self.moves(t):
+                board.move(from_index, to_index)
+
+        return board  # return position
+
+
+def read_games(path: str) -> Iterator[GameRecord]:
+    """Reads games from log file one by one, file is mapped to memory and
+    games read data from it, so log isn't loaded entirely
+
+    Args:
+        path (str): path to log
+
+    Yields:
+        GameRecord: game
+    """
+
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:  # empty log can't be mapped
+            return
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # mapped log, closed with last game
+
+    offset = 0
+    while offset < len(data):
+        game = GameRecord(data, offset)
+        offset += game.size
+        yield game
@@ -0,0 +1,112 @@
+# renderer.py
+# Contains Renderer class
+
+from typing import Hashable, List, Tuple
+
+import pygame
+
+from printable import Printable
+
+Sprite = Tuple[Hashable, pygame.Rect, Hashable, Printable]  # key, area, state and printable object
+
+
+class Renderer:
+    """Renderer class
+    Describes layered renderer which prints only changed parts of screen
+
+    Renderer keeps static background layer. Every frame it gets sprites (key, area,
+    state, object), compares them with sprites of previous frame and marks areas
+    of added, removed and changed sprites as dirty. Only dirty rectangles are
+    restored from background and overprinted by sprites colliding with them
+
+    Methods:
+        1) render(sprites: List[Sprite]): prints changed sprites, returns dirty rectangles
+        2) invalidate(): marks whole screen as dirty
+
+    Properties:
+        1) background: static background layer
+    """
+
+    def __init__(self, screen: pygame.Surface, background: pygame.Surface) -> None:
+        """Renderer constructor
+
+        Args:
+            screen (pygame.Surface): surface to print on
+            background (pygame.Surface): static background of screen's size
+        """
+
+        self._screen = screen  # set screen
+        self._background = background  # set background
+        self._bounds = screen.get_rect()  # rectangle of screen
+
+        self._sprites = {}  # areas and states of printed sprites by keys
+        self._full = True  # is whole screen dirty
+
+    @property
+    def background(self) -> pygame.Surface:
+        """Static background layer
+
+        Returns:
+            pygame.Surface: background
+        """
+
+        return self._background  # return background
+
+    def invalidate(self) -> None:
+        """Marks whole screen as dirty, for example after window was exposed"""
+
+        self._full = True  # set flag
+
+    def render(self, sprites: List[Sprite]) -> List[pygame.Rect]:
+        """Prints changed sprites
+
+        Args:
+            sprites (List[Sprite]): sprites of frame from bottom to top
+
+        Returns:
+            List[pygame.Rect]: dirty rectangles to update on display
+        """
+
+        dirty = []  # dirty rectangles
+        printed = {}  # sprites of this frame
+        for key, area, state, _ in sprites:
+            printed[key] = (area, state)
+            old = self._sprites.pop(key, None)  # sprite of previous frame
+            if old != (area, state):  # sprite is added or changed
+                dirty.append(area)
+                if old is not None:
+                    dirty.append(old[0])
+        dirty.extend(area for area, _ in self._sprites.values())  # removed sprites
+
+        self._sprites = printed  # remember sprites
+
+        if self._full:  # print whole screen
+            dirty = [self._bounds]
+            self._full = False
+
+        dirty = _merge([r.clip(self._bounds) for r in dirty if r.colliderect(self._bounds)])
+
+        for rect in dirty:
+            self._screen.set_clip(rect)  # print only inside rectangle
+            self._screen.blit(self._background, rect, rect)  # restore background
+            for _, area, _, sprite in sprites:
+                if area.colliderect(rect):
+                    sprite.print()
+        self._screen.set_clip(None)  # reset clip
+
+        return dirty  # return dirty rectangles
+
+
+def _merge(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Merges overlapping rectangles, so no area is printed twice"""
+
+    merged = []
+    for rect in rects:
+        while True:
+            i = rect.collidelist(merged)
+            if i < 0:
+                break
+            rect = rect.union(merged.pop(i))
+        merged.append(rect)
+
+    return merged
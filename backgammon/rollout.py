@@ -0,0 +1,263 @@
+# rollout.py
+# Contains RolloutResult class and functions evaluating candidate turns by Monte Carlo rollouts
+# Run file to analyze position, for example:
+#     python rollout.py --color red --dices 3 5 --games 1296
+
+import argparse
+import os
+import random
+from math import sqrt
+from multiprocessing import Pool
+from typing import Callable, List, Tuple
+
+from abstractplayer import AbstractPlayer
+from board import Board
+from bot import Bot
+from dicesource import RandomDices
+from evaluation import evaluate
+from game import Game
+from movegen import Turn, legal_turns, turn_dices
+
+PlayerFactory = Callable[[Board, str], AbstractPlayer]  # creates player by board and color
+
+Z = 1.96  # quantile of normal distribution for 95% confidence intervals
+
+
+class RolloutResult:
+    """RolloutResult class
+    Describes results of rollouts of one candidate turn
+
+    Properties:
+        1) turn: candidate turn
+        2) games: number of rollouts
+        3) mean: mean result (probability to win)
+        4) error: half-width of 95% confidence interval of mean
+        5) stopped: True if rollouts were stopped because candidate is clearly worse
+    """
+
+    def __init__(self, turn: Turn) -> None:
+        """RolloutResult constructor
+
+        Args:
+            turn (Turn): candidate turn
+        """
+
+        self._turn = turn  # set turn
+        self._results = []  # results of rollouts
+        self._stopped = False  # is candidate stopped
+
+    def __repr__(self) -> str:
+        return f"RolloutResult({self._turn.moves}, {self.mean:.4f} +- {self.error:.4f}, " \
+               f"games={self.games}{', stopped' if self._stopped else ''})"
+
+    @property
+    def turn(self) -> Turn:
+        """Candidate turn
+
+        Returns:
+            Turn: turn
+        """
+
+        return self._turn  # return turn
+
+    @property
+    def games(self) -> int:
+        """Number of rollouts
+
+        Returns:
+            int: number of rollouts
+        """
+
+        return len(self._results)  # return number
+
+    @property
+    def mean(self) -> float:
+        """Mean result (probability to win)
+
+        Returns:
+            float: mean
+        """
+
+        return sum(self._results) / max(self.games, 1)  # return mean
+
+    @property
+    def error(self) -> float:
+        """Half-width of 95% confidence interval of mean
+
+        Returns:
+            float: half-width
+        """
+
+        return Z * _deviation(self._results) / sqrt(max(self.games, 1))  # return error
+
+    @property
+    def stopped(self) -> bool:
+        """True if rollouts were stopped because candidate is clearly worse
+
+        Returns:
+            bool: True if stopped
+        """
+
+        return self._stopped  # return flag
+
+
+def _deviation(values: List[float]) -> float:
+    """Returns sample standard deviation"""
+
+    n = len(values)
+    if n < 2:
+        return 0.0
+
+    mean = sum(values) / n
+
+    return sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+
+
+def rollout(board: Board, color: str, policy: PlayerFactory, seed: int, index: int,
+            truncate: int = None) -> float:
+    """Plays position after color's turn to the end
+
+    Dices of rollout depend only on seed and index, so rollouts of different
+    candidates with the same index get the same dices (common random numbers)
+
+    Args:
+        board (Board): position after color's turn
+        color (str): color of player who made turn
+        policy (PlayerFactory): factory of players of both colors
+        seed (int): base seed
+        index (int): index of rollout
+        truncate (int, optional): number of turns to stop after, then position is
+            evaluated statically. Defaults to None (play to the end)
+
+    Returns:
+        float: 1 if color won, 0 if lost, probability to win by static evaluation if truncated
+    """
+
+    if board.winner is not None:  # turn finished game
+        return 1.0 if board.winner == color else 0.0
+
+    dices = RandomDices(seed).stream(index)  # dices of rollout
+    random.seed(f"{dices.seed}:players")  # seed global generator used by players
+
+    board = board.copy()  # board of rollout
+    opponent = "black" if color == "red" else "red"  # color of opponent
+
+    game = Game(board, (policy(board, opponent), policy(board, color)), dices)  # opponent moves first
+    game.start(truncate)  # play
+
+    if board.winner is None:  # game is truncated
+        return (evaluate(board, color) + 1) / 2
+
+    return 1.0 if board.winner == color else 0.0
+
+
+def _rollouts(task: Tuple[Board, str, PlayerFactory, int, int, int, int]) -> List[float]:
+    """Plays rollouts with indexes from start to stop in worker process"""
+
+    board, color, policy, seed, start, stop, truncate = task
+
+    return [rollout(board, color, policy, seed, i, truncate) for i in range(start, stop)]
+
+
+def evaluate_turns(board: Board, color: str, turns: List[Turn], games: int = 1296,
+                   policy: PlayerFactory = Bot, processes: int = None, seed: int = 0,
+                   truncate: int = None, batch: int = 144,
+                   stop: float = Z) -> List[RolloutResult]:
+    """Evaluates candidate turns by rollouts in process pool
+
+    Rollouts are played in batches. After each batch candidates are compared with
+    best one by paired differences of results with the same dices, candidates which
+    are worse by more than stop standard errors aren't rolled out further
+
+    Args:
+        board (Board): position before turn
+        color (str): color of player to move
+        turns (List[Turn]): candidate turns
+        games (int, optional): maximal number of rollouts of each candidate. Defaults to 1296
+        policy (PlayerFactory, optional): factory of players of rollouts, must be picklable.
+            Defaults to Bot
+        processes (int, optional): number of processes. Defaults to None (number of CPUs)
+        seed (int, optional): base seed. Defaults to 0
+        truncate (int, optional): number of turns of rollout. Defaults to None (play to the end)
+        batch (int, optional): number of rollouts of candidate between checks. Defaults to 144
+        stop (float, optional): number of standard errors to stop candidate, None to
+            disable early stopping. Defaults to Z
+
+    Returns:
+        List[RolloutResult]: results sorted from best to worst
+    """
+
+    results = [RolloutResult(turn) for turn in turns]  # results of candidates
+    workers = processes or os.cpu_count() or 1  # number of processes
+
+    with Pool(workers) as pool:  # pool of workers
+        for start in range(0, games, batch):
+            active = [r for r in results if not r._stopped]  # rolled out candidates
+            end = min(start + batch, games)  # end of batch
+            size = max((end - start) // workers, 1)  # rollouts in task
+
+            tasks = [(r.turn.board, color, policy, seed, i, min(i + size, end), truncate)
+                     for r in active for i in range(start, end, size)]
+            outputs = iter(pool.map(_rollouts, tasks))
+
+            for r in active:
+                for _ in range(start, end, size):
+                    r._results.extend(next(outputs))
+
+            if stop is not None and len(active) > 1:
+                _stop_worse(active, stop)
+
+    return sorted(results, key=lambda r: -r.mean)
+
+
+def _stop_worse(results: List[RolloutResult], stop: float) -> None:
+    """Stops candidates which are clearly worse than best one"""
+
+    best = max(results, key=lambda r: r.mean)  # best candidate
+
+    for r in results:
+        if r is best:
+            continue
+
+        # with common dices difference of paired results has small variance
+        differences = [a - b for a, b in zip(best._results, r._results)]
+        error = _deviation(differences) / sqrt(len(differences))
+
+        if sum(differences) / len(differences) > stop * error and error > 0:
+            r._stopped = True
+
+
+def analyze(board: Board, color: str, dices: Tuple[int, int], **kwargs) -> List[RolloutResult]:
+    """Evaluates all legal turns of position by rollouts
+
+    Args:
+        board (Board): position before turn
+        color (str): color of player to move
+        dices (Tuple[int, int]): values of dices
+        **kwargs: arguments of evaluate_turns
+
+    Returns:
+        List[RolloutResult]: results sorted from best to worst
+    """
+
+    return evaluate_turns(board, color, legal_turns(board, color, turn_dices(dices)), **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluates turns of position by rollouts")
+    parser.add_argument("--position", default=None,
+                        help="26 comma-separated signed numbers of checkers (default: start)")
+    parser.add_argument("--color", default="red", help="color of player to move")
+    parser.add_argument("--dices", type=int, nargs=2, required=True, help="values of dices")
+    parser.add_argument("--games", type=int, default=1296, help="rollouts of each candidate")
+    parser.add_argument("--processes", type=int, default=None, help="number of processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--truncate", type=int, default=None, help="turns of rollout")
+    args = parser.parse_args()
+
+    position = Board(None if args.position is None else
+                     [int(x) for x in args.position.split(",")])  # position
+
+    for result in analyze(position, args.color, tuple(args.dices), games=args.games,
+                          processes=args.processes, seed=args.seed, truncate=args.truncate):
+        print(result)
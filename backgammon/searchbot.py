@@ -0,0 +1,228 @@
+# searchbot.py
+# Contains SearchBot class
+
+from time import perf_counter
+from typing import List, Tuple
+
+from abstractplayer import AbstractPlayer
+from board import Board
+from evaluation import FeatureTracker, evaluate
+from movegen import ROLLS, Turn, legal_turns, turn_dices
+from openingbook import OpeningBook, book
+from transposition import TranspositionTable
+
+_LOW, _HIGH = -1.0, 1.0  # bounds of values
+
+
+class _Timeout(Exception):
+    """Raised when time of search is over"""
+
+
+class SearchBot(AbstractPlayer):
+    """SearchBot(AbstractPlayer) class
+    Describes bot choosing turns by expectiminimax search
+
+    Search is deepened iteratively: depth 1 evaluates positions after own turns,
+    depth 2 also averages opponent's best replies over 21 rolls, and so on. Chance
+    nodes are pruned by bounds of values (Star1), values of searched positions are
+    cached in transposition table. When time is over, best turn of last finished
+    depth is played. Turns of the first plies are taken from opening book without search
+
+    Methods:
+        1) play(dices: Tuple[int, int]): plays one backgammon step
+        2) choose(dices: Tuple[int, int]): returns best turn without playing it
+
+    Properties:
+        1) depth: depth of last finished search
+    """
+
+    def __init__(self, board: Board, color: str = "black", depth: int = 2,
+                 time_limit: float = 1.0, table: TranspositionTable = None,
+                 opening: OpeningBook = None) -> None:
+        """SearchBot constructor
+
+        Args:
+            board (Board): backgammon board
+            color (str, optional): color of bot's checkers. Defaults to "black"
+            depth (int, optional): maximal depth of search. Defaults to 2
+            time_limit (float, optional): time of one decision from call of choose, seconds,
+                depth 1 is finished even if it's over. Defaults to 1.0
+            table (TranspositionTable, optional): table of searched positions.
+                Defaults to None (new table)
+            opening (OpeningBook, optional): opening book. Defaults to None (book() if it's generated)
+        """
+
+        self._board = board  # set board
+        self._color = color  # set color
+        self._opponent = "black" if color == "red" else "red"  # set opponent's color
+        self._max_depth = depth  # set maximal depth
+        self._time_limit = time_limit  # set time of decision
+        self._table = table if table is not None else TranspositionTable()  # set table
+        self._book = opening if opening is not None else book()  # set opening book
+
+        self._deadline = None  # time when search must stop
+        self._depth = 0  # depth of last finished search
+
+    @property
+    def depth(self) -> int:
+        """Depth of last finished search
+
+        Returns:
+            int: depth
+        """
+
+        return self._depth  # return depth
+
+    def play(self, dices: Tuple[int, int]) -> None:
+        """Plays one backgammon step
+
+        Args:
+            dices (Tuple[int, int]): values of dices
+        """
+
+        turn = self.choose(dices)  # best turn
+
+        if turn is not None:  # move checkers
+            for from_index, to_index in turn.moves:
+                self._board.move(from_index, to_index)
+
+    def choose(self, dices: Tuple[int, int]) -> Turn:
+        """Returns best turn found in time
+
+        Args:
+            dices (Tuple[int, int]): values of dices
+
+        Returns:
+            Turn: best turn or None if bot can't move
+        """
+
+        deadline = perf_counter() + self._time_limit  # time of decision is counted from its start
+
+        moves = self._book.lookup(self._board, self._color, dices) \
+            if self._book is not None else None  # turn from opening book
+        if moves is not None:
+            board = self._board.copy()
+            for from_index, to_index in moves:
+                board.move(from_index, to_index)
+            return Turn(tuple(moves), board)
+
+        turns = legal_turns(self._board, self._color, turn_dices(dices))  # candidates
+        if len(turns) < 2:  # nothing to search
+            return turns[0] if turns else None
+
+        self._table.new_search()  # start new search
+        self._deadline = None  # first depth is always finished
+
+        values = self._root(turns, 1)  # values of candidates
+        self._depth = 1
+        self._deadline = deadline  # time of depth 1 is counted too
+
+        for depth in range(2, self._max_depth + 1):
+            order = sorted(zip(values, turns), key=lambda x: -x[0])  # best candidates first
+            try:
+                values = self._root([t for _, t in order], depth)
+            except _Timeout:  # time is over, use last finished depth
+                break
+            turns = [t for _, t in order]
+            self._depth = depth
+
+        return max(zip(values, turns), key=lambda x: x[0])[1]  # return best turn
+
+    def _root(self, turns: List[Turn], depth: int) -> List[float]:
+        """Returns values of candidates, values of not best candidates may be upper bounds"""
+
+        values = []
+        best = _LOW  # best value
+        tracker = FeatureTracker(self._board, attach=False) if depth == 1 else None  # features of leaves
+        for turn in turns:
+            value = -self._leaf(turn, self._opponent, depth - 1, -_HIGH, -best, tracker)
+            values.append(value)
+            best = max(best, value)
+
+        return values
+
+    def _check(self) -> None:
+        """Raises _Timeout if time is over"""
+
+        if self._deadline is not None and perf_counter() > self._deadline:
+            raise _Timeout()
+
+    def _leaf(self, turn: Turn, color: str, depth: int, alpha: float, beta: float,
+              tracker: FeatureTracker) -> float:
+        """Returns value of position after turn, tracker of position before turn is moved by turn
+        and back, so features of leaves aren't recomputed"""
+
+        if tracker is None:
+            return self._chance(turn.board, color, depth, alpha, beta)
+
+        for from_index, to_index in turn.moves:
+            tracker.move(from_index, to_index)
+        value = self._chance(turn.board, color, depth, alpha, beta, tracker)
+        for from_index, to_index in reversed(turn.moves):
+            tracker.undo(from_index, to_index)
+
+        return value
+
+    def _chance(self, board: Board, color: str, depth: int, alpha: float, beta: float,
+                tracker: FeatureTracker = None) -> float:
+        """Returns expected value of position for color which throws dices"""
+
+        if depth == 0 or board.winner is not None:  # static evaluation
+            entry = self._table.get(board, color)
+            if entry is not None:
+                return entry[0]
+            value = evaluate(board, color, tracker)
+            self._table.put(board, color, 0, value)
+            return value
+
+        entry = self._table.get(board, color, depth)  # cached value
+        if entry is not None:
+            return entry[0]
+
+        self._check()  # stop if time is over
+
+        opponent = "black" if color == "red" else "red"  # color of opponent
+        total = 0.0  # sum of values of searched rolls
+        left = 1.0  # probability of not searched rolls
+
+        for dices, p in ROLLS:
+            left -= p
+
+            # window of roll's value which doesn't prune the node
+            low = (alpha - total - left * _HIGH) / p
+            high = (beta - total - left * _LOW) / p
+
+            value = self._max(board, color, opponent, dices, depth,
+                              max(low, _LOW), min(high, _HIGH))
+            total += p * value
+
+            if total + left * _HIGH <= alpha:  # node can't be better than alpha
+                return total + left * _HIGH
+            if total + left * _LOW >= beta:  # node can't be worse than beta
+                return total + left * _LOW
+
+        if alpha <= _LOW and beta >= _HIGH:  # value isn't bound
+            self._table.put(board, color, depth, total)
+
+        return total
+
+    def _max(self, board: Board, color: str, opponent: str, dices: Tuple[int, int],
+             depth: int, alpha: float, beta: float) -> float:
+        """Returns value of best turn of color with dices"""
+
+        self._check()  # stop if time is over, rolls of one chance node may take long
+
+        turns = legal_turns(board, color, turn_dices(dices))  # turns
+        if not turns:  # pass
+            return -self._chance(board, opponent, depth - 1, -beta, -alpha)
+
+        best = _LOW  # best value
+        tracker = FeatureTracker(board, attach=False) if depth == 1 else None  # features of leaves
+        for turn in turns:
+            value = -self._leaf(turn, opponent, depth - 1, -beta, -max(alpha, best), tracker)
+            if value > best:
+                best = value
+                if best >= beta:  # cutoff
+                    break
+
+        return best
@@ -0,0 +1,336 @@
+# selfplay.py
+# Contains SelfPlayResults class and functions playing many headless games in parallel
+# Run file to play games between two players, for example:
+#     python selfplay.py --games 10000 --first bot:Bot --second bot:Bot --record games.bgr
+
+import argparse
+import importlib
+import io
+import random
+from multiprocessing import Pool
+from time import perf_counter
+from typing import BinaryIO, Callable, Iterator, List, Tuple
+
+from abstractplayer import AbstractPlayer
+from board import Board
+from dicesource import RandomDices
+from game import Game
+from record import GameWriter
+
+PlayerFactory = Callable[[Board, str], AbstractPlayer]  # creates player by board and color
+
+
+class SelfPlayResults:
+    """SelfPlayResults class
+    Describes aggregated results of played games
+
+    Methods:
+        1) add(winner: int, turns: int): adds result of one game
+        2) summary(): returns text summary
+
+    Properties:
+        1) games: number of played games
+        2) wins: tuple of numbers of wins of each player
+        3) win_rates: tuple of win rates of each player
+        4) mean_turns: mean number of turns in game
+        5) min_turns: minimal number of turns in game
+        6) max_turns: maximal number of turns in game
+        7) elapsed: time of playing, seconds
+        8) games_per_second: number of games played per second
+    """
+
+    def __init__(self) -> None:
+        """SelfPlayResults constructor"""
+
+        self._wins = [0, 0]  # wins of each player
+        self._turns = []  # numbers of turns in games
+        self._elapsed = 0.0  # time of playing
+
+    def add(self, winner: int, turns: int) -> None:
+        """Adds result of one game
+
+        Args:
+            winner (int): index of winner (0 or 1)
+            turns (int): number of turns in game
+        """
+
+        self._wins[winner] += 1  # count win
+        self._turns.append(turns)  # save length
+
+    def summary(self) -> str:
+        """Returns text summary of results
+
+        Returns:
+            str: summary
+        """
+
+        return (f"games: {self.games}, wins: {self._wins[0]}/{self._wins[1]} "
+                f"({self.win_rates[0]:.2%}/{self.win_rates[1]:.2%}), "
+                f"turns: {self.mean_turns:.1f} (min {self.min_turns}, max {self.max_turns}), "
+                f"{self.games_per_second:.1f} games/s")
+
+    @property
+    def games(self) -> int:
+        """Number of played games
+
+        Returns:
+            int: number of games
+        """
+
+        return len(self._turns)  # return number of games
+
+    @property
+    def wins(self) -> Tuple[int, int]:
+        """Numbers of wins of each player
+
+        Returns:
+            Tuple[int, int]: wins
+        """
+
+        return tuple(self._wins)  # return wins
+
+    @property
+    def win_rates(self) -> Tuple[float, float]:
+        """Win rates of each player
+
+        Returns:
+            Tuple[float, float]: win rates
+        """
+
+        return tuple(w / max(self.games, 1) for w in self._wins)  # return win rates
+
+    @property
+    def mean_turns(self) -> float:
+        """Mean number of turns in game
+
+        Returns:
+            float: mean number of turns
+        """
+
+        return sum(self._turns) / max(self.games, 1)  # return mean
+
+    @property
+    def min_turns(self) -> int:
+        """Minimal number of turns in game
+
+        Returns:
+            int: minimal number of turns
+        """
+
+        return min(self._turns, default=0)  # return minimum
+
+    @property
+    def max_turns(self) -> int:
+        """Maximal number of turns in game
+
+        Returns:
+            int: maximal number of turns
+        """
+
+        return max(self._turns, default=0)  # return maximum
+
+    @property
+    def elapsed(self) -> float:
+        """Time of playing
+
+        Returns:
+            float: seconds
+        """
+
+        return self._elapsed  # return time
+
+    @elapsed.setter
+    def elapsed(self, value: float) -> None:
+        """Sets time of playing
+
+        Args:
+            value (float): seconds
+        """
+
+        self._elapsed = value  # set time
+
+    @property
+    def games_per_second(self) -> float:
+        """Number of games played per second
+
+        Returns:
+            float: games per second
+        """
+
+        return self.games / self._elapsed if self._elapsed > 0 else 0.0  # return speed
+
+
+def game_seed(seed: int, index: int) -> str:
+    """Returns seed of dices of one game, the same as of RandomDices(seed).stream(index)
+
+    Seed depends only on base seed and index of game, so result of
+    game doesn't depend on number of processes and order of games
+
+    Args:
+        seed (int): base seed
+        index (int): index of game
+
+    Returns:
+        str: seed of game
+    """
+
+    return f"{seed}:{index}"  # return seed
+
+
+def play_game(first: PlayerFactory, second: PlayerFactory,
+              seed: int, index: int, record: BinaryIO = None) -> Tuple[int, int]:
+    """Plays one headless game, players change colors in each next game, red starts
+
+    Global random generator is reseeded by seed of game, so players using it
+    play the same game with the same seeds
+
+    Args:
+        first (PlayerFactory): factory of first player
+        second (PlayerFactory): factory of second player
+        seed (int): base seed
+        index (int): index of game
+        record (BinaryIO, optional): binary log to write game to, seed of dices is
+            saved as meta. Defaults to None
+
+    Returns:
+        Tuple[int, int]: index of winner (0 or 1) and number of turns
+    """
+
+    dices = RandomDices(game_seed(seed, index))  # dices of game
+    random.seed(f"{dices.seed}:players")  # seed global generator used by players
+
+    board = Board()  # board
+    swap = index % 2  # do players change colors
+
+    players = [first(board, "red"), second(board, "black")] if not swap \
+        else [second(board, "red"), first(board, "black")]  # red player starts
+
+    writer = GameWriter(record, board, meta=dices.seed) if record is not None else None  # writer of game
+    game = Game(board, players, dices, writer)  # game
+    game.start()  # play
+
+    return (players.index(game.winner) + swap) % 2, game.turns
+
+
+def _play_chunk(task: Tuple[PlayerFactory, PlayerFactory, int, int, int, bool]) \
+        -> Tuple[List[Tuple[int, int]], bytes]:
+    """Plays games with indexes from start to stop in worker process, returns results and log"""
+
+    first, second, seed, start, stop, record = task
+
+    log = io.BytesIO() if record else None  # log of chunk
+
+    return [play_game(first, second, seed, i, log) for i in range(start, stop)], \
+        log.getvalue() if record else b""
+
+
+def play_games(first: PlayerFactory, second: PlayerFactory, games: int,
+               processes: int = None, seed: int = 0,
+               chunk: int = 16, record: BinaryIO = None) -> Iterator[Tuple[int, int]]:
+    """Plays games in process pool and yields their results as they are ready
+
+    Args:
+        first (PlayerFactory): factory of first player, must be picklable
+        second (PlayerFactory): factory of second player, must be picklable
+        games (int): number of games
+        processes (int, optional): number of processes. Defaults to None (number of CPUs)
+        seed (int, optional): base seed. Defaults to 0
+        chunk (int, optional): number of games sent to worker at once. Defaults to 16
+        record (BinaryIO, optional): binary log to append games to, games are
+            appended by chunks in order of finishing. Defaults to None
+
+    Yields:
+        Tuple[int, int]: index of winner (0 or 1) and number of turns
+    """
+
+    tasks = [(first, second, seed, i, min(i + chunk, games), record is not None)
+             for i in range(0, games, chunk)]  # chunks of games
+
+    if processes == 1:  # play in this process
+        for task in tasks:
+            results, log = _play_chunk(task)
+            if record is not None:
+                record.write(log)
+            yield from results
+        return
+
+    with Pool(processes) as pool:  # pool of workers
+        for results, log in pool.imap_unordered(_play_chunk, tasks):
+            if record is not None:
+                record.write(log)
+            yield from results
+
+
+def run(first: PlayerFactory, second: PlayerFactory, games: int,
+        processes: int = None, seed: int = 0, chunk: int = 16,
+        progress: Callable[[SelfPlayResults], None] = None,
+        record: BinaryIO = None) -> SelfPlayResults:
+    """Plays games in process pool and aggregates results
+
+    Args:
+        first (PlayerFactory): factory of first player, must be picklable
+        second (PlayerFactory): factory of second player, must be picklable
+        games (int): number of games
+        processes (int, optional): number of processes. Defaults to None (number of CPUs)
+        seed (int, optional): base seed. Defaults to 0
+        chunk (int, optional): number of games sent to worker at once. Defaults to 16
+        progress (Callable[[SelfPlayResults], None], optional): called after each game
+            with current results. Defaults to None
+        record (BinaryIO, optional): binary log to append games to. Defaults to None
+
+    Returns:
+        SelfPlayResults: results
+    """
+
+    results = SelfPlayResults()  # results
+    start = perf_counter()  # start time
+
+    for winner, turns in play_games(first, second, games, processes, seed, chunk, record):
+        results.add(winner, turns)  # add result
+        results.elapsed = perf_counter() - start  # update time
+
+        if progress is not None:  # report progress
+            progress(results)
+
+    return results  # return results
+
+
+def load_player(name: str) -> PlayerFactory:
+    """Loads player class by name "module:Class"
+
+    Args:
+        name (str): name of player class
+
+    Returns:
+        PlayerFactory: player class
+    """
+
+    module, cls = name.split(":")  # module and class names
+
+    return getattr(importlib.import_module(module), cls)  # return class
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays headless games between two players")
+    parser.add_argument("--games", type=int, default=1000, help="number of games")
+    parser.add_argument("--processes", type=int, default=None, help="number of processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--chunk", type=int, default=16, help="games sent to worker at once")
+    parser.add_argument("--first", default="bot:Bot", help="first player class (module:Class)")
+    parser.add_argument("--second", default="bot:Bot", help="second player class (module:Class)")
+    parser.add_argument("--record", default=None, help="binary log to append games to")
+    args = parser.parse_args()
+
+    step = max(args.games // 100, 1)  # games between progress reports
+
+    def report(results: SelfPlayResults) -> None:
+        if results.games % step == 0 or results.games == args.games:
+            print(results.summary(), flush=True)
+
+    log = open(args.record, "ab") if args.record is not None else None  # log of games
+
+    run(load_player(args.first), load_player(args.second), args.games,
+        args.processes, args.seed, args.chunk, report, log)
+
+    if log is not None:
+        log.close()
@@ -0,0 +1,409 @@
+# server.py
+# Contains Server class hosting many concurrent headless games in one process
+# Run file to start server on TCP port or Unix socket, for example:
+#     python server.py --port 8765
+#     python server.py --unix /tmp/backgammon.sock
+#
+# Every message is one JSON object in one line. Client sends:
+#     {"type": "new", "opponent": "bot", "color": "red", "seed": 1}
+#         starts game against in-process bot ("bot", "search" or "network") or, if opponent
+#         is "remote", creates game waiting for second client; color and seed (int or str)
+#         are optional
+#     {"type": "join", "game": 3}  joins waiting game
+#     {"type": "list"}  asks for waiting games
+#     {"type": "play", "moves": [[from, to], ...]}  plays turn, cells are board indexes
+# Server sends:
+#     {"type": "created", "game": 3}  game waits for second client
+#     {"type": "waiting", "games": [3, 5]}  waiting games
+#     {"type": "started", "game": 3, "color": "red", "board": [...]}
+#     {"type": "roll", "color": "red", "dices": [3, 5], "turns": 12}  number of legal turns
+#     {"type": "moved", "color": "red", "moves": [[from, to], ...], "board": [...]}
+#     {"type": "end", "winner": "red", "reason": "finished"}  reason is "finished" or "resigned",
+#         bot resigns if it fails to play
+#     {"type": "error", "message": "..."}
+#
+# Each game is a coroutine, so one thread serves all games. Bots play in process pool
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import count
+from typing import Dict, List, Optional, Set, Tuple
+
+from bot import Bot
+from board import Board
+from dicesource import RandomDices
+from movegen import Turn, legal_turns, turn_dices
+from networkbot import NetworkBot
+from searchbot import SearchBot
+
+BACKLOG = 4096  # queue of not accepted connections, many clients may connect at once
+BOTS = {"bot": Bot, "search": SearchBot, "network": NetworkBot}  # bots clients may play against
+
+Moves = List[Tuple[int, int]]  # (from, to) indexes of cells
+
+
+def _bot_turn(name: str, cells: List[int], color: str, dices: Tuple[int, int]) -> Moves:
+    """Plays turn of bot on copy of position in worker process and returns its moves"""
+
+    board = Board(cells)  # copy of position
+    moves = []  # played moves
+    board.add_listener(lambda from_index, to_index: moves.append((from_index, to_index)))
+    BOTS[name](board, color).play(dices)
+
+    return moves  # return moves
+
+
+def _find_turn(board: Board, turns: List[Turn], moves) -> Optional[Turn]:
+    """Returns legal turn leading to the same position as moves or None"""
+
+    position = board.copy()  # position after moves
+    try:
+        for from_index, to_index in moves:
+            if not (0 <= from_index < Board.SIZE and 0 <= to_index < Board.SIZE):
+                return None
+            position.move(from_index, to_index)
+    except (TypeError, ValueError):  # not pairs of indexes or impossible move
+        return None
+
+    return next((t for t in turns if t.board == position), None)
+
+
+class _Resigned(Exception):
+    """Raised when remote player doesn't move in time or bot fails to play"""
+
+
+class _Connection:
+    """Client connection, moves of client's game are put to inbox"""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer  # set writer
+        self.inbox: asyncio.Queue = asyncio.Queue()  # moves sent by client
+        self.game: Optional[int] = None  # index of game client plays
+        self.task: Optional[asyncio.Task] = None  # coroutine of game
+        self.closed = False  # client disconnected
+
+    async def send(self, message: dict) -> None:
+        if self._writer.is_closing():  # client disconnected
+            return
+        self._writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        try:
+            await self._writer.drain()
+        except OSError:  # client disconnected while writing
+            pass
+
+    def close(self) -> None:
+        self.closed = True
+        if self.task is not None:  # client resigns
+            self.task.cancel()
+        self._writer.close()
+
+
+class _RemoteSeat:
+    """Seat of client playing turns by messages"""
+
+    def __init__(self, connection: _Connection, timeout: float = None) -> None:
+        self._connection = connection  # set connection
+        self._timeout = timeout  # set time of turn
+
+    @property
+    def disconnected(self) -> bool:
+        return self._connection.closed
+
+    async def notify(self, message: dict) -> None:
+        await self._connection.send(message)
+
+    async def turn(self, board: Board, color: str, dices: Tuple[int, int], turns: List[Turn]) -> Turn:
+        while True:
+            try:
+                moves = await asyncio.wait_for(self._connection.inbox.get(), self._timeout)
+            except asyncio.TimeoutError:
+                raise _Resigned()
+
+            turn = _find_turn(board, turns, moves)  # checked turn
+            if turn is not None:
+                return turn
+            await self._connection.send({"type": "error", "message": "Turn is illegal"})
+
+
+class _BotSeat:
+    """Seat of in-process bot playing turns in executor"""
+
+    def __init__(self, name: str, executor: Executor) -> None:
+        self._name = name  # set name of bot's class
+        self._executor = executor  # set executor
+
+    @property
+    def disconnected(self) -> bool:
+        return False
+
+    async def notify(self, message: dict) -> None:
+        pass
+
+    async def turn(self, board: Board, color: str, dices: Tuple[int, int], turns: List[Turn]) -> Turn:
+        try:
+            moves = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _bot_turn, self._name, board.tolist(), color, dices)
+        except Exception:  # bot failed or its process died
+            raise _Resigned()
+
+        turn = _find_turn(board, turns, moves)  # checked turn
+        if turn is None:  # bot played illegal turn
+            raise _Resigned()
+
+        return turn
+
+
+class Server:
+    """Server class
+    Describes asyncio server hosting many concurrent games over line-delimited JSON
+
+    Methods:
+        1) serve_tcp(host: str, port: int): starts listening on TCP port
+        2) serve_unix(path: str): starts listening on Unix socket
+        3) close(): stops games, disconnects clients and stops executor
+
+    Properties:
+        1) games: number of running games
+    """
+
+    def __init__(self, processes: int = None, seed: int = None, timeout: float = None) -> None:
+        """Server constructor
+
+        Args:
+            processes (int, optional): number of bots' processes. Defaults to None (number of CPUs)
+            seed (int, optional): base seed of dices, game n uses stream n. Defaults to None
+            timeout (float, optional): seconds for remote player's turn, player resigns
+                after it. Defaults to None (no limit)
+        """
+
+        self._executor = ProcessPoolExecutor(processes)  # executor of bots
+        self._dices = RandomDices(seed)  # base source of rolls
+        self._timeout = timeout  # set time of turn
+
+        self._ids = count(1)  # indexes of games
+        self._waiting: Dict[int, Tuple[_Connection, str, RandomDices]] = {}  # games waiting for second client
+        self._tasks: Set[asyncio.Task] = set()  # running games
+        self._connections: Set[_Connection] = set()  # connected clients
+
+    @property
+    def games(self) -> int:
+        """Number of running games
+
+        Returns:
+            int: number of games
+        """
+
+        return len(self._tasks)  # return number
+
+    async def serve_tcp(self, host: str = None, port: int = 8765) -> asyncio.AbstractServer:
+        """Starts listening on TCP port
+
+        Args:
+            host (str, optional): host. Defaults to None (all interfaces)
+            port (int, optional): port. Defaults to 8765
+
+        Returns:
+            asyncio.AbstractServer: listening server
+        """
+
+        return await asyncio.start_server(self._handle, host, port, backlog=BACKLOG)
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        """Starts listening on Unix socket
+
+        Args:
+            path (str): path to socket
+
+        Returns:
+            asyncio.AbstractServer: listening server
+        """
+
+        return await asyncio.start_unix_server(self._handle, path, backlog=BACKLOG)
+
+    async def close(self) -> None:
+        """Stops games, disconnects clients and stops executor"""
+
+        for connection in list(self._connections):
+            connection.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(cancel_futures=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one client"""
+
+        connection = _Connection(writer)  # client
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):  # disconnected or line is too long
+                    break
+                if not line:  # client disconnected
+                    break
+
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError()
+                except ValueError:
+                    await connection.send({"type": "error", "message": "Message is incorrect"})
+                    continue
+
+                await self._dispatch(connection, message)
+        finally:
+            if connection.game in self._waiting:  # nobody will join
+                del self._waiting[connection.game]
+            self._connections.discard(connection)
+            connection.close()
+
+    async def _dispatch(self, connection: _Connection, message: dict) -> None:
+        """Handles one message of client"""
+
+        match message.get("type"):
+            case "new":
+                color = message.get("color", "red")  # color of client
+                opponent = message.get("opponent", "bot")  # remote or name of bot
+                seed = message.get("seed")  # seed of dices
+                if connection.game is not None:
+                    return await connection.send({"type": "error", "message": "Game is already started"})
+                if not isinstance(color, str) or color not in Board.COLORS:
+                    return await connection.send({"type": "error", "message": "Color is incorrect"})
+                if not isinstance(opponent, str) or opponent != "remote" and opponent not in BOTS:
+                    return await connection.send({"type": "error", "message": "Opponent is unknown"})
+                if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, str))):
+                    return await connection.send({"type": "error", "message": "Seed is incorrect"})
+
+                game = next(self._ids)  # index of game
+                dices = RandomDices(seed) if seed is not None else self._dices.stream(game)
+                connection.game = game
+
+                if opponent == "remote":  # wait for second client
+                    self._waiting[game] = (connection, color, dices)
+                    return await connection.send({"type": "created", "game": game})
+
+                seats = {color: _RemoteSeat(connection, self._timeout),
+                         self._other(color): _BotSeat(opponent, self._executor)}
+                self._start(game, seats, dices, [connection])
+
+            case "join":
+                if connection.game is not None:
+                    return await connection.send({"type": "error", "message": "Game is already started"})
+                game = message.get("game")  # index of game
+                if not isinstance(game, int) or game not in self._waiting:
+                    return await connection.send({"type": "error", "message": "Game isn't waiting"})
+
+                creator, color, dices = self._waiting.pop(game)
+                connection.game = game
+                seats = {color: _RemoteSeat(creator, self._timeout),
+                         self._other(color): _RemoteSeat(connection, self._timeout)}
+                self._start(game, seats, dices, [creator, connection])
+
+            case "list":
+                await connection.send({"type": "waiting", "games": list(self._waiting)})
+
+            case "play":
+                if connection.game is None or connection.game in self._waiting:
+                    return await connection.send({"type": "error", "message": "Game isn't started"})
+                connection.inbox.put_nowait(message.get("moves", []))
+
+            case _:
+                await connection.send({"type": "error", "message": "Message type is unknown"})
+
+    @staticmethod
+    def _other(color: str) -> str:
+        return "black" if color == "red" else "red"
+
+    def _start(self, game: int, seats: dict, dices: RandomDices, connections: List[_Connection]) -> None:
+        """Starts game coroutine"""
+
+        task = asyncio.get_running_loop().create_task(self._play(game, seats, dices, connections))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        for connection in connections:  # disconnection cancels game
+            connection.task = task
+
+    async def _play(self, game: int, seats: dict, dices: RandomDices,
+                    connections: List[_Connection]) -> None:
+        """Plays game, red starts"""
+
+        board = Board()  # board of game
+
+        async def broadcast(message: dict) -> None:
+            for seat in seats.values():
+                await seat.notify(message)
+
+        winner, reason = None, "finished"  # result of game
+        try:
+            for color, seat in seats.items():
+                await seat.notify({"type": "started", "game": game, "color": color, "board": board.tolist()})
+
+            turn_index = 0  # number of played turns
+            while board.winner is None:
+                color = Board.COLORS[turn_index % 2]  # color to move
+                roll = dices.roll()  # dices
+                turns = legal_turns(board, color, turn_dices(roll))  # legal turns
+                await broadcast({"type": "roll", "color": color, "dices": list(roll), "turns": len(turns)})
+
+                if turns:
+                    try:
+                        turn = await seats[color].turn(board, color, roll, turns)
+                    except _Resigned:
+                        winner, reason = self._other(color), "resigned"
+                        break
+                    for from_index, to_index in turn.moves:
+                        board.move(from_index, to_index)
+                    await broadcast({"type": "moved", "color": color, "board": board.tolist(),
+                                     "moves": [list(move) for move in turn.moves]})
+
+                turn_index += 1
+        except asyncio.CancelledError:
+            loser = next((c for c, seat in seats.items() if seat.disconnected), None)  # disconnected player
+            if loser is None:  # server is closed
+                raise
+            winner, reason = self._other(loser), "resigned"
+
+        try:
+            await broadcast({"type": "end", "winner": winner or board.winner, "reason": reason})
+        finally:
+            for connection in connections:  # clients may start new games
+                connection.game = None
+                connection.task = None
+                while not connection.inbox.empty():  # drop moves sent too late
+                    connection.inbox.get_nowait()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = Server(args.processes, args.seed, args.timeout)  # server
+    listener = await server.serve_unix(args.unix) if args.unix else \
+        await server.serve_tcp(args.host, args.port)  # listening server
+    address = args.unix or f"{args.host or '*'}:{args.port}"  # address of server
+    print(f"listening on {address}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hosts concurrent games over line-delimited JSON")
+    parser.add_argument("--host", default=None, help="TCP host")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port")
+    parser.add_argument("--unix", default=None, help="Unix socket path, used instead of TCP")
+    parser.add_argument("--processes", type=int, default=None, help="number of bots' processes")
+    parser.add_argument("--seed", type=int, default=None, help="base seed of dices")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds for remote turn")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,144 @@
+# surfacecache.py
+# Contains SurfaceCache class and process-wide cache instance
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
+
+import pygame
+
+
+class SurfaceCache:
+    """SurfaceCache class
+    Describes cache of loaded and scaled images
+
+    Surfaces are shared between all users and must not be modified.
+    Least recently used surface is evicted when cache is full
+
+    Methods:
+        1) get(path: str, size: Tuple[int, int]): returns loaded and scaled image
+        2) clear(): removes all surfaces and resets counters
+
+    Properties:
+        1) hits: number of requests found in cache
+        2) misses: number of requests loaded from disk
+        3) evictions: number of evicted surfaces
+        4) capacity: maximal number of surfaces in cache
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        """SurfaceCache constructor
+
+        Args:
+            capacity (int, optional): maximal number of surfaces. Defaults to 64
+
+        Raises:
+            ValueError: in case of not positive capacity
+        """
+
+        if capacity < 1:  # if capacity is incorrect
+            raise ValueError("Capacity must be positive")  # throw exception
+
+        self._capacity = capacity  # set capacity
+        self._surfaces = OrderedDict()  # surfaces by (path, size)
+        self._locker = Lock()  # locker of surfaces
+
+        self._hits = 0  # number of hits
+        self._misses = 0  # number of misses
+        self._evictions = 0  # number of evictions
+
+    def __len__(self) -> int:
+        """Returns number of cached surfaces
+
+        Returns:
+            int: number of surfaces
+        """
+
+        return len(self._surfaces)  # return length
+
+    def get(self, path: str, size: Tuple[int, int]) -> pygame.Surface:
+        """Returns loaded and scaled image, loads it only if it isn't cached
+
+        Args:
+            path (str): path to image
+            size (Tuple[int, int]): size of image
+
+        Returns:
+            pygame.Surface: shared surface, must not be modified
+        """
+
+        key = (path, tuple(size))  # key of surface
+
+        with self._locker:  # lock surfaces
+            surface = self._surfaces.get(key)  # cached surface
+
+            if surface is not None:  # if surface is cached
+                self._hits += 1  # count hit
+                self._surfaces.move_to_end(key)  # mark as recently used
+                return surface  # return surface
+
+            self._misses += 1  # count miss
+
+            surface = pygame.image.load(path)  # load image
+            surface = pygame.transform.scale(surface, key[1])  # scale image
+
+            self._surfaces[key] = surface  # cache surface
+
+            # evict least recently used surfaces
+            while len(self._surfaces) > self._capacity:
+                self._surfaces.popitem(last=False)
+                self._evictions += 1
+
+            return surface  # return surface
+
+    def clear(self) -> None:
+        """Removes all surfaces and resets counters"""
+
+        with self._locker:  # lock surfaces
+            self._surfaces.clear()  # remove surfaces
+            self._hits = 0  # reset hits
+            self._misses = 0  # reset misses
+            self._evictions = 0  # reset evictions
+
+    @property
+    def hits(self) -> int:
+        """Number of requests found in cache
+
+        Returns:
+            int: number of hits
+        """
+
+        return self._hits  # return hits
+
+    @property
+    def misses(self) -> int:
+        """Number of requests loaded from disk
+
+        Returns:
+            int: number of misses
+        """
+
+        return self._misses  # return misses
+
+    @property
+    def evictions(self) -> int:
+        """Number of evicted surfaces
+
+        Returns:
+            int: number of evictions
+        """
+
+        return self._evictions  # return evictions
+
+    @property
+    def capacity(self) -> int:
+        """Maximal number of surfaces in cache
+
+        Returns:
+            int: capacity
+        """
+
+        return self._capacity  # return capacity
+
+
+surfaces = SurfaceCache()  # process-wide cache of surfaces
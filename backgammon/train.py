@@ -0,0 +1,320 @@
+# train.py
+# Contains Trainer class and functions training evaluation network by TD(lambda) self-play
+# Run file to train network saved to network.bin, for example:
+#     python train.py --games 100000 --processes 8 --hidden 40
+#
+# Worker processes play games of network against itself with weights from shared memory
+# and send encoded positions to learner. Learner updates its weights by TD(lambda) and
+# periodically copies them to shared memory, workers take new weights before next game
+
+import argparse
+import os
+import queue
+import random
+from multiprocessing import Event, Lock, Process, Queue, Value
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from board import Board
+from dicesource import RandomDices
+from game import Game
+from movegen import Turn, legal_turns, turn_dices
+from network import FEATURES, HIDDEN, NETWORK, Network, encode, size
+from networkbot import NetworkBot
+
+Trajectory = Tuple[np.ndarray, np.ndarray, bool]  # features of positions, are movers red, did red win
+
+
+class _SelfPlayer(NetworkBot):
+    """NetworkBot playing random turns with probability epsilon and saving positions after its turns"""
+
+    def __init__(self, board: Board, color: str, network: Network, epsilon: float,
+                 rng: random.Random, history: List[Tuple[Board, bool]]) -> None:
+        super().__init__(board, color, network)
+        self._epsilon = epsilon  # set exploration
+        self._rng = rng  # set random turns
+        self._history = history  # set positions of game
+
+    def choose(self, dices: Tuple[int, int]) -> Turn:
+        if self._epsilon and self._rng.random() < self._epsilon:  # explore
+            turns = legal_turns(self._board, self._color, turn_dices(dices))
+            return self._rng.choice(turns) if turns else None
+
+        return super().choose(dices)
+
+    def play(self, dices: Tuple[int, int]) -> None:
+        super().play(dices)
+        self._history.append((self._board.copy(), self._color == "red"))
+
+
+def self_play(network: Network, seed: str, epsilon: float = 0.0,
+              max_turns: int = 1000) -> Trajectory:
+    """Plays one headless game of network against itself, red starts
+
+    Args:
+        network (Network): evaluation network
+        seed (str): seed of dices and exploration
+        epsilon (float, optional): probability of random turn. Defaults to 0.0
+        max_turns (int, optional): maximal number of turns. Defaults to 1000
+
+    Returns:
+        Trajectory: features of positions after each turn from mover's side,
+            colors of movers and result (None if game isn't finished)
+    """
+
+    board = Board()  # board
+    rng = random.Random(f"{seed}:explore")  # random turns
+    history = []  # positions after turns
+    game = Game(board, tuple(_SelfPlayer(board, color, network, epsilon, rng, history)
+                             for color in Board.COLORS), RandomDices(seed))
+    game.start(max_turns)
+
+    reds = np.array([red for _, red in history])  # are movers red
+    features = np.empty((len(history), FEATURES), dtype=np.float32)  # features of positions
+    for color, mask in (("red", reds), ("black", ~reds)):
+        if mask.any():
+            features[mask] = encode([b for (b, _), m in zip(history, mask) if m], color)
+
+    return features, reds, None if board.winner is None else board.winner == "red"
+
+
+def _worker(name: str, hidden: int, version: Value, lock: Lock, trajectories: Queue,
+            stop: Event, seed: str, index: int, epsilon: float) -> None:
+    """Plays games with weights from shared memory and sends trajectories to learner"""
+
+    memory = SharedMemory(name)  # shared weights
+    shared = np.ndarray(size(hidden), dtype=np.float32, buffer=memory.buf)
+    network = Network(hidden, np.empty(size(hidden), dtype=np.float32))  # local copy of weights
+    current = -1  # version of local weights
+
+    games = 0  # number of played games
+    while not stop.is_set():
+        if version.value != current:  # take new weights
+            with lock:
+                network.params[:] = shared
+                current = version.value
+
+        trajectory = self_play(network, f"{seed}:{index}:{games}", epsilon)
+        games += 1
+        if trajectory[2] is None:  # game isn't finished
+            continue
+
+        while not stop.is_set():  # send unless training is over
+            try:
+                trajectories.put(trajectory, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+    del shared  # release buffer before closing memory
+    memory.close()
+
+
+class Trainer:
+    """Trainer class
+    Describes TD(lambda) learner of evaluation network with self-play worker processes
+
+    Values are taken from red's side: U = V if red moved else 1 - V, TD error of
+    position is U of next position minus U, final U is 1 if red won else 0. Seeds of
+    games are built from number of games network is trained on, so training resumed
+    from saved network doesn't replay games it has learned
+
+    Methods:
+        1) update(trajectory: Trajectory): updates weights by one game
+        2) train(games: int, progress: Callable): plays games and learns from them
+        3) checkpoint(): saves network
+
+    Properties:
+        1) network: trained network
+        2) games: number of games network is trained on, including games of previous trainings
+    """
+
+    def __init__(self, network: Network, processes: int = None, alpha: float = 0.1,
+                 lambda_: float = 0.7, epsilon: float = 0.0, seed: int = 0, sync: int = 16,
+                 path: str = NETWORK, checkpoint: int = 1000) -> None:
+        """Trainer constructor
+
+        Args:
+            network (Network): trained network, its parameters are updated in place
+            processes (int, optional): number of worker processes, 0 to play in this process.
+                Defaults to None (number of CPUs)
+            alpha (float, optional): learning rate. Defaults to 0.1
+            lambda_ (float, optional): decay of eligibility traces. Defaults to 0.7
+            epsilon (float, optional): probability of random turn in self-play. Defaults to 0.0
+            seed (int, optional): base seed of games. Defaults to 0
+            sync (int, optional): number of learned games between copying weights to workers.
+                Defaults to 16
+            path (str, optional): path of checkpoints. Defaults to NETWORK
+            checkpoint (int, optional): number of learned games between checkpoints. Defaults to 1000
+        """
+
+        self._network = network  # set network
+        self._processes = processes if processes is not None else os.cpu_count() or 1  # set processes
+        self._alpha = alpha  # set learning rate
+        self._lambda = lambda_  # set decay of traces
+        self._epsilon = epsilon  # set exploration
+        self._seed = seed  # set seed
+        self._sync = sync  # set period of copying weights
+        self._path = path  # set path of checkpoints
+        self._checkpoint = checkpoint  # set period of checkpoints
+
+
+    @property
+    def network(self) -> Network:
+        """Trained network
+
+        Returns:
+            Network: network
+        """
+
+        return self._network  # return network
+
+    @property
+    def games(self) -> int:
+        """Number of games network is trained on, including games of previous trainings
+
+        Returns:
+            int: number of games
+        """
+
+        return self._network.games  # return number
+
+    def update(self, trajectory: Trajectory) -> None:
+        """Updates weights by TD(lambda) on one game
+
+        Args:
+            trajectory (Trajectory): game
+        """
+
+        features, reds, red_won = trajectory
+        params = self._network.params  # updated in place
+        traces = np.zeros_like(params)  # eligibility traces
+
+        value, grad = self._network.gradient(features[0])
+        u, du = (value, grad) if reds[0] else (1 - value, -grad)  # value from red's side
+
+        for t in range(len(features)):
+            if t + 1 < len(features):
+                value, grad = self._network.gradient(features[t + 1])
+                u_next, du_next = (value, grad) if reds[t + 1] else (1 - value, -grad)
+            else:  # end of game
+                u_next, du_next = float(red_won), None
+
+            traces *= self._lambda
+            traces += du
+            params += self._alpha * (u_next - u) * traces
+
+            u, du = u_next, du_next
+
+        self._network.games += 1
+
+    def checkpoint(self) -> None:
+        """Saves network, file is replaced atomically"""
+
+        self._network.save(self._path + ".tmp")
+        os.replace(self._path + ".tmp", self._path)
+
+    def train(self, games: int, progress: Callable[["Trainer", float], None] = None) -> None:
+        """Plays games until number of finished games is learned
+
+        Args:
+            games (int): number of finished games to learn
+            progress (Callable[[Trainer, float], None], optional): called after each game with
+                trainer and number of games per second. Defaults to None
+        """
+
+        start = perf_counter()  # start time
+        first = self.games  # number of learned games before training
+
+        def learned(trajectory: Trajectory) -> None:
+            self.update(trajectory)
+            if self._checkpoint and self.games % self._checkpoint == 0:
+                self.checkpoint()
+            if progress is not None:
+                progress(self, (self.games - first) / (perf_counter() - start))
+
+        if self._processes == 0:  # play in this process
+            tries = 0  # number of unfinished games played instead of next learned game
+            while self.games - first < games:
+                trajectory = self_play(self._network, f"{self._seed}:{self.games}:{tries}", self._epsilon)
+                tries += 1
+                if trajectory[2] is not None:  # unfinished game isn't learned
+                    learned(trajectory)
+                    tries = 0
+            self.checkpoint()
+            return
+
+        params = self._network.params
+        memory = SharedMemory(create=True, size=params.nbytes)  # shared weights
+        shared = np.ndarray(params.shape, dtype=np.float32, buffer=memory.buf)
+        shared[:] = params
+
+        version = Value("i", 0)  # version of shared weights
+        lock = Lock()  # locker of shared weights
+        trajectories = Queue(4 * self._processes)  # games from workers
+        stop = Event()  # training is over
+
+        workers = [Process(target=_worker, daemon=True,
+                           args=(memory.name, self._network.hidden, version, lock, trajectories,
+                                 stop, f"{self._seed}:{self.games}", i, self._epsilon))
+                   for i in range(self._processes)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for i in range(games):
+                while True:
+                    # workers exit only when training is over, so exited worker has crashed
+                    dead = next((w for w in workers if not w.is_alive()), None)  # crashed worker
+                    if dead is not None:
+                        raise RuntimeError(f"Worker exited with code {dead.exitcode}")  # throw exception
+                    try:
+                        trajectory = trajectories.get(timeout=1.0)
+                        break
+                    except queue.Empty:  # games are long or worker has crashed
+                        pass
+
+                learned(trajectory)
+                if (i + 1) % self._sync == 0:  # hot-swap weights of workers
+                    with lock:
+                        shared[:] = params
+                        version.value += 1
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+            del shared  # release buffer before closing memory
+            memory.close()
+            memory.unlink()
+
+        self.checkpoint()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trains evaluation network by TD(lambda) self-play")
+    parser.add_argument("--games", type=int, default=10000, help="number of games")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--hidden", type=int, default=HIDDEN, help="hidden units of new network")
+    parser.add_argument("--alpha", type=float, default=0.1, help="learning rate")
+    parser.add_argument("--lambda", dest="lambda_", type=float, default=0.7, help="decay of traces")
+    parser.add_argument("--epsilon", type=float, default=0.0, help="probability of random turn")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--path", default=NETWORK, help="network to continue training and save")
+    parser.add_argument("--checkpoint", type=int, default=1000, help="games between checkpoints")
+    args = parser.parse_args()
+
+    network = Network.load(args.path) if os.path.exists(args.path) else \
+        Network(args.hidden, seed=args.seed)  # trained network
+    trainer = Trainer(network, args.processes, args.alpha, args.lambda_, args.epsilon,
+                      args.seed, path=args.path, checkpoint=args.checkpoint)
+
+    step = max(args.games // 100, 1)  # games between progress reports
+
+    def report(trainer: Trainer, speed: float) -> None:
+        if trainer.games % step == 0:
+            print(f"games: {trainer.games}, {speed:.1f} games/s", flush=True)
+
+    trainer.train(args.games, report)
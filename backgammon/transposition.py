@@ -0,0 +1,199 @@
+# transposition.py
+# Contains TranspositionTable class
+# Run file to check replacement of entries:
+#     python transposition.py
+
+from typing import Any, Tuple
+
+from board import Board
+
+
+class TranspositionTable:
+    """TranspositionTable class
+    Describes bounded cache of evaluations and search results of positions
+
+    Entries are found by Board.side_hash (position and side to move). Table has
+    2 slots for each index: first slot keeps the deepest entry and is replaced
+    only by deeper or equal searches or by entries of newer search, second slot
+    is always replaced
+
+    Methods:
+        1) get(board: Board, color: str): returns entry of position
+        2) put(board: Board, color: str, depth: int, value: float, move: Any): saves entry
+        3) new_search(): starts new search, older entries become replaceable
+        4) clear(): removes all entries and resets counters
+
+    Properties:
+        1) size: number of slots
+        2) hits: number of found entries
+        3) misses: number of not found entries
+        4) stores: number of saved entries
+        5) replacements: number of replaced entries of other positions
+    """
+
+    def __init__(self, bits: int = 16) -> None:
+        """TranspositionTable constructor
+
+        Args:
+            bits (int, optional): table has 2 ** bits indexes. Defaults to 16
+        """
+
+        self._mask = (1 << bits) - 1  # mask of index
+        self._size = 2 << bits  # number of slots
+
+        self._keys = [None] * self._size  # hashes of entries
+        self._depths = [0] * self._size  # depths of searches
+        self._values = [None] * self._size  # values of entries
+        self._moves = [None] * self._size  # best moves of entries
+        self._ages = [0] * self._size  # numbers of searches of entries
+        self._age = 0  # number of current search
+
+        self._hits = 0  # number of hits
+        self._misses = 0  # number of misses
+        self._stores = 0  # number of stores
+        self._replacements = 0  # number of replacements
+
+    def get(self, board: Board, color: str, depth: int = 0) -> Tuple[float, Any]:
+        """Returns entry of position searched at least to depth
+
+        Args:
+            board (Board): position
+            color (str): color of player to move
+            depth (int, optional): minimal depth of search. Defaults to 0
+
+        Returns:
+            Tuple[float, Any]: value and best move or None if there is no entry
+        """
+
+        key = board.side_hash(color)  # hash of entry
+        slot = (key & self._mask) << 1  # first slot of index
+
+        for s in (slot, slot + 1):
+            if self._keys[s] == key and self._depths[s] >= depth:
+                self._hits += 1  # count hit
+                self._ages[s] = self._age  # entry is used in current search
+                return self._values[s], self._moves[s]  # return entry
+
+        self._misses += 1  # count miss
+
+        return None  # no entry
+
+    def put(self, board: Board, color: str, depth: int, value: float, move: Any = None) -> None:
+        """Saves entry of position
+
+        Args:
+            board (Board): position
+            color (str): color of player to move
+            depth (int): depth of search (0 for static evaluation)
+            value (float): value of position
+            move (Any, optional): best move. Defaults to None
+        """
+
+        key = board.side_hash(color)  # hash of entry
+        slot = (key & self._mask) << 1  # first slot of index
+
+        # keep deepest entry in first slot, move replaced entry to second slot
+        replaceable = self._keys[slot] is None or depth >= self._depths[slot] or \
+            self._ages[slot] != self._age  # first slot may be replaced
+        if not replaceable:  # deeper entry of current search is kept
+            slot += 1  # always replaced slot
+        elif self._keys[slot] is not None and self._keys[slot] != key:
+            self._save(slot + 1, self._keys[slot], self._depths[slot],
+                       self._values[slot], self._moves[slot])
+            self._keys[slot] = None  # entry is moved, not lost
+
+        self._save(slot, key, depth, value, move)  # save entry
+        self._stores += 1  # count store
+
+    def _save(self, slot: int, key: int, depth: int, value: float, move: Any) -> None:
+        """Writes entry to slot"""
+
+        if self._keys[slot] is not None and self._keys[slot] != key:  # other position is lost
+            self._replacements += 1
+
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+        self._moves[slot] = move
+        self._ages[slot] = self._age
+
+    def new_search(self) -> None:
+        """Starts new search, entries of older searches become replaceable"""
+
+        self._age += 1  # increase number of search
+
+    def clear(self) -> None:
+        """Removes all entries and resets counters"""
+
+        self.__init__(self._mask.bit_length())  # reset table
+
+    @property
+    def size(self) -> int:
+        """Number of slots
+
+        Returns:
+            int: number of slots
+        """
+
+        return self._size  # return size
+
+    @property
+    def hits(self) -> int:
+        """Number of found entries
+
+        Returns:
+            int: number of hits
+        """
+
+        return self._hits  # return hits
+
+    @property
+    def misses(self) -> int:
+        """Number of not found entries
+
+        Returns:
+            int: number of misses
+        """
+
+        return self._misses  # return misses
+
+    @property
+    def stores(self) -> int:
+        """Number of saved entries
+
+        Returns:
+            int: number of stores
+        """
+
+        return self._stores  # return stores
+
+    @property
+    def replacements(self) -> int:
+        """Number of replaced entries of other positions
+
+        Returns:
+            int: number of replacements
+        """
+
+        return self._replacements  # return replacements
+
+
+if __name__ == "__main__":
+    table = TranspositionTable(bits=4)  # table
+    board = Board()  # position
+
+    table.put(board, "red", 3, 0.5)
+    table.put(board, "red", 1, 0.1)  # shallower search doesn't replace deeper one
+    if table.get(board, "red", 2) != (0.5, None) or table.get(board, "red", 1) != (0.5, None):
+        raise ValueError("Deeper entry is replaced by shallower one")  # throw exception
+
+    table.put(board, "red", 3, 0.7)  # equal depth replaces entry
+    if table.get(board, "red", 3) != (0.7, None):
+        raise ValueError("Entry isn't replaced by equal depth")  # throw exception
+
+    table.new_search()
+    table.put(board, "red", 1, 0.2)  # entries of older searches are replaceable
+    if table.get(board, "red", 2) is not None or table.get(board, "red", 1) != (0.2, None):
+        raise ValueError("Entry of older search isn't replaced")  # throw exception
+
+    print("ok")
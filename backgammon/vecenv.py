@@ -0,0 +1,334 @@
+# vecenv.py
+# Contains VecEnv class
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from board import Board
+from dicesource import BlockDices, DiceSource
+from movegen import HEAD_DOUBLES, HOME, PATHS, PRIME, legal_moves
+
+ACTIONS = 24 * 6  # number of actions: index on path of moved checker * 6 + value of dice - 1
+OBSERVATION = 30  # length of observation: 24 path cells, own and opponent's exited checkers, 4 dices
+
+_PATHS = np.array([PATHS["red"], PATHS["black"]], dtype=np.intp)  # cells of paths of each color
+_SIGNS = np.array([1, -1], dtype=np.int8)  # signs of colors
+_OPPONENT = (np.arange(24) + 12) % 24  # own path indexes of opponent's path cells
+_WINDOWS = np.arange(24 - PRIME + 1)  # starts of blocks on opponent's path
+
+
+class VecEnv:
+    """VecEnv class
+    Describes batch of headless games played in lockstep
+
+    Game state is stored in arrays (games x cells). Each step moves one checker in
+    every game, action is index on path of moved checker * 6 + value of dice - 1.
+    Turn passes to opponent when all dices are used or no move is possible, finished
+    games are reset automatically. Observations are given from side to move
+
+    Methods:
+        1) reset(): resets all games and returns observations
+        2) step(actions: np.ndarray): makes moves and returns (observations, rewards, dones, infos)
+        3) action_masks(): returns masks of legal actions
+        4) board(index: int): returns Board of one game
+
+    Properties:
+        1) games: number of games
+        2) turn: colors to move (0 is red, 1 is black)
+    """
+
+    def __init__(self, games: int, seed: int = None, dices: DiceSource = None) -> None:
+        """VecEnv constructor
+
+        Args:
+            games (int): number of games
+            seed (int, optional): seed of dices. Defaults to None
+            dices (DiceSource, optional): source of rolls of all games, rolls of one
+                step are drawn in order of games. Defaults to None (BlockDices(seed))
+        """
+
+        self._games = games  # set number of games
+        self._source = dices if dices is not None else BlockDices(seed)  # source of rolls
+
+        self._points = np.zeros((games, 24), dtype=np.int8)  # signed checkers in cells
+        self._off = np.zeros((games, 2), dtype=np.int8)  # exited checkers of each color
+        self._turn = np.zeros(games, dtype=np.int8)  # color to move
+        self._dices = np.zeros((games, 4), dtype=np.int8)  # dices left to play, 0 is used
+        self._heads = np.zeros(games, dtype=np.int8)  # moves from head left
+        self._masks = np.zeros((games, ACTIONS), dtype=bool)  # legal actions
+
+        self.reset()  # start games
+
+    @property
+    def games(self) -> int:
+        """Number of games
+
+        Returns:
+            int: number of games
+        """
+
+        return self._games  # return number of games
+
+    @property
+    def turn(self) -> np.ndarray:
+        """Colors to move (0 is red, 1 is black)
+
+        Returns:
+            np.ndarray: colors
+        """
+
+        return self._turn.copy()  # return colors
+
+    def reset(self) -> np.ndarray:
+        """Resets all games
+
+        Returns:
+            np.ndarray: observations (games x OBSERVATION)
+        """
+
+        self._reset(np.ones(self._games, dtype=bool))  # reset all games
+        self._advance()  # pass turns if can't move
+
+        return self._observe()  # return observations
+
+    def action_masks(self) -> np.ndarray:
+        """Returns masks of legal actions, each game has at least one
+
+        Returns:
+            np.ndarray: masks (games x ACTIONS)
+        """
+
+        return self._masks.copy()  # return masks
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """Moves one checker in every game
+
+        Args:
+            actions (np.ndarray): actions of games
+
+        Raises:
+            ValueError: in case of illegal action
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]: observations,
+                rewards (1 if moving player won, else 0), dones and infos
+                (winner and terminal observation of finished games)
+        """
+
+        actions = np.asarray(actions, dtype=np.intp)  # actions
+        games = np.arange(self._games)  # indexes of games
+
+        if actions.shape != (self._games,) or \
+                not self._masks[games, actions.clip(0, ACTIONS - 1)].all() or \
+                ((actions < 0) | (actions >= ACTIONS)).any():  # if some action is illegal
+            raise ValueError("Action is illegal")  # throw exception
+
+        i = actions // 6  # moved checkers
+        dice = (actions % 6 + 1).astype(np.int8)  # used dices
+        j = i + dice  # destinations
+        sign = _SIGNS[self._turn]  # signs of moving colors
+
+        # move checkers
+        self._points[games, _PATHS[self._turn, i]] -= sign
+        field = j < 24  # moves on field
+        self._points[games[field], _PATHS[self._turn[field], j[field]]] += sign[field]
+        self._off[games[~field], self._turn[~field]] += 1
+
+        # use dices
+        used = (self._dices == dice[:, None]).argmax(1)  # first dice with used value
+        self._dices[games, used] = 0
+        self._heads -= (i == 0).astype(np.int8)
+
+        # finish games
+        dones = self._off[games, self._turn] == Board.CHECKERS  # finished games
+        rewards = dones.astype(np.float32)  # rewards of moving players
+        infos = [{} for _ in range(self._games)]  # infos
+
+        if dones.any():  # save results and reset finished games
+            observations = self._observe()
+            for g in np.flatnonzero(dones):
+                infos[g] = {"winner": int(self._turn[g]), "terminal_observation": observations[g]}
+            self._reset(dones)
+
+        self._advance()  # pass turns if can't move
+
+        return self._observe(), rewards, dones, infos
+
+    def board(self, index: int) -> Board:
+        """Returns board of one game
+
+        Args:
+            index (int): index of game
+
+        Returns:
+            Board: board
+        """
+
+        return Board(self._points[index].tolist() +
+                     [int(self._off[index, 0]), -int(self._off[index, 1])])  # return board
+
+    def _reset(self, games: np.ndarray) -> None:
+        """Sets start position in games, red moves first"""
+
+        self._points[games] = 0
+        self._points[games, Board.HEADS["red"]] = Board.CHECKERS
+        self._points[games, Board.HEADS["black"]] = -Board.CHECKERS
+        self._off[games] = 0
+        self._turn[games] = 0
+        self._throw(games)
+
+    def _throw(self, games: np.ndarray) -> None:
+        """Throws dices in games"""
+
+        n = int(games.sum())  # number of games
+        dices = np.asarray(self._source.rolls(n), dtype=np.int8).reshape(n, 2)  # values of dices
+        double = dices[:, 0] == dices[:, 1]  # doubles
+
+        self._dices[games, :2] = dices
+        self._dices[games, 2:] = np.where(double, dices[:, 0], 0)[:, None]
+
+        # two checkers can be moved from head on first turn with special doubles
+        first = self._relative()[games, 0] == Board.CHECKERS
+        special = double & np.isin(dices[:, 0], HEAD_DOUBLES)
+        self._heads[games] = np.where(first & special, 2, 1)
+
+    def _relative(self) -> np.ndarray:
+        """Returns cells on paths of colors to move, own checkers are positive"""
+
+        return np.take_along_axis(self._points, _PATHS[self._turn], axis=1) * \
+            _SIGNS[self._turn][:, None]
+
+    def _observe(self) -> np.ndarray:
+        """Returns observations from side to move"""
+
+        observations = np.empty((self._games, OBSERVATION), dtype=np.int8)
+        games = np.arange(self._games)
+
+        observations[:, :24] = self._relative()
+        observations[:, 24] = self._off[games, self._turn]
+        observations[:, 25] = self._off[games, 1 - self._turn]
+        observations[:, 26:] = -np.sort(-self._dices, axis=1)
+
+        return observations
+
+    def _advance(self) -> None:
+        """Computes legal actions and passes turn in games where player can't move"""
+
+        while True:
+            self._masks = self._legal()  # legal actions
+            stuck = ~self._masks.any(1)  # games where player can't move
+
+            if not stuck.any():
+                break
+
+            self._turn[stuck] = 1 - self._turn[stuck]  # pass turn
+            self._throw(stuck)  # throw dices
+
+    def _legal(self) -> np.ndarray:
+        """Returns masks of legal actions"""
+
+        points = self._relative()  # cells on paths
+        masks = _moves(points, self._dices, self._heads)  # moves of one checker
+
+        left = (self._dices > 0).sum(1)  # number of dices left
+        higher = self._dices.max(1)  # higher dice left
+        lower = np.where(self._dices > 0, self._dices, 7).min(1)  # lower dice left
+        double = (left > 1) & (higher == lower)  # doubles
+        both = (left == 2) & (higher != lower)  # two different dices left
+
+        # every turn must use as many dices as possible, check it by playing second dice
+        rows, actions = np.nonzero(masks & both[:, None])  # legal moves by one dice
+        if len(rows):
+            i, dice = actions // 6, (actions % 6 + 1).astype(np.int8)
+            moves = np.arange(len(rows))
+
+            children = points[rows]  # positions after moves
+            children[moves, i] -= 1
+            field = i + dice < 24
+            children[moves[field], (i + dice)[field]] += 1
+
+            dices = np.zeros((len(rows), 4), dtype=np.int8)  # second dices
+            dices[:, 0] = np.where(dice == higher[rows], lower[rows], higher[rows])
+            heads = self._heads[rows] - (i == 0)
+            further = _moves(children, dices, heads).any(1)  # can play second dice
+
+            # games where both dices can be used and where higher dice can be used
+            any_further = np.bincount(rows, further, self._games) > 0
+            any_higher = np.bincount(rows, dice == higher[rows], self._games) > 0
+
+            illegal = np.where(any_further[rows], ~further,
+                               any_higher[rows] & (dice != higher[rows]))
+            masks[rows[illegal], actions[illegal]] = False
+
+        # doubles are checked by exact search
+        for g in np.flatnonzero(double):
+            color = Board.COLORS[self._turn[g]]
+            dices = tuple(int(d) for d in self._dices[g] if d > 0)
+            masks[g] = False
+            for (from_index, _), dice in legal_moves(self.board(g), color, dices,
+                                                     int(self._heads[g])).items():
+                masks[g, Board.to_relative(from_index, color) * 6 + dice - 1] = True
+
+        return masks
+
+
+def _moves(points: np.ndarray, dices: np.ndarray, heads: np.ndarray) -> np.ndarray:
+    """Returns masks of moves of one checker which are legal without looking at next moves"""
+
+    n = len(points)  # number of positions
+    masks = np.zeros((n, 24, 6), dtype=bool)  # masks by index on path and dice
+
+    own = points > 0  # cells with own checkers
+    starts = own.copy()  # cells checkers can be moved from
+    starts[:, 0] &= heads > 0  # head is used
+
+    # exiting is possible if all checkers are in home, higher dice is for farthest checker
+    exiting = points[:, :HOME].clip(min=0).sum(1) == 0
+    home = own[:, HOME:]
+    back = np.where(home.any(1), HOME + home.argmax(1), 24)
+
+    # farthest opponent's checker on opponent's path
+    opponent = (points < 0)[:, _OPPONENT]
+    front = np.where(opponent.any(1), 23 - opponent[:, ::-1].argmax(1), -1)
+
+    for dice in range(1, 7):
+        has = (dices == dice).any(1)  # dice is left
+        if not has.any():
+            continue
+
+        # moves on field
+        k = 24 - dice  # number of moves on field
+        i = np.arange(k)
+        possible = starts[:, :k] & (points[:, dice:] >= 0)
+
+        # forbidden blocks can be built only by moving to empty cell with five own cells around
+        empty = points[:, dice:] == 0
+        rows = np.flatnonzero((possible & empty).any(1) & (own.sum(1) >= PRIME - 1))
+        if len(rows):
+            m = len(rows)  # number of checked positions
+            occupied = np.repeat(own[rows, None, :], k, axis=1)  # own cells after each move
+            occupied[:, i, i] = points[rows, :k] > 1
+            occupied[:, i, i + dice] = True
+            occupied = occupied[:, :, _OPPONENT].astype(np.int8)  # on opponent's path
+
+            sums = np.concatenate([np.zeros((m, k, 1), dtype=np.int8),
+                                   occupied.cumsum(2, dtype=np.int8)], axis=2)
+            full = sums[:, :, PRIME:] - sums[:, :, :-PRIME] == PRIME  # blocks of six
+            target = (i + dice + 12) % 24  # destination on opponent's path
+            contains = (_WINDOWS[None, :] <= target[:, None]) & \
+                (_WINDOWS[None, :] + PRIME - 1 >= target[:, None])  # blocks containing destination
+            unguarded = front[rows, None, None] <= _WINDOWS[None, None, :] + PRIME - 1
+            forbidden = (full & contains[None] & unguarded).any(2) & empty[rows]
+            possible[rows] &= ~forbidden
+
+        masks[:, :k, dice - 1] = possible
+
+        # exits
+        i = np.arange(k, 24)
+        masks[:, k:, dice - 1] = starts[:, k:] & exiting[:, None] & \
+            ((i == k)[None, :] | (i[None, :] == back[:, None]))
+
+        masks[~has, :, dice - 1] = False
+
+    return masks.reshape(n, ACTIONS)
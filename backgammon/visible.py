@@ -6,6 +6,7 @@ from abc import ABCMeta
 import pygame
 
 from printable import Printable
+from surfacecache import surfaces
 
 
 class Visible(Printable, metaclass=ABCMeta):
@@ -14,17 +15,30 @@ class Visible(Printable, metaclass=ABCMeta):
     
     Methods:
         1) print(): prints object
+    
+    Properties:
+        1) area: rectangle covered by image
     """
 
     def _load_image(self, image_path: str) -> None:
-        """Loads image to memory
+        """Loads image to memory, image is shared with other objects of the same size
 
         Args:
             image_path (str): path to loading image
         """
         
-        self._image = pygame.image.load(image_path)  # load image
-        self._image = pygame.transform.scale(self._image, self._size)  # scale image
+        self._image = surfaces.get(image_path, self._size)  # load scaled image
+
+    @property
+    def area(self) -> pygame.Rect:
+        """Rectangle covered by image
+
+        Returns:
+            pygame.Rect: rectangle
+        """
+        
+        return pygame.Rect(int(self._position[0]), int(self._position[1]),
+                           self._size[0], self._size[1])  # return rectangle
 
     def print(self) -> None:
         """Prints object"""
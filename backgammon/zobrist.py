@@ -0,0 +1,57 @@
+# zobrist.py
+# Contains Zobrist keys of positions
+
+from random import Random
+from typing import Sequence
+
+_SEED = 20230101  # seed of keys, keys are equal in all processes
+_MAX = 15  # maximal number of checkers in cell
+
+_rng = Random(_SEED)  # random generator of keys
+
+# KEYS[cell][number + 15] is key of cell with signed number of checkers
+KEYS = tuple(tuple(_rng.getrandbits(64) if n != _MAX else 0 for n in range(2 * _MAX + 1))
+             for _ in range(26))
+
+SIDES = {"red": _rng.getrandbits(64), "black": _rng.getrandbits(64)}  # keys of side to move
+
+
+def position_hash(cells: Sequence[int]) -> int:
+    """Returns Zobrist hash of position
+
+    Args:
+        cells (Sequence[int]): signed numbers of checkers in 26 cells
+
+    Returns:
+        int: 64-bit hash
+    """
+
+    h = 0  # hash
+    for index, number in enumerate(cells):
+        h ^= KEYS[index][number + _MAX]
+
+    return h  # return hash
+
+
+def move_hash(h: int, from_index: int, from_number: int,
+              to_index: int, to_number: int, sign: int) -> int:
+    """Returns hash of position after moving checker
+
+    Args:
+        h (int): hash before move
+        from_index (int): cell checker is moved from
+        from_number (int): signed number of checkers in from cell before move
+        to_index (int): cell checker is moved to
+        to_number (int): signed number of checkers in to cell before move
+        sign (int): sign of color of checker
+
+    Returns:
+        int: 64-bit hash after move
+    """
+
+    keys = KEYS[from_index]
+    h ^= keys[from_number + _MAX] ^ keys[from_number - sign + _MAX]
+    keys = KEYS[to_index]
+    h ^= keys[to_number + _MAX] ^ keys[to_number + sign + _MAX]
+
+    return h  # return hash